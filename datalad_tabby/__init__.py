@@ -13,6 +13,9 @@ command_suite = (
     "Utilities for working with the `tabby` metadata format",
     [
         ('datalad_tabby.load', 'Load', 'tabby-load', 'tabby_load'),
+        ('datalad_tabby.cache', 'Cache', 'tabby-cache', 'tabby_cache'),
+        ('datalad_tabby.compile', 'Compile', 'tabby-compile',
+         'tabby_compile'),
     ]
 )
 
@@ -0,0 +1,118 @@
+"""Inspect or clear the persistent cache of loaded tabby records"""
+
+from __future__ import annotations
+
+__docformat__ = 'restructuredtext'
+
+import logging
+from pathlib import Path
+
+import datalad_next.commands as dc
+from datalad_next.constraints import (
+    EnsureChoice,
+    EnsurePath,
+)
+
+from datalad_next.uis import ui_switcher as ui
+
+from datalad_tabby.io import (
+    JsonLdDocumentCache,
+    RecordCache,
+)
+
+lgr = logging.getLogger('datalad.tabby.cache')
+
+
+cache_actions = ('info', 'clear')
+
+
+class _ParamValidator(dc.EnsureCommandParameterization):
+    def __init__(self):
+        super().__init__(
+            param_constraints=dict(
+                action=EnsureChoice(*cache_actions),
+                cache_dir=EnsurePath(),
+            ),
+        )
+
+
+@dc.build_doc
+class Cache(dc.ValidatedInterface):
+    """Inspect or clear the persistent cache of loaded tabby records
+
+    Records are deposited in this cache by ``tabby-load --cache``.
+    By default, the cache is located in a ``tabby`` subdirectory of
+    DataLad's cache directory (configuration ``datalad.locations.cache``).
+    """
+
+    result_renderer = 'tailored'
+    _validator_ = _ParamValidator()
+    _params_ = dict(
+        action=dc.Parameter(
+            args=("action",),
+            nargs='?',
+            doc="""'info' reports the location, the number of entries, and
+            the size of the cache. 'clear' removes all entries.""",
+            choices=cache_actions,
+        ),
+        cache_dir=dc.Parameter(
+            args=("--cache-dir",),
+            metavar='PATH',
+            doc="""Cache directory to use instead of the default one.""",
+        ),
+    )
+
+    @staticmethod
+    @dc.eval_results
+    def __call__(
+        action: str = 'info',
+        cache_dir: Path | None = None,
+    ):
+        rc = RecordCache(cache_dir or get_default_record_cache_dir())
+        if action == 'clear':
+            n = rc.clear()
+            yield dc.get_status_dict(
+                action='tabby_cache',
+                path=rc.path,
+                status='ok',
+                message=('removed %i cached record(s)', n),
+            )
+            return
+
+        yield dc.get_status_dict(
+            action='tabby_cache',
+            path=rc.path,
+            status='ok',
+            **{k: v for k, v in rc.info().items() if k != 'path'},
+        )
+
+    @staticmethod
+    def custom_result_renderer(res, **kwargs):
+        if res['status'] != 'ok' or 'entries' not in res:
+            dc.generic_result_renderer(res)
+            return
+        ui.message(
+            f"{res['path']}: {res['entries']} record(s), "
+            f"{res['nbytes'] / 1024 ** 2:.1f} MB "
+            f"(limit {res['max_bytes'] / 1024 ** 2:.0f} MB)"
+        )
+
+
+def get_default_record_cache_dir() -> Path:
+    """Location of the record cache used by the tabby commands"""
+    from datalad import cfg
+    return Path(cfg.obtain('datalad.locations.cache')) / 'tabby'
+
+
+def get_default_jsonld_document_cache() -> JsonLdDocumentCache:
+    """JSON-LD document cache used by the tabby commands
+
+    Documents are kept in a ``jsonld`` subdirectory of the record cache
+    directory. Setting the configuration ``datalad.tabby.jsonld-offline``
+    disables the retrieval of documents that are not in the cache.
+    """
+    from datalad import cfg
+    return JsonLdDocumentCache(
+        get_default_record_cache_dir() / 'jsonld',
+        offline=cfg.getbool('datalad.tabby', 'jsonld-offline', default=False),
+    )
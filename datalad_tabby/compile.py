@@ -0,0 +1,93 @@
+"""Compile a tabby metadata record into a single-file bundle"""
+
+from __future__ import annotations
+
+__docformat__ = 'restructuredtext'
+
+import logging
+from pathlib import Path
+
+import datalad_next.commands as dc
+from datalad_next.constraints import (
+    EnsureChoice,
+    EnsurePath,
+)
+
+from datalad_tabby.io import compile_tabby
+from datalad_tabby.load import load_modes
+
+lgr = logging.getLogger('datalad.tabby.compile')
+
+
+class _ParamValidator(dc.EnsureCommandParameterization):
+    def __init__(self):
+        super().__init__(
+            param_constraints=dict(
+                path=EnsurePath(lexists=True),
+                output=EnsurePath(),
+                mode=EnsureChoice(*load_modes),
+            ),
+        )
+
+
+@dc.build_doc
+class Compile(dc.ValidatedInterface):
+    """Compile a tabby metadata record into a single-file bundle
+
+    The record is loaded once, and all files it is loaded from (including
+    any files from convention paths) are written into a single bundle
+    file, in pre-parsed form. ``tabby-load`` accepts the path of a bundle
+    instead of a sheet, and loads the record from it, which involves much
+    less file system access. A bundle is a snapshot, later changes to
+    the original files are not reflected in it.
+    """
+
+    _validator_ = _ParamValidator()
+    _params_ = dict(
+        path=dc.Parameter(
+            args=("path",),
+            doc="""Path of the root tabby record component"""),
+        output=dc.Parameter(
+            args=("-o", "--output"),
+            metavar='PATH',
+            doc="""Path of the bundle to write. By default, the bundle is
+            placed next to the root record component, with a ``.tabby``
+            suffix replacing the ``.tsv`` suffix."""),
+        mode=dc.Parameter(
+            args=("--mode",),
+            doc="""The mode with which the record will be loaded from the
+            bundle. A bundle compiled in 'jsonld' mode can also be loaded in
+            any other mode.""",
+            choices=load_modes,
+        ),
+        many=dc.Parameter(
+            args=('--many',),
+            action='store_true',
+            doc="""Interpret the record component at PATH as a sheet
+            declaring many objects (one per row), rather than a single
+            object. Such a bundle must also be loaded with --many.""",
+        ),
+    )
+
+    @staticmethod
+    @dc.eval_results
+    def __call__(
+        path,
+        output: Path | None = None,
+        mode: str = 'jsonld',
+        many: bool = False,
+    ):
+        if output is None:
+            output = path.with_suffix('.tabby')
+        compile_tabby(
+            path,
+            output,
+            single=not many,
+            jsonld=mode == 'jsonld',
+            recursive=mode != 'single',
+        )
+        yield dc.get_status_dict(
+            action='tabby_compile',
+            path=output,
+            status='ok',
+        )
@@ -1,11 +1,15 @@
 """datalad-metalad metadata extractor"""
 
+from __future__ import annotations
+
 from typing import (
     Any,
     Dict,
 )
 import uuid
 
+from datalad.runner.exception import CommandError
+
 from datalad_metalad.extractors.base import (
     DatasetMetadataExtractor,
     DataOutputCategory,
@@ -15,7 +19,13 @@ from datalad_next.commands import get_status_dict
 from datalad_next.datasets import Dataset
 from datalad_next.exceptions import CapturedException
 
-from datalad_tabby.io import load_tabby
+from datalad_tabby import __version__
+from datalad_tabby.cache import get_default_record_cache_dir
+from datalad_tabby.io import (
+    RecordCache,
+    load_tabby,
+    load_tabby_many,
+)
 
 
 def load_dataset_self_description(ds: Dataset) -> Dict:
@@ -36,17 +46,16 @@ def yield_dscollection_records(ds: Dataset):
     dscolpath = ds.pathobj / '.datalad' / 'tabby' / 'dscollection'
     if not dscolpath.exists():
         return
-    for rpath in dscolpath.glob('*_dataset.tsv'):
-        try:
-            yield load_tabby(
-                rpath,
-                single=True,
-                jsonld=True,
-                recursive=True,
-            )
-        except Exception:
+    for res in load_tabby_many(
+            dscolpath.glob('*_dataset.tsv'),
+            single=True,
+            jsonld=True,
+            recursive=True,
+    ):
+        if res.error is not None:
             # TODO log
-            pass
+            continue
+        yield res.record
 
 
 # key terms, we use ful URLs to avoid having to fiddle with context
@@ -81,20 +90,13 @@ class TabbyExtractor(DatasetMetadataExtractor):
         return True
 
     def extract(self, _=None) -> ExtractorResult:
-        rootdsmeta = {}
-        extraction_success = False
         try:
-            rootdsmeta = load_dataset_self_description(self.dataset)
-            extraction_success = True
-            res = get_status_dict(status='ok')
-        except LookupError:
-            res = get_status_dict(status='impossible')
-            # TODO https://github.com/datalad/datalad-metalad/issues/385
+            tabby = self._get_tabby()
         except Exception as e:
             return ExtractorResult(
                 extractor_version=self.get_version(),
                 extraction_parameter=self.parameter or {},
-                extraction_success=extraction_success,
+                extraction_success=False,
                 datalad_result_dict=get_status_dict(
                     status='error',
                     exception=CapturedException(e),
@@ -103,6 +105,16 @@ class TabbyExtractor(DatasetMetadataExtractor):
                 immediate_data={},
             )
 
+        if tabby['self'] is None:
+            rootdsmeta = {}
+            extraction_success = False
+            res = get_status_dict(status='impossible')
+            # TODO https://github.com/datalad/datalad-metalad/issues/385
+        else:
+            rootdsmeta = tabby['self']
+            extraction_success = True
+            res = get_status_dict(status='ok')
+
         self._amend_tabby(rootdsmeta)
         res['type'] = 'dataset'
 
@@ -110,7 +122,7 @@ class TabbyExtractor(DatasetMetadataExtractor):
         if rootdsmeta:
             dsmeta.append(rootdsmeta)
 
-        for crec in yield_dscollection_records(self.dataset):
+        for crec in tabby['dscollection']:
             # good enough if we get something here, even when there was
             # no root record
             res['status'] = 'ok'
@@ -137,6 +149,69 @@ class TabbyExtractor(DatasetMetadataExtractor):
             immediate_data=dsmeta,
         )
 
+    def _get_tabby(self) -> Dict:
+        """Load all tabby records of the dataset, or take them from cache
+
+        Returns a dict with the self-description (``None`` if there is
+        none) under ``self``, and a list of all dataset collection records
+        under ``dscollection``. Any version-specific information is not
+        included (see ``_amend_tabby()``).
+
+        With the configuration ``datalad.tabby.extractor-cache`` enabled
+        (off by default), records are cached. The cache is keyed by the git
+        tree of ``.datalad/tabby`` in the ``ref_commit``, hence any number
+        of commits that do not touch the records share a cache entry.
+        """
+        cache_key = self._get_tabby_cache_key()
+        if cache_key:
+            cache = RecordCache(get_default_record_cache_dir())
+            tabby = cache.get(self.dataset.pathobj / '.datalad' / 'tabby',
+                              cache_key)
+            if tabby is not None:
+                return tabby
+        try:
+            rootdsmeta = load_dataset_self_description(self.dataset)
+        except LookupError:
+            rootdsmeta = None
+        tabby = {
+            'self': rootdsmeta,
+            'dscollection': list(yield_dscollection_records(self.dataset)),
+        }
+        if cache_key:
+            # the tree hash covers all files, no need for a manifest
+            cache.put(self.dataset.pathobj / '.datalad' / 'tabby',
+                      cache_key, tabby, files={}, absent=())
+        return tabby
+
+    def _get_tabby_cache_key(self) -> Dict | None:
+        if not self.dataset.config.getbool(
+                'datalad.tabby', 'extractor-cache', default=False):
+            return None
+        repo = self.dataset.repo
+        try:
+            trees = repo.call_git_items_([
+                'rev-parse',
+                f'{self.ref_commit}:.datalad/tabby',
+                'HEAD:.datalad/tabby',
+            ])
+            trees = list(trees)
+            # records are loaded from the worktree, which must match
+            # the ref_commit for a tree hash to be meaningful
+            if len(trees) != 2 or trees[0] != trees[1] or repo.call_git([
+                    'status', '--porcelain', '--untracked-files=all',
+                    '--ignored', '--', '.datalad/tabby']).strip():
+                return None
+        except CommandError:
+            # no .datalad/tabby in one of the commits
+            return None
+        return {
+            'tree': trees[0],
+            'extractor': str(self.get_id()),
+            'extractor_version': self.get_version(),
+            # the loader, and the conventions that come with it
+            'tabby': __version__,
+        }
+
     def _amend_tabby(self, meta):
         # we override the top-level '@id' to force the report into the
         # corset of the datalad ID concept.
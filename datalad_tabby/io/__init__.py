@@ -3,6 +3,52 @@
 
 from __future__ import annotations
 
-__all__ = ['load_tabby']
+__all__ = [
+    'load_tabby',
+    'load_tabby_many',
+    'iter_tabby_many',
+    'SheetCache',
+    'TabbyLoadResult',
+    'materialize',
+    'build_import_graph',
+    'TabbyImportGraph',
+    'TabbyRecordWatcher',
+    'RecordCache',
+    'compile_tabby',
+    'TabbyRowIndex',
+    'RowFilter',
+    'JsonLdDocumentCache',
+    'compact_record',
+    'expand_record',
+    'encode_json',
+    'iterencode_json',
+    'TabbyLoadProfile',
+]
 
+from .bundle import compile_tabby
+from .cache import SheetCache
+from .graph import (
+    TabbyImportGraph,
+    build_import_graph,
+)
+from .jsonld import (
+    JsonLdDocumentCache,
+    compact_record,
+    expand_record,
+)
+from .lazy import materialize
+from .many import (
+    TabbyLoadResult,
+    iter_tabby_many,
+    load_tabby_many,
+)
 from .load import load_tabby
+from .profile import TabbyLoadProfile
+from .record_cache import RecordCache
+from .rowfilter import RowFilter
+from .rowindex import TabbyRowIndex
+from .serialize import (
+    encode_json,
+    iterencode_json,
+)
+from .watch import TabbyRecordWatcher
@@ -0,0 +1,261 @@
+"""Single-file bundles of fully resolved `tabby` records
+
+A bundle contains all files a record is loaded from, including any files
+from convention paths, in a single file. Its layout is:
+
+- 8 bytes magic (``\\x89TABBY\\r\\n``)
+- format version (uint32, little endian)
+- length of the index (uint32, little endian)
+- index (UTF-8 JSON)
+- entries
+
+The index is a JSON object with the name of the ``root`` sheet, the
+load parameters the bundle was compiled with (``single``, ``jsonld``,
+``recursive``),
+the ``entries`` (name -> [kind, offset, length], with offsets relative to
+the end of the index), and the ``aliases`` that resolve convention-based
+fallbacks (name -> name). Entries are zlib-compressed JSON, either the
+content of a JSON file (kind ``json``), or the pre-tokenized rows of a TSV
+file (kind ``rows``). Names are paths relative to the directory of the
+root sheet, files from the i-th convention path are named
+``.cvn<i>/<path in convention path>``.
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+from tempfile import mkstemp
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+)
+import zlib
+
+from .load import (
+    _DependencyTrackingLoader,
+    _TabbyLoader,
+)
+
+__all__ = ['compile_tabby']
+
+_bundle_magic = b'\x89TABBY\r\n'
+_bundle_format = 1
+_bundle_header = struct.Struct('<II')
+
+
+def compile_tabby(
+    src: Path,
+    dest: Path,
+    *,
+    single: bool = True,
+    jsonld: bool = True,
+    recursive: bool = True,
+    cpaths: List | None = None,
+) -> Path:
+    """Write a record into a single-file bundle
+
+    The record at ``src`` is loaded once, with the given parameters (see
+    :func:`~datalad_tabby.io.load_tabby`), and every file that is read in
+    the process is written to the bundle at ``dest``: TSV sheets as
+    pre-tokenized rows, and JSON files (data, overrides, contexts) in
+    parsed form. Convention-based fallbacks are resolved at this point,
+    any later changes to convention paths have no effect on the bundle.
+
+    :func:`~datalad_tabby.io.load_tabby` recognizes a bundle by its
+    content, and loads the record from it, reading only the entries it
+    needs. Loading with ``jsonld``, or ``recursive`` requires a bundle
+    compiled with these flags, and a bundle can only be loaded as a single
+    object, or as many objects, as compiled with ``single``. Returns
+    ``dest``.
+    """
+    src = Path(src).absolute()
+    ldr = _CompilingLoader(
+        jsonld=jsonld,
+        recursive=recursive,
+        cpaths=[Path(cp).absolute() for cp in cpaths or []],
+    )
+    ldr(src=src, single=single)
+
+    def _name(fpath: Path) -> str:
+        return _get_entry_name(fpath, src.parent, ldr._cpaths)
+
+    entries: Dict[str, list] = {}
+    data: List[bytes] = []
+    offset = 0
+    for fpath in list(ldr.read):
+        name = _name(fpath)
+        if name in entries or not fpath.exists():
+            # already in, or an optional sheet that was tried, but
+            # is not there
+            continue
+        if fpath.suffix == '.tsv':
+            kind, content = 'rows', list(ldr._iter_rows(fpath))
+        else:
+            kind, content = 'json', ldr._read_json(fpath)
+        blob = zlib.compress(
+            json.dumps(content, separators=(',', ':')).encode('utf-8'))
+        entries[name] = [kind, offset, len(blob)]
+        data.append(blob)
+        offset += len(blob)
+
+    index = json.dumps(dict(
+        root=_name(src),
+        single=single,
+        jsonld=jsonld,
+        recursive=recursive,
+        entries=entries,
+        aliases={
+            _name(req): _name(res) for req, res in ldr.aliases.items()
+        },
+    ), separators=(',', ':')).encode('utf-8')
+
+    dest = Path(dest)
+    fd, tmp = mkstemp(dir=dest.parent, prefix=f'.{dest.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_bundle_magic)
+            f.write(_bundle_header.pack(_bundle_format, len(index)))
+            f.write(index)
+            for blob in data:
+                f.write(blob)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return dest
+
+
+def _is_tabby_bundle(fpath: Path) -> bool:
+    try:
+        with open(fpath, 'rb') as f:
+            return f.read(len(_bundle_magic)) == _bundle_magic
+    except OSError:
+        return False
+
+
+def _get_entry_name(fpath: Path, rdir: Path, cpaths: List[Path]) -> str:
+    try:
+        return fpath.relative_to(rdir).as_posix()
+    except ValueError:
+        pass
+    for i, cp in enumerate(cpaths):
+        try:
+            return f'.cvn{i}/{fpath.relative_to(cp).as_posix()}'
+        except ValueError:
+            continue
+    raise ValueError(
+        f'{fpath} is neither in the record directory, nor in any '
+        'convention path')
+
+
+class _CompilingLoader(_DependencyTrackingLoader):
+    """Loader that also records any convention-based fallback"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.aliases: Dict[Path, Path] = {}
+
+    def _cvnfb(self, fpath: Path) -> Path:
+        resolved = super()._cvnfb(fpath)
+        if resolved != fpath:
+            self.aliases[fpath] = resolved
+        return resolved
+
+
+class _BundleLoader(_TabbyLoader):
+    """Loader that reads all files from a bundle
+
+    Paths are virtual, rooted at the directory of the bundle. The bundle
+    stays mapped into memory until :meth:`close` is called, or the loader
+    is used as a context manager.
+    """
+    def __init__(self, bundle: Path, **kwargs):
+        super().__init__(**kwargs)
+        self._bundle = bundle
+        # an absolute root, a relative one without a directory part ('.')
+        # is dropped when joined with member names
+        self._root = bundle.absolute().parent
+        # names are determined by string operations, pathlib is too slow
+        self._root_prefix = os.path.join(str(self._root), '')
+        with open(bundle, 'rb') as f:
+            f.seek(len(_bundle_magic))
+            fmt, ilen = _bundle_header.unpack(f.read(_bundle_header.size))
+            if fmt != _bundle_format:
+                raise ValueError(
+                    f'{bundle} has unsupported bundle format {fmt}')
+            index = json.loads(f.read(ilen))
+            for flag in ('jsonld', 'recursive'):
+                if getattr(self, f'_{flag}') and not index[flag]:
+                    raise ValueError(
+                        f'{bundle} was not compiled with {flag}=True')
+            # only the pages of entries that are actually read are loaded
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data_offset = len(_bundle_magic) + _bundle_header.size + ilen
+        self._single = index['single']
+        self._entries = index['entries']
+        self._aliases = index['aliases']
+        self.root_sheet = self._root / index['root']
+
+    def __call__(self, src: Path, *, single: bool = True):
+        self._check_single(single)
+        return super().__call__(src=src, single=single)
+
+    def iter_many(self, src: Path) -> Generator[Dict, None, None]:
+        self._check_single(False)
+        return super().iter_many(src=src)
+
+    def close(self) -> None:
+        """Unmap the bundle, nothing can be loaded from it afterwards"""
+        self._map.close()
+
+    def __enter__(self) -> _BundleLoader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _check_single(self, single: bool) -> None:
+        if single != self._single:
+            raise ValueError(
+                f'{self._bundle} was compiled with single={self._single}')
+
+    def _name(self, fpath: Path) -> str | None:
+        fpath = str(fpath)
+        if not fpath.startswith(self._root_prefix):
+            return None
+        name = fpath[len(self._root_prefix):]
+        return name if os.sep == '/' else name.replace(os.sep, '/')
+
+    def _exists(self, fpath: Path) -> bool:
+        return self._name(fpath) in self._entries
+
+    def _cvnfb(self, fpath: Path) -> Path:
+        # fallbacks were resolved at compile time
+        alias = self._aliases.get(self._name(fpath))
+        return fpath if alias is None else self._root / alias
+
+    def _iter_rows(self, fpath: Path) -> Iterator[List[str]]:
+        return iter(self._read_entry(fpath))
+
+    def _read_json(self, fpath: Path) -> Any:
+        return self._read_entry(fpath)
+
+    def _read_entry(self, fpath: Path) -> Any:
+        entry = self._entries.get(self._name(fpath))
+        if entry is None:
+            # same as for a missing file, such that optional imports work
+            raise FileNotFoundError(
+                errno.ENOENT, f'No such file in {self._bundle}', str(fpath))
+        _, offset, length = entry
+        start = self._data_offset + offset
+        return json.loads(zlib.decompress(self._map[start:start + length]))
@@ -0,0 +1,115 @@
+"""Cache for parsed `tabby` sheets and JSON sidecar files"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+from .load_utils import _iter_tsv_rows
+
+__all__ = ['SheetCache']
+
+
+class SheetCache:
+    """Cache of parsed TSV sheets and JSON files, shared across loads
+
+    The cache holds the raw rows of TSV sheets (lists of field values), and
+    the parsed content of JSON files (``.json``, ``.override.json``,
+    ``.ctx.jsonld``). Any entry is validated against the size and
+    modification time of its source file on each access, and is re-read
+    when a change is detected.
+
+    ``max_bytes`` is the memory budget of the cache. It is accounted for
+    using the size of the cached files as a proxy. When the budget is
+    exceeded, least-recently used entries are evicted. Files larger than
+    the budget are never cached.
+
+    Cached data are shared with all consumers and must not be modified.
+
+    Cache performance can be assessed via the ``hits``, ``misses``, and
+    ``evictions`` counters, or the :meth:`stats` report.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        # (path, kind) -> (signature, nbytes, data)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._nbytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_rows(self, fpath: Path) -> List[List[str]]:
+        """Get the rows of a TSV file, parsed or from cache"""
+        return self._get(fpath, 'rows', lambda p: list(_iter_tsv_rows(p)))
+
+    def get_json(self, fpath: Path) -> Any:
+        """Get the content of a JSON file, parsed or from cache"""
+        return self._get(fpath, 'json', _read_json)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Sum of the sizes of all cached files"""
+        return self._nbytes
+
+    def stats(self) -> Dict[str, int]:
+        """Report cache usage and performance counters"""
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                nbytes=self._nbytes,
+                max_bytes=self._max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def _get(self, fpath: Path, kind: str, reader: Callable) -> Any:
+        key = (os.path.abspath(fpath), kind)
+        # this will raise FileNotFoundError, just like a plain open()
+        st = os.stat(fpath)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        data = reader(fpath)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            if st.st_size > self._max_bytes:
+                # would not fit, do not even try
+                return data
+            self._entries[key] = (signature, st.st_size, data)
+            self._nbytes += st.st_size
+            while self._nbytes > self._max_bytes:
+                _, (_, nbytes, _) = self._entries.popitem(last=False)
+                self._nbytes -= nbytes
+                self.evictions += 1
+        return data
+
+
+def _read_json(fpath: Path) -> Any:
+    with fpath.open() as jfile:
+        return json.load(jfile)
@@ -0,0 +1,313 @@
+"""Dependency graph of the sheets and files that make up a `tabby` record"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Set,
+    Tuple,
+)
+
+from .load import _TabbyLoader
+from .load_utils import (
+    _get_sheet_fpath,
+    _get_tabby_prefix_from_sheet_fpath,
+    _parse_import_statement,
+)
+
+__all__ = ['build_import_graph', 'TabbyImportGraph', 'TabbySheet',
+           'TabbySheetImport']
+
+
+class TabbySheetImport(NamedTuple):
+    """Import of a sheet, declared in another sheet"""
+    key: str
+    """Property the import is declared for"""
+    statement: str
+    """Import statement, e.g. ``@tabby-many-authors``"""
+    src: Path
+    """Path of the imported sheet, after any convention-based fallback"""
+    single: bool
+    """Whether a single object is imported, or many"""
+    optional: bool
+    """Whether the import is optional"""
+
+
+class TabbySheet:
+    """A sheet of a record, and all files it depends on"""
+    def __init__(self, src: Path, single: bool):
+        self.src = src
+        """Path of the sheet, after any convention-based fallback"""
+        self.single = single
+        """Whether the sheet declares a single object, or many"""
+        self.files: Dict[str, Path] = {}
+        """Existing files the sheet is loaded from, by role: ``tsv``,
+        ``json``, ``override``, ``context``, ``record-context``"""
+        self.missing: List[Path] = []
+        """Record files that do not exist, but would contribute to the
+        sheet, if they did"""
+        self.imports: List[TabbySheetImport] = []
+        """Imports declared in this sheet"""
+
+    @property
+    def exists(self) -> bool:
+        """Whether there is tabular or JSON data for this sheet"""
+        return 'tsv' in self.files or 'json' in self.files
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.src!r}, ' \
+            f'single={self.single!r})'
+
+
+class TabbyImportGraph:
+    """Directed graph of sheet imports, starting at a root sheet
+
+    Nodes are :class:`TabbySheet` instances, keyed by their path in
+    :attr:`sheets`. Edges are the :class:`TabbySheetImport` items of each
+    sheet.
+    """
+    def __init__(self, root: Path, sheets: Dict[Path, TabbySheet]):
+        self.root = root
+        """Path of the root sheet"""
+        self.sheets = sheets
+        """All sheets of the record, keyed by their path"""
+
+    def __getitem__(self, src: Path) -> TabbySheet:
+        return self.sheets[src]
+
+    def __iter__(self) -> Iterator[TabbySheet]:
+        return iter(self.sheets.values())
+
+    def __len__(self) -> int:
+        return len(self.sheets)
+
+    @property
+    def files(self) -> Set[Path]:
+        """All existing files that contribute to the record"""
+        return set(f for s in self for f in s.files.values())
+
+    def find_cycle(self) -> List[Path] | None:
+        """Report a circular import, if there is any
+
+        Returns the list of sheet paths that form the cycle, starting and
+        ending with the same path, or ``None``, if there is no cycle.
+        """
+        # iterative DFS to not be limited by the recursion limit
+        done: Set[Path] = set()
+        for start in self.sheets:
+            if start in done:
+                continue
+            path = [start]
+            onpath = {start}
+            stack = [iter(self.sheets[start].imports)]
+            while stack:
+                imp = next(stack[-1], None)
+                if imp is None:
+                    stack.pop()
+                    finished = path.pop()
+                    onpath.discard(finished)
+                    done.add(finished)
+                    continue
+                if imp.src in onpath:
+                    return path[path.index(imp.src):] + [imp.src]
+                if imp.src in done or imp.src not in self.sheets:
+                    continue
+                path.append(imp.src)
+                onpath.add(imp.src)
+                stack.append(iter(self.sheets[imp.src].imports))
+        return None
+
+    def check_cycles(self) -> None:
+        """Raise ``RecursionError`` if there is a circular import"""
+        cycle = self.find_cycle()
+        if cycle:
+            raise RecursionError(
+                f'circular import: {cycle[0]} is (indirectly) referencing '
+                f'itself via {" -> ".join(str(c) for c in cycle)}')
+
+    def topological_order(self) -> List[Path]:
+        """Sheet paths ordered such that imports precede their importers
+
+        Raises ``RecursionError`` if there is a circular import.
+        """
+        self.check_cycles()
+        order: List[Path] = []
+        seen: Set[Path] = set()
+        for start in self.sheets:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [(start, iter(self.sheets[start].imports))]
+            while stack:
+                src, imports = stack[-1]
+                imp = next(imports, None)
+                if imp is None:
+                    stack.pop()
+                    order.append(src)
+                elif imp.src not in seen and imp.src in self.sheets:
+                    seen.add(imp.src)
+                    stack.append((imp.src, iter(self.sheets[imp.src].imports)))
+        return order
+
+    def importers(self, src: Path) -> Set[Path]:
+        """Paths of all sheets that (indirectly) import the sheet ``src``"""
+        direct: Dict[Path, Set[Path]] = {}
+        for sheet in self:
+            for imp in sheet.imports:
+                direct.setdefault(imp.src, set()).add(sheet.src)
+        found: Set[Path] = set()
+        todo = [src]
+        while todo:
+            for importer in direct.get(todo.pop(), ()):
+                if importer not in found:
+                    found.add(importer)
+                    todo.append(importer)
+        return found
+
+
+def build_import_graph(
+    src: Path,
+    *,
+    single: bool = True,
+    jsonld: bool = True,
+    cpaths: List | None = None,
+) -> TabbyImportGraph:
+    """Determine all sheets and files of a record, without loading it
+
+    Starting at the sheet ``src``, all ``@tabby-...`` imports are followed,
+    and for each sheet the contributing files are determined (TSV, JSON
+    data, override, and context files), including any convention-based
+    fallbacks. To find imports, only the key column (single-object sheets)
+    and cells with import statements are considered, and no objects are
+    built.
+
+    Missing sheets are included in the graph (with ``exists == False``),
+    and circular imports are not reported here, but can be detected with
+    :meth:`TabbyImportGraph.find_cycle`.
+
+    The arguments ``single``, ``jsonld``, and ``cpaths`` have the same
+    semantics as those of :func:`~datalad_tabby.io.load_tabby`.
+    """
+    return _build_import_graph(
+        _TabbyLoader(jsonld=jsonld, cpaths=cpaths),
+        src,
+        single,
+    )
+
+
+def _build_import_graph(
+    ldr: _TabbyLoader,
+    src: Path,
+    single: bool,
+    known: Dict[Path, TabbySheet] | None = None,
+) -> TabbyImportGraph:
+    # ``known`` sheets are taken as-is, rather than being scanned again
+    known = known or {}
+    sheets: Dict[Path, TabbySheet] = {}
+    todo = [(src, src, single)]
+    while todo:
+        candidate, sheet_fpath, sheet_single = todo.pop(0)
+        if sheet_fpath in sheets:
+            continue
+        sheet = known.get(sheet_fpath)
+        if sheet is None or sheet.single != sheet_single:
+            sheet = _scan_sheet(ldr, candidate, sheet_fpath, sheet_single)
+        sheets[sheet_fpath] = sheet
+        todo.extend(
+            (_get_sheet_fpath(sheet_fpath, _parse_import_statement(
+                imp.statement)[1]), imp.src, imp.single)
+            for imp in sheet.imports
+        )
+    return TabbyImportGraph(src, sheets)
+
+
+def _scan_sheet(
+    ldr: _TabbyLoader,
+    candidate: Path,
+    src: Path,
+    single: bool,
+) -> TabbySheet:
+    sheet = TabbySheet(src, single)
+    prefix = _get_tabby_prefix_from_sheet_fpath(src)
+    # the sheet itself has been resolved already
+    if ldr._exists(src):
+        sheet.files['tsv'] = src
+    if candidate != src or not ldr._exists(src):
+        sheet.missing.append(candidate)
+    candidates: List[Tuple[str, Path]] = [
+        ('json', src.parent / f'{src.stem}.json'),
+        ('override', src.parent / f'{src.stem}.override.json'),
+    ]
+    if ldr._jsonld:
+        candidates.extend((
+            ('record-context',
+             src.parent / (f'{prefix}.ctx.jsonld' if prefix
+                           else 'ctx.jsonld')),
+            ('context', src.parent / f'{src.stem}.ctx.jsonld'),
+        ))
+    for role, cand in candidates:
+        fpath = ldr._cvnfb(cand)
+        if ldr._exists(fpath):
+            sheet.files[role] = fpath
+        if fpath != cand or not ldr._exists(fpath):
+            sheet.missing.append(cand)
+
+    if 'json' in sheet.files:
+        jdata = ldr._read_json(sheet.files['json'])
+        for obj in (jdata if isinstance(jdata, list) else [jdata]):
+            if not isinstance(obj, dict):
+                continue
+            for key, val in obj.items():
+                for v in (val if isinstance(val, list) else [val]):
+                    _add_import(ldr, sheet, key, v)
+    if 'tsv' in sheet.files:
+        for key, v in (_iter_single_imports if single
+                       else _iter_many_imports)(ldr, sheet.files['tsv']):
+            _add_import(ldr, sheet, key, v)
+    return sheet
+
+
+def _iter_single_imports(
+        ldr: _TabbyLoader, fpath: Path) -> Iterator[Tuple[str, str]]:
+    for row in ldr._iter_rows(fpath):
+        if not len(row) or not row[0] or row[0].startswith('#'):
+            continue
+        for v in row[1:]:
+            if v.startswith('@tabby-'):
+                yield row[0], v
+
+
+def _iter_many_imports(
+        ldr: _TabbyLoader, fpath: Path) -> Iterator[Tuple[str, str]]:
+    fieldnames = None
+    for row in ldr._iter_rows(fpath):
+        if not len(row) or row[0].startswith('#'):
+            continue
+        if fieldnames is None:
+            fieldnames = row
+            continue
+        for i, v in enumerate(row):
+            if v.startswith('@tabby-') and fieldnames:
+                # any extra values belong to the last key
+                yield fieldnames[min(i, len(fieldnames) - 1)], v
+
+
+def _add_import(ldr: _TabbyLoader, sheet: TabbySheet, key: str, v: Any):
+    istmt = _parse_import_statement(v)
+    if istmt is None:
+        return
+    single, name, optional = istmt
+    imp = TabbySheetImport(
+        key=key,
+        statement=v,
+        src=ldr._get_corresponding_sheet_fpath(sheet.src, name),
+        single=single,
+        optional=optional,
+    )
+    if imp not in sheet.imports:
+        sheet.imports.append(imp)
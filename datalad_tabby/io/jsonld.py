@@ -0,0 +1,601 @@
+"""JSON-LD processing of loaded records
+
+JSON-LD processing (e.g., compaction) of a record requires the documents
+of any remote ``@context`` URLs. By default, pyld fetches such a document
+for every processing operation, and processes it again each time.
+:class:`JsonLdDocumentCache` is a pyld document loader that keeps fetched
+documents in a directory, such that they are fetched only once across
+processes. A cache can be seeded with documents, and then be used fully
+offline.
+
+Documents from this loader are declared static. pyld then keeps the
+resolved contexts, and the active contexts processed from them, in its
+in-process cache (keyed by URL, or by the canonical serialization of a
+local context). Hence, processing any number of records with the same
+contexts in a process pays the context processing cost only once.
+
+:func:`expand_record` and :func:`compact_record` implement JSON-LD
+expansion and compaction natively for the kind of contexts that `tabby`
+conventions typically declare: term definitions that map a term to an
+IRI, or a compact IRI, optionally with a type coercion. For anything
+beyond that (e.g., remote contexts, ``@vocab``, containers, or scoped
+contexts), they fall back on pyld. Both implementations produce the
+same output (including the order of properties).
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+from tempfile import mkstemp
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+__all__ = ['JsonLdDocumentCache', 'compact_record', 'expand_record']
+
+
+class JsonLdDocumentCache:
+    """File-backed pyld document loader
+
+    An instance can be given as ``documentLoader`` option to any pyld
+    processing function. Documents are looked up in memory first, then in
+    the cache directory ``path``, and are only retrieved with the
+    ``loader`` (pyld's default document loader, if not given) when they
+    are not cached. Retrieved documents are deposited in the cache
+    directory. Entries never expire, use :meth:`seed` to update a document
+    explicitly.
+
+    With ``offline``, documents are never retrieved, and a lookup of a
+    document that is not in the cache fails.
+    """
+    def __init__(
+        self,
+        path: Path,
+        *,
+        offline: bool = False,
+        loader: Callable | None = None,
+    ):
+        self.path = Path(path)
+        """Cache directory, created on first use"""
+        self.offline = offline
+        self._loader = loader
+        self._docs: Dict[str, Dict] = {}
+
+    def __call__(self, url: str, options: Dict | None = None) -> Dict:
+        doc = self._docs.get(url)
+        if doc is not None:
+            return doc
+        doc = self._read_entry(url)
+        if doc is None:
+            if self.offline:
+                from pyld.jsonld import JsonLdError
+                raise JsonLdError(
+                    f'{url} is not in the document cache at {self.path}, '
+                    'and retrieval is disabled',
+                    'jsonld.LoadDocumentError',
+                    code='loading document failed',
+                )
+            doc = self._retrieve(url, options)
+            self._write_entry(url, doc)
+        # pyld only caches the resolved content of static documents
+        # across operations
+        doc = dict(doc, tag='static')
+        self._docs[url] = doc
+        return doc
+
+    def seed(
+        self,
+        url: str,
+        document: Any,
+        document_url: str | None = None,
+    ) -> None:
+        """Deposit a ``document`` as the one retrieved from ``url``"""
+        self._write_entry(url, {
+            'contextUrl': None,
+            'documentUrl': document_url or url,
+            'document': document,
+        })
+        self._docs.pop(url, None)
+
+    def _retrieve(self, url: str, options: Dict | None) -> Dict:
+        loader = self._loader
+        if loader is None:
+            from pyld.jsonld import get_document_loader
+            loader = get_document_loader()
+        doc = loader(url, options or {})
+        return {
+            'contextUrl': doc.get('contextUrl'),
+            'documentUrl': doc.get('documentUrl', url),
+            'document': doc['document'],
+        }
+
+    def _get_entry_path(self, url: str) -> Path:
+        return self.path / \
+            f'{hashlib.sha256(url.encode("utf-8")).hexdigest()}.json'
+
+    def _read_entry(self, url: str) -> Dict | None:
+        try:
+            with self._get_entry_path(url).open() as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # not there, or unusable
+            return None
+        if entry.get('url') != url:
+            return None
+        return entry['doc']
+
+    def _write_entry(self, url: str, doc: Dict) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = mkstemp(dir=self.path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(url=url, doc=doc), f)
+            os.replace(tmp, self._get_entry_path(url))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def expand_record(
+    rec: Dict | List,
+    *,
+    document_loader: Callable | None = None,
+) -> List[Dict]:
+    """JSON-LD expansion of a loaded record
+
+    A record with contexts that are not supported natively is expanded
+    with pyld, using the given ``document_loader`` for any remote
+    documents.
+    """
+    try:
+        return _expand_doc(rec)
+    except _Unsupported:
+        pass
+    from pyld import jsonld
+    return jsonld.expand(rec, _get_pyld_options(document_loader))
+
+
+def compact_record(
+    rec: Dict | List,
+    ctx: Any,
+    *,
+    document_loader: Callable | None = None,
+) -> Dict:
+    """JSON-LD compaction of a loaded record with the context ``ctx``
+
+    A record or context that is not supported natively is compacted with
+    pyld, using the given ``document_loader`` for any remote documents.
+    """
+    try:
+        return _compact_doc(rec, ctx)
+    except _Unsupported:
+        pass
+    from pyld import jsonld
+    return jsonld.compact(rec, ctx, _get_pyld_options(document_loader))
+
+
+def _get_pyld_options(document_loader: Callable | None) -> Dict:
+    return {} if document_loader is None \
+        else {'documentLoader': document_loader}
+
+
+class _Unsupported(Exception):
+    """A document is beyond what the native implementation can process"""
+
+
+# as in pyld
+_absolute_iri_regex = re.compile(r'^([A-Za-z][A-Za-z0-9+-.]*|_):[^\s]*$')
+# a term with an IRI ending in one of these can be used as a prefix
+_gen_delims = (':', '/', '?', '#', '[', ']', '@')
+
+
+class _TermDef(NamedTuple):
+    iri: str
+    # IRI of a type coercion
+    type: str | None
+    # whether the term can be used as the prefix of a compact IRI
+    prefix: bool
+    # whether values are ordered (@list container)
+    list: bool
+
+
+class _FlatContext:
+    """Active context with nothing but terms mapped to IRIs
+
+    Terms can have a type coercion, and an ``@list`` container. Aliases
+    of ``@id`` and ``@type`` are supported too.
+    """
+    def __init__(self, terms: Dict[str, _TermDef]):
+        self.terms = terms
+        self.prefixes = {t: d.iri for t, d in terms.items() if d.prefix}
+        # IRI -> container -> '@type'/'@language'/'@any' -> value -> term,
+        # as pyld's inverse context, with shortest, then lexicographically
+        # least terms first
+        self._inverse: Dict[str, Dict[str, Dict[str, Dict[str, str]]]] = {}
+        for t in sorted(terms, key=lambda t: (len(t), t)):
+            d = terms[t]
+            entry = self._inverse.setdefault(d.iri, {}).setdefault(
+                '@list' if d.list else '@none',
+                {'@type': {}, '@language': {}, '@any': {}},
+            )
+            entry['@any'].setdefault('@none', t)
+            if d.type is None:
+                entry['@type'].setdefault('@none', t)
+                entry['@language'].setdefault('@none', t)
+            else:
+                entry['@type'].setdefault(d.type, t)
+        self._keys: Dict[str, _TermDef | None] = {}
+        self._iris: Dict[Tuple[str, bool], str] = {}
+
+    def extend(self, local: Dict) -> _FlatContext:
+        """Process a local context on top of this one"""
+        terms = dict(self.terms)
+        defined: Dict[str, bool] = {}
+        for term in local:
+            self._define(local, term, terms, defined)
+        return _FlatContext(terms)
+
+    def _define(self, local, term, terms, defined) -> None:
+        if defined.get(term):
+            return
+        if term in defined:
+            # cyclic definition
+            raise _Unsupported(term)
+        defined[term] = False
+        if not term or term.startswith('@') or ':' in term or '/' in term:
+            raise _Unsupported(term)
+        value = local[term]
+        typ = None
+        is_list = False
+        if value in ('@id', '@type'):
+            # keyword alias
+            terms[term] = _TermDef(value, None, False, False)
+            defined[term] = True
+            return
+        if isinstance(value, str):
+            iri = self._expand_def_iri(local, value, terms, defined)
+            # only simple terms can be prefixes
+            is_prefix = iri.endswith(_gen_delims)
+        elif isinstance(value, dict) and isinstance(value.get('@id'), str) \
+                and set(value) <= {'@id', '@type', '@container'}:
+            iri = self._expand_def_iri(local, value['@id'], terms, defined)
+            is_prefix = False
+            if '@type' in value:
+                typ = value['@type']
+                if not isinstance(typ, str) or typ.startswith('@'):
+                    # @id, @vocab, @json, @none coercion
+                    raise _Unsupported(term)
+                typ = self._expand_def_iri(local, typ, terms, defined)
+            if '@container' in value:
+                if value['@container'] != '@list':
+                    raise _Unsupported(term)
+                is_list = True
+        else:
+            raise _Unsupported(term)
+        if iri.startswith('_:'):
+            raise _Unsupported(term)
+        terms[term] = _TermDef(iri, typ, is_prefix, is_list)
+        defined[term] = True
+
+    def _expand_def_iri(self, local, value, terms, defined) -> str:
+        if value.startswith('@') or value in local or value in terms:
+            # keyword alias, or term reference
+            raise _Unsupported(value)
+        prefix, sep, suffix = value.partition(':')
+        if sep and prefix and prefix != '_' and not suffix.startswith('//'):
+            if prefix in local:
+                self._define(local, prefix, terms, defined)
+            d = terms.get(prefix)
+            if d is not None and d.prefix:
+                return d.iri + suffix
+        if not _absolute_iri_regex.match(value):
+            raise _Unsupported(value)
+        return value
+
+    def expand_key(self, key: str) -> _TermDef | None:
+        """Definition of a property, or None if it is dropped"""
+        try:
+            return self._keys[key]
+        except KeyError:
+            pass
+        d = self.terms.get(key)
+        if d is None:
+            iri = self._expand_prefixed(key)
+            if iri is not None and iri.startswith('_:'):
+                raise _Unsupported(key)
+            d = None if iri is None or not _absolute_iri_regex.match(iri) \
+                else _TermDef(iri, None, False, False)
+        self._keys[key] = d
+        return d
+
+    def expand_iri(self, value: Any, vocab: bool) -> str:
+        """Expand the value of @id, or (with ``vocab``) of @type"""
+        if not isinstance(value, str) or value.startswith('@'):
+            raise _Unsupported(value)
+        if vocab:
+            d = self.terms.get(value)
+            if d is not None:
+                if d.iri.startswith('@'):
+                    raise _Unsupported(value)
+                return d.iri
+        iri = self._expand_prefixed(value)
+        if iri is None:
+            iri = _resolve_relative_iri(value)
+        return iri
+
+    def _expand_prefixed(self, value: str) -> str | None:
+        prefix, sep, suffix = value.partition(':')
+        if not sep or not prefix:
+            return None
+        if prefix == '_' or suffix.startswith('//'):
+            # blank node, or absolute IRI
+            return value
+        p = self.prefixes.get(prefix)
+        if p is not None:
+            return p + suffix
+        return value if _absolute_iri_regex.match(value) else None
+
+    def select_term(self, iri: str, value: Dict) -> Tuple[str, str | None]:
+        """Property name for an expanded value of ``iri``
+
+        Returns the name, and the type coercion that applies to the
+        value(s).
+        """
+        containers = self._inverse.get(iri)
+        if containers:
+            if '@list' in value:
+                order = ('@list', '@none')
+                tol, pref = _get_list_type_or_language(value['@list'])
+            elif '@value' not in value:
+                order = ('@none',)
+                tol, pref = '@type', '@id'
+            elif '@type' in value:
+                order = ('@none',)
+                tol, pref = '@type', value['@type']
+            else:
+                order = ('@none',)
+                tol, pref = '@language', '@null'
+            for c in order:
+                if c not in containers:
+                    continue
+                candidates = containers[c][tol]
+                term = candidates.get(pref, candidates.get('@none'))
+                if term is not None:
+                    return term, self.terms[term].type
+        return self.compact_iri(iri, vocab=False), None
+
+    def get_alias(self, keyword: str) -> str:
+        """Name for a keyword"""
+        return self._inverse.get(keyword, {}).get('@none', {}).get(
+            '@type', {}).get('@none', keyword)
+
+    def compact_iri(self, iri: str, vocab: bool) -> str:
+        """Compact the value of @id, or (with ``vocab``) of @type"""
+        try:
+            return self._iris[iri, vocab]
+        except KeyError:
+            pass
+        res = None
+        if vocab and iri in self._inverse:
+            # values of @type are compacted like node references
+            candidates = self._inverse[iri].get('@none', {}).get('@type', {})
+            res = candidates.get('@none')
+        if res is None:
+            for term, p in self.prefixes.items():
+                if p == iri or not iri.startswith(p):
+                    continue
+                curie = f'{term}:{iri[len(p):]}'
+                if res is None or (len(curie), curie) < (len(res), res):
+                    res = curie
+        if res is None:
+            if iri.partition(':')[0] in self.prefixes:
+                # absolute IRI confused with a compact IRI
+                raise _Unsupported(iri)
+            res = iri
+        self._iris[iri, vocab] = res
+        return res
+
+
+def _resolve_relative_iri(value: str) -> str:
+    # relative to the document base, there is none for a loaded record.
+    # Match pyld, which resolves against a placeholder base IRI
+    try:
+        from pyld.jsonld import (
+            DEFAULT_BASE_IRI,
+            resolve,
+        )
+        return resolve(value, DEFAULT_BASE_IRI)
+    except (ImportError, ValueError) as e:
+        raise _Unsupported(value) from e
+
+
+def _get_list_type_or_language(items: List[Dict]) -> Tuple[str, str]:
+    # common type or language of all items of a list, as in pyld
+    if not items:
+        return '@any', '@none'
+    common_language = common_type = None
+    for item in items:
+        is_value = '@value' in item
+        item_language = item_type = '@none'
+        if not is_value:
+            item_type = '@id'
+        elif '@type' in item:
+            item_type = item['@type']
+        else:
+            item_language = '@null'
+        if common_language is None:
+            common_language = item_language
+        elif item_language != common_language and is_value:
+            common_language = '@none'
+        if common_type is None:
+            common_type = item_type
+        elif item_type != common_type:
+            common_type = '@none'
+        if common_language == '@none' and common_type == '@none':
+            break
+    if common_type != '@none':
+        return '@type', common_type
+    return '@language', common_language
+
+
+_empty_context = _FlatContext({})
+# (id(local), id(active)) -> (local, copy of local, active, processed)
+_processed_contexts: Dict[
+    Tuple[int, int], Tuple[Dict, Dict, _FlatContext, _FlatContext]] = {}
+
+
+def _process_context(local: Any, active: _FlatContext) -> _FlatContext:
+    # loaded records share the context instances of a sheet across
+    # all objects, look them up by identity first
+    key = (id(local), id(active))
+    hit = _processed_contexts.get(key)
+    if hit is not None and hit[0] is local and hit[2] is active \
+            and hit[1] == local:
+        return hit[3]
+    if not isinstance(local, dict):
+        # remote, or multiple contexts
+        raise _Unsupported(local)
+    processed = active.extend(local) if local else active
+    if len(_processed_contexts) >= 256:
+        _processed_contexts.clear()
+    _processed_contexts[key] = (local, deepcopy(local), active, processed)
+    return processed
+
+
+def _expand_doc(doc: Any) -> List[Dict]:
+    nodes = doc if isinstance(doc, list) else [doc]
+    res = []
+    for n in nodes:
+        if not isinstance(n, dict):
+            raise _Unsupported(n)
+        n = _expand_node(n, _empty_context)
+        # free-floating nodes are dropped
+        if n and list(n) != ['@id']:
+            res.append(n)
+    return res
+
+
+def _expand_node(obj: Dict, ctx: _FlatContext) -> Dict:
+    if '@context' in obj:
+        ctx = _process_context(obj['@context'], ctx)
+    res: Dict[str, Any] = {}
+    for key, val in sorted(obj.items()):
+        if key == '@context':
+            continue
+        d = None
+        if key.startswith('@'):
+            keyword = key
+        else:
+            d = ctx.expand_key(key)
+            if d is None:
+                continue
+            # keyword alias
+            keyword = d.iri if d.iri.startswith('@') else None
+        if keyword is not None:
+            if keyword not in ('@id', '@type') or keyword in res:
+                raise _Unsupported(key)
+            res[keyword] = ctx.expand_iri(val, vocab=False) \
+                if keyword == '@id' else [
+                    ctx.expand_iri(v, vocab=True)
+                    for v in (val if isinstance(val, list) else [val])
+                ]
+            continue
+        if val is None:
+            continue
+        items = []
+        for v in (val if isinstance(val, list) else [val]):
+            if v is None:
+                continue
+            if isinstance(v, dict):
+                items.append(_expand_node(v, ctx))
+            elif isinstance(v, (str, int, float, bool)):
+                items.append(
+                    {'@value': v} if d.type is None
+                    else {'@type': d.type, '@value': v})
+            else:
+                # nested lists
+                raise _Unsupported(v)
+        vals = res.setdefault(d.iri, [])
+        if d.list:
+            vals.append({'@list': items})
+        else:
+            vals.extend(items)
+    return res
+
+
+def _compact_doc(doc: Any, ctx: Any) -> Dict:
+    if isinstance(ctx, dict) and '@context' in ctx:
+        ctx = ctx['@context']
+    active = _process_context(ctx, _empty_context)
+    nodes = [_compact_node(n, active) for n in _expand_doc(doc)]
+    res = {'@context': ctx} if ctx else {}
+    if len(nodes) == 1:
+        res.update(nodes[0])
+    elif nodes:
+        res['@graph'] = nodes
+    return res
+
+
+def _compact_node(node: Dict, ctx: _FlatContext) -> Dict:
+    res: Dict[str, Any] = {}
+    # properties whose values are not to be compacted to a single value
+    keep = set()
+    for key, vals in sorted(node.items()):
+        if key == '@id':
+            name = ctx.get_alias('@id')
+            res[name] = ctx.compact_iri(vals, vocab=False)
+            keep.add(name)
+            continue
+        if key == '@type':
+            types = [ctx.compact_iri(t, vocab=True) for t in vals]
+            name = ctx.get_alias('@type')
+            res[name] = types[0] if len(types) == 1 else types
+            keep.add(name)
+            continue
+        if not vals:
+            res.setdefault(ctx.select_term(key, {})[0], [])
+        for v in vals:
+            name, coercion = ctx.select_term(key, v)
+            if '@list' not in v:
+                res.setdefault(name, []).append(
+                    _compact_value(v, coercion, ctx))
+                continue
+            items = [_compact_value(i, coercion, ctx) for i in v['@list']]
+            d = ctx.terms.get(name)
+            if d is None or not d.list:
+                res.setdefault(name, []).append({'@list': items})
+            elif name in res:
+                # more than one list for the same property
+                raise _Unsupported(name)
+            else:
+                res[name] = items
+                keep.add(name)
+    return {
+        k: v[0] if len(v) == 1 and k not in keep else v
+        for k, v in res.items()
+    }
+
+
+def _compact_value(value: Dict, coercion: str | None, ctx: _FlatContext):
+    if '@value' not in value:
+        return _compact_node(value, ctx)
+    typ = value.get('@type')
+    if typ is None or typ == coercion:
+        return value['@value']
+    return {
+        ctx.get_alias('@type'): ctx.compact_iri(typ, vocab=True),
+        '@value': value['@value'],
+    }
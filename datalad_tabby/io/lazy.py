@@ -0,0 +1,119 @@
+"""Proxies for lazily loaded `tabby` sheet imports"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Mapping,
+    Sequence,
+)
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+__all__ = ['LazyTabbyDict', 'LazyTabbyList', 'materialize']
+
+
+class _LazyImport:
+    """Base class for proxies of imported sheets
+
+    The sheet is loaded on first access via the given ``load`` callable,
+    and the result is kept for any subsequent access.
+    """
+    def __init__(self, load: Callable[[], Dict | List], optional: bool):
+        self._load = load
+        self._data = None
+        self._lock = Lock()
+        # whether the proxy represents an optional import
+        self.optional = optional
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the sheet has been loaded already"""
+        return self._load is None
+
+    def _get(self) -> Dict | List:
+        if self._load is not None:
+            with self._lock:
+                # check again, another thread may have loaded it already
+                if self._load is not None:
+                    self._data = self._load()
+                    self._load = None
+        return self._data
+
+    def __eq__(self, other):
+        if isinstance(other, _LazyImport):
+            other = other._get()
+        return self._get() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        # this also serves str(), and thereby any interpolation in
+        # override specifications
+        return repr(self._get())
+
+
+class LazyTabbyDict(_LazyImport, Mapping):
+    """Dict-like proxy of a ``@tabby-single-...`` import"""
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+
+class LazyTabbyList(_LazyImport, Sequence):
+    """List-like proxy of a ``@tabby-many-...`` import"""
+    def __getitem__(self, idx):
+        return self._get()[idx]
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+
+def materialize(obj: Any) -> Any:
+    """Load all lazy imports of a record, and return it as plain data
+
+    Proxies of imported sheets are replaced by the plain ``dict``, and
+    ``list`` data structures they represent, recursively. The result is
+    identical to a record loaded without ``lazy=True``, and can be
+    serialized with ``json.dumps()``.
+    """
+    if isinstance(obj, _LazyImport):
+        obj = obj._get()
+    if isinstance(obj, Mapping):
+        mobj = {}
+        for k, v in obj.items():
+            mv = materialize(v)
+            # an import of a missing, or empty sheet would have been
+            # removed from the record by an eager load
+            if k != '@context' and _has_lazy_import(v) and _is_empty_value(
+                    [mv] if isinstance(v, _LazyImport) else mv):
+                continue
+            mobj[k] = mv
+        return mobj
+    if isinstance(obj, list):
+        return [materialize(v) for v in obj]
+    return obj
+
+
+def _has_lazy_import(v: Any) -> bool:
+    # whether a property value is, or has a lazy import (at the first level)
+    return isinstance(v, _LazyImport) or (
+        isinstance(v, list) and any(isinstance(i, _LazyImport) for i in v))
+
+
+def _is_empty_value(vals: List) -> bool:
+    # same rule as the compaction of eagerly loaded objects: a value that
+    # is entirely made up of empty containers
+    return all(isinstance(v, (dict, list)) and not v for v in vals)
@@ -0,0 +1,71 @@
+"""Directory listings and convention path indices
+
+The loader answers any question of file existence from directory listings,
+and looks up convention-based fallbacks in an index of the files in all
+convention paths.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import os
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+)
+
+_std_convention_path = Path(__file__).parent / 'conventions'
+
+
+def _listdir(dpath: Path) -> frozenset:
+    # names of the existing files in a directory. Like Path.exists(), a
+    # symlink without a target (e.g., an annexed file without content)
+    # does not count
+    try:
+        with os.scandir(dpath) as it:
+            return frozenset(
+                e.name for e in it
+                if not e.is_symlink() or os.path.exists(e.path))
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
+def _build_convention_index(
+    cpaths: List[Path],
+) -> Dict[str, Dict[str, Path]]:
+    """Index of all files in all convention paths
+
+    The index maps a convention label (e.g., ``tby-sd1``) to a mapping of
+    file names to the file path in the first convention path that
+    provides a file with this name.
+    """
+    index = {}
+    for cp in cpaths:
+        cp_index = _index_std_conventions() \
+            if cp == _std_convention_path else _index_conventions(cp)
+        for scls, files in cp_index.items():
+            scls_index = index.setdefault(scls, {})
+            for fname, fpath in files.items():
+                # earlier convention paths take precedence
+                scls_index.setdefault(fname, fpath)
+    return index
+
+
+def _index_conventions(cpath: Path) -> Dict[str, Dict[str, Path]]:
+    index = {}
+    try:
+        with os.scandir(cpath) as it:
+            cdirs = [e.name for e in it if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return index
+    for scls in cdirs:
+        cdir = cpath / scls
+        index[scls] = {fname: cdir / fname for fname in _listdir(cdir)}
+    return index
+
+
+@lru_cache(maxsize=None)
+def _index_std_conventions() -> Dict[str, Dict[str, Path]]:
+    # the conventions that come with the package do not change
+    return _index_conventions(_std_convention_path)
@@ -2,24 +2,65 @@
 
 from __future__ import annotations
 
-import csv
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 import json
 from pathlib import Path
+from threading import Lock
 from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
     Dict,
+    Generator,
+    Iterator,
     List,
+    Set,
 )
 
+from .cache import SheetCache
+from .lazy import (
+    LazyTabbyDict,
+    LazyTabbyList,
+)
+from .listing import (
+    _build_convention_index,
+    _listdir,
+    _std_convention_path,
+)
 from .load_utils import (
     _assign_context,
     _compact_obj,
     _build_import_trace,
     _get_index_after_last_nonempty,
+    _get_sheet_fpath,
+    _get_sheet_name,
     _get_tabby_prefix_from_sheet_fpath,
+    _iter_tsv_rows,
     _manyrow2obj,
-    _sanitize_override_key,
+    _OverrideSpec,
+    _parse_import_statement,
+    _Projection,
+)
+from .pool import (
+    _map_helping,
+    _thread_pool,
+)
+from .record_cache import (
+    RecordCache,
+    _get_file_signature,
+)
+from .rowfilter import (
+    RowFilter,
+    _get_row_selection_params,
+    _RowSelection,
 )
 
+if TYPE_CHECKING:
+    # only for annotations, the profile module builds on the loader
+    from .profile import TabbyLoadProfile
+
 
 def load_tabby(
     src: Path,
@@ -28,6 +69,14 @@ def load_tabby(
     jsonld: bool = True,
     recursive: bool = True,
     cpaths: List | None = None,
+    cache: SheetCache | None = None,
+    jobs: int | None = None,
+    use_mmap: bool = False,
+    lazy: bool = False,
+    record_cache: RecordCache | None = None,
+    columns: List[str] | Dict[str, List[str]] | None = None,
+    where: str | RowFilter | Callable | List | Dict | None = None,
+    profile: TabbyLoadProfile | None = None,
 ) -> Dict | List:
     """Load a tabby (TSV) record as structured (JSON(-LD)) data
 
@@ -48,13 +97,156 @@ def load_tabby(
 
     With the ``jsonld`` flag, a declared or default JSON-LD context is
     loaded and inserted into the record.
+
+    Any imported table/sheet is only loaded once. When the same sheet is
+    imported at multiple locations of a record, all locations reference the
+    identical data structure, hence a modification at one location is
+    visible at all others. Such structures should be considered read-only,
+    and must be copied (``copy.deepcopy()``) before modification.
+
+    A :class:`SheetCache` instance can be given as ``cache``. Parsed TSV
+    and JSON files are then obtained from, and deposited in this cache.
+    Sharing a cache across ``load_tabby()`` calls avoids reading and parsing
+    unmodified files again.
+
+    With ``jobs`` greater than one, the imports declared in an object are
+    loaded concurrently by up to the given number of threads. This is most
+    useful for records with many sheets on high-latency storage. The result
+    is identical to that of a serial load, including shared data
+    structures. A sheet that is imported in independent parts of a record
+    may be read by two threads at the same time, but only one of the
+    results is used.
+
+    With ``use_mmap``, TSV files are memory-mapped, and rows are decoded
+    from the mapped file block by block. Together with
+    :func:`~datalad_tabby.io.many.iter_tabby_many`, this enables processing of sheets of any size
+    with a small, constant memory footprint.
+
+    With ``lazy``, imported sheets are not loaded right away. Instead, a
+    :class:`~datalad_tabby.io.lazy.LazyTabbyDict` (single), or
+    :class:`~datalad_tabby.io.lazy.LazyTabbyList` (many) proxy is placed
+    in the record. The sheet is loaded on first access of the proxy's
+    content. Optional imports of sheets that do not exist are omitted right
+    away. :func:`~datalad_tabby.io.lazy.materialize` yields a record with
+    all imports loaded, which is identical to the result of a non-lazy
+    load.
+
+    ``src`` can also be a bundle created by
+    :func:`~datalad_tabby.io.bundle.compile_tabby`. The record is then
+    loaded from this single file.
+
+    With a :class:`~datalad_tabby.io.record_cache.RecordCache` as
+    ``record_cache``, a previously loaded record is reused, if none of the
+    files it was loaded from have changed. Otherwise the record is loaded,
+    and deposited in the cache. This cannot be combined with ``lazy``.
+
+    ``columns`` limits the properties of the loaded objects to a selection
+    of keys. A list of keys applies to the sheet at ``src``. A mapping of
+    sheet names (without record prefix, class, and extension, e.g.
+    ``files``) to lists of keys applies to any sheet with that name,
+    whether loaded directly or imported. Unselected properties are not
+    processed at all, and imports declared only in unselected properties
+    are not loaded. Properties that are referenced by overrides of
+    selected keys are used to build the overrides, but are not included
+    in the result.
+
+    ``where`` selects the objects of a 'many' sheet, based on the raw cell
+    values of the rows they are declared in. It can be a
+    :class:`~datalad_tabby.io.rowfilter.RowFilter`, a filter expression
+    (see :meth:`~datalad_tabby.io.rowfilter.RowFilter.parse`), a callable
+    that is given a dict of column names and raw cell values and returns
+    whether a row is selected, or a list of these (all must hold). Like
+    ``columns``, this applies to the sheet at ``src``, or, with a mapping,
+    to any sheet with a given name. Rows that are not selected are skipped
+    right after tokenization. Items of a list-type JSON data sidecar are
+    selected based on their property values.
+
+    With a :class:`~datalad_tabby.io.profile.TabbyLoadProfile` as
+    ``profile``, timings and I/O counts of each loaded sheet are collected
+    in it. This cannot be combined with a ``record_cache``, or a bundle as
+    ``src``.
     """
-    ldr = _TabbyLoader(
+    kwargs = dict(
         jsonld=jsonld,
         recursive=recursive,
         cpaths=cpaths,
+        cache=cache,
+        jobs=jobs,
+        use_mmap=use_mmap,
+        lazy=lazy,
+        columns=columns,
+        where=where,
+    )
+    ldr = _get_bundle_loader(src, kwargs, profile)
+    if ldr is not None:
+        # everything is resolved already, a record cache has nothing to add
+        if lazy:
+            # proxies read from the bundle later on
+            return ldr(src=ldr.root_sheet, single=single)
+        with ldr:
+            return ldr(src=ldr.root_sheet, single=single)
+    if profile is not None:
+        if record_cache is not None:
+            raise ValueError('a record cache cannot be used with a profile')
+        return _get_profiling_loader(profile, kwargs)(src=src, single=single)
+    if record_cache is None:
+        return _TabbyLoader(**kwargs)(src=src, single=single)
+
+    if lazy:
+        raise ValueError('a record cache cannot be used with lazy=True')
+    # everything that determines the loaded record, other than file content
+    params = dict(
+        single=single,
+        jsonld=jsonld,
+        recursive=recursive,
+        cpaths=[str(cp) for cp in cpaths or []],
+        columns=columns if isinstance(columns, dict) or columns is None
+        else list(columns),
+        where=_get_row_selection_params(where),
     )
-    return ldr(src=src, single=single)
+    rec = record_cache.get(src, params)
+    if rec is not None:
+        return rec
+    ldr = _DependencyTrackingLoader(**kwargs)
+    rec = ldr(src=src, single=single)
+    record_cache.put(src, params, rec, files=ldr.read, absent=ldr.absent)
+    return rec
+
+
+def _get_bundle_loader(
+    src: Path,
+    kwargs: Dict,
+    profile: TabbyLoadProfile | None = None,
+) -> _TabbyLoader | None:
+    # import here, the bundle module builds on the loader
+    from .bundle import (
+        _BundleLoader,
+        _is_tabby_bundle,
+    )
+    if not _is_tabby_bundle(src):
+        return None
+    if profile is not None:
+        raise ValueError('a bundle cannot be loaded with a profile')
+    return _BundleLoader(Path(src), **kwargs)
+
+
+def _resolve_sheet_fpath(fpath: Path, sheet_name: str) -> Path:
+    """Path of a sheet, as imported by the record component at ``fpath``
+
+    A sheet that is not in the record directory is looked up in the
+    convention paths, exactly as for an import statement.
+    """
+    return _TabbyLoader()._get_corresponding_sheet_fpath(
+        Path(fpath), sheet_name)
+
+
+def _get_profiling_loader(
+    profile: TabbyLoadProfile,
+    kwargs: Dict,
+) -> _TabbyLoader:
+    # import here, the profile module builds on the loader
+    from .profile import _ProfilingLoader
+    return _ProfilingLoader(profile, **kwargs)
 
 
 class _TabbyLoader:
@@ -63,21 +255,73 @@ class _TabbyLoader:
         jsonld: bool = True,
         recursive: bool = True,
         cpaths: List[Path] | None = None,
+        cache: SheetCache | None = None,
+        jobs: int | None = None,
+        use_mmap: bool = False,
+        lazy: bool = False,
+        columns: List[str] | Dict[str, List[str]] | None = None,
+        where: Any = None,
     ):
-        std_convention_path = Path(__file__).parent / 'conventions'
-        if cpaths is None:
-            cpaths = [std_convention_path]
-        else:
-            cpaths.append(std_convention_path)
-        self._cpaths = cpaths
+        # do not modify a caller's list
+        self._cpaths = [Path(cp) for cp in cpaths or []]
+        self._cpaths.append(_std_convention_path)
         self._jsonld = jsonld
         self._recursive = recursive
+        self._cache = cache
+        self._jobs = jobs
+        self._use_mmap = use_mmap
+        self._lazy = lazy
+        # selected keys, by sheet name. A plain list applies to the sheet
+        # that is loaded first
+        self._columns = columns
+        # row selections, by sheet name, same as for columns
+        self._where = where
+        # thread pool for concurrent imports, only exists during a load
+        self._pool: ThreadPoolExecutor | None = None
+        # memo of imported sheets, keyed by sheet path and load mode,
+        # such that each sheet is processed only once per loader
+        self._imported: Dict[tuple, Dict | List] = {}
+        # guards additions to the memo, with concurrent imports
+        self._imported_lock = Lock()
+        # directory listings, to answer any question of file existence
+        # without a stat() call per question
+        self._dir_listings: Dict[Path, frozenset] = {}
+        # lazily built index of convention-based fallback files
+        self._convention_index: Dict[str, Dict[str, Path]] | None = None
+        # post-processing plans, one per sheet
+        self._plans: Dict[Path, _SheetPlan] = {}
 
     def __call__(self, src: Path, *, single: bool = True):
-        return (self._load_single if single else self._load_many)(
-            src=src,
-            trace=[],
-        )
+        self._set_root_selection(src)
+        with self._parallel():
+            return (self._load_single if single else self._load_many)(
+                src=src,
+                trace=[],
+            )
+
+    def iter_many(self, src: Path) -> Generator[Dict, None, None]:
+        self._set_root_selection(src)
+        with self._parallel():
+            yield from self._iter_many(src=src, trace=[])
+
+    def _set_root_selection(self, src: Path):
+        if self._columns is not None and not isinstance(self._columns, dict):
+            self._columns = {_get_sheet_name(src): self._columns}
+        if self._where is not None and not isinstance(self._where, dict):
+            self._where = {_get_sheet_name(src): self._where}
+
+    @contextmanager
+    def _parallel(self):
+        if self._pool is not None:
+            # nested, the pool is set up already
+            yield
+            return
+        with _thread_pool(self._jobs) as pool:
+            self._pool = pool
+            try:
+                yield
+            finally:
+                self._pool = None
 
     def _load_single(
         self,
@@ -85,40 +329,48 @@ class _TabbyLoader:
         src: Path,
         trace: List,
     ) -> Dict:
-        jfpath = self._get_corresponding_jsondata_fpath(src)
-        obj = json.load(jfpath.open()) if jfpath.exists() else {}
-        if obj and not src.exists():
+        plan = self._get_sheet_plan(src)
+        if plan.row_selection is not None:
+            raise ValueError(
+                f'cannot select rows of {src}, it declares a single object')
+        jfpath = plan.jsondata_fpath
+        proj = plan.projection
+        # we must not modify the loaded data in-place, they may be cached
+        obj = dict(self._read_json(jfpath)) if self._exists(jfpath) else {}
+        if proj is not None:
+            obj = proj.select(obj)
+        if obj and not self._exists(src):
             # early exit, there is no tabular data
             return self._postproc_obj(
                 obj,
-                src=src,
+                plan=plan,
                 trace=trace,
             )
 
-        with src.open(newline='') as tsvfile:
-            reader = csv.reader(tsvfile, delimiter='\t')
-            # row_id is useful for error reporting
-            for row_id, row in enumerate(reader):
-                # row is a list of field, with only as many items
-                # as this particular row has columns
-                if not len(row) or not row[0] or row[0].startswith('#'):
-                    # skip empty rows, rows with no key, or rows with
-                    # a comment key
-                    continue
-                key = row[0]
-                val = row[1:]
-                # cut `val` short and remove trailing empty items
-                val = val[:_get_index_after_last_nonempty(val)]
-                if not val:
-                    # skip properties with no value(s)
-                    continue
-                # we do not amend values for keys!
-                # another row for an already existing key overwrites
-                # we support "sequence" values via multi-column values
-                # supporting two ways just adds unnecessary complexity
-                obj[key] = val
-
-        return self._postproc_obj(obj, src=src, trace=trace)
+        # row_id is useful for error reporting
+        for row_id, row in enumerate(self._iter_rows(src)):
+            # row is a list of field, with only as many items
+            # as this particular row has columns
+            if not len(row) or not row[0] or row[0].startswith('#'):
+                # skip empty rows, rows with no key, or rows with
+                # a comment key
+                continue
+            key = row[0]
+            if proj is not None and not proj.needs(key):
+                continue
+            val = row[1:]
+            # cut `val` short and remove trailing empty items
+            val = val[:_get_index_after_last_nonempty(val)]
+            if not val:
+                # skip properties with no value(s)
+                continue
+            # we do not amend values for keys!
+            # another row for an already existing key overwrites
+            # we support "sequence" values via multi-column values
+            # supporting two ways just adds unnecessary complexity
+            obj[key] = val
+
+        return self._postproc_obj(obj, plan=plan, trace=trace)
 
     def _load_many(
         self,
@@ -126,53 +378,86 @@ class _TabbyLoader:
         src: Path,
         trace: List,
     ) -> List[Dict]:
+        return list(self._iter_many(src=src, trace=trace))
+
+    def _iter_many(
+        self,
+        *,
+        src: Path,
+        trace: List,
+    ) -> Generator[Dict, None, None]:
         obj_tmpl = {}
-        array = list()
-        jfpath = self._get_corresponding_jsondata_fpath(src)
-        if jfpath.exists():
-            jdata = json.load(jfpath.open())
+        plan = self._get_sheet_plan(src)
+        proj = plan.projection
+        sel = plan.row_selection
+        jfpath = plan.jsondata_fpath
+        if self._exists(jfpath):
+            jdata = self._read_json(jfpath)
             if isinstance(jdata, dict):
                 obj_tmpl = jdata
             elif isinstance(jdata, list):
-                array.extend(
-                    self._postproc_obj(obj, src=src, trace=trace)
-                    for obj in jdata
-                )
-        if array and not src.exists():
-            # early exit, there is no tabular data
-            return array
+                for obj in jdata:
+                    if sel is not None and not sel.matches_obj(obj):
+                        continue
+                    if proj is not None:
+                        obj = proj.select(obj)
+                    yield self._postproc_obj(obj, plan=plan, trace=trace)
+                if jdata and not self._exists(src):
+                    # early exit, there is no tabular data
+                    return
 
         # the table field/column names have purposefully _nothing_
         # to do with any possibly loaded JSON data
         fieldnames = None
-
-        with src.open(newline='') as tsvfile:
-            # we cannot use DictReader -- we need to support identically named
-            # columns
-            reader = csv.reader(tsvfile, delimiter='\t')
-            # row_id is useful for error reporting
-            for row_id, row in enumerate(reader):
-                # row is a list of field, with only as many items
-                # as this particular row has columns
-                if not len(row) \
-                        or row[0].startswith('#') \
-                        or all(v is None for v in row):
-                    # skip empty rows, rows with no key, or rows with
-                    # a comment key
-                    continue
-                if fieldnames is None:
-                    # the first non-ignored row defines the property names/keys
-                    # cut `val` short and remove trailing empty items
-                    fieldnames = row[:_get_index_after_last_nonempty(row)]
-                    continue
-
-                obj = obj_tmpl.copy()
-                obj.update(_manyrow2obj(row, fieldnames))
-                obj = self._postproc_obj(obj, src=src, trace=trace)
-
-                # simplify single-item lists to a plain value
-                array.append(obj)
-        return array
+        # indices of the columns to consider, all by default
+        columns = None
+        # row predicate, if any
+        match = None
+        # row filters see all properties, selection happens afterwards
+        defaults = obj_tmpl
+        if proj is not None:
+            obj_tmpl = proj.select(obj_tmpl)
+
+        # we cannot use DictReader -- we need to support identically named
+        # columns
+        # row_id is useful for error reporting
+        for row_id, row in enumerate(self._iter_rows(src)):
+            # row is a list of field, with only as many items
+            # as this particular row has columns
+            if not len(row) \
+                    or row[0].startswith('#') \
+                    or all(v is None for v in row):
+                # skip empty rows, rows with no key, or rows with
+                # a comment key
+                continue
+            if fieldnames is None:
+                # the first non-ignored row defines the property names/keys
+                # cut `val` short and remove trailing empty items
+                fieldnames = row[:_get_index_after_last_nonempty(row)]
+                if proj is not None:
+                    columns = [
+                        i for i, k in enumerate(fieldnames) if proj.needs(k)
+                    ]
+                if sel is not None:
+                    match = sel.compile(fieldnames, defaults)
+                continue
+
+            if match is not None and not match(row):
+                continue
+            obj = obj_tmpl.copy()
+            obj.update(_manyrow2obj(row, fieldnames, columns))
+            yield self._postproc_obj(obj, plan=plan, trace=trace)
+
+    def _iter_rows(self, fpath: Path) -> Iterator[List[str]]:
+        if self._cache is not None:
+            return iter(self._cache.get_rows(fpath))
+        return _iter_tsv_rows(fpath, use_mmap=self._use_mmap)
+
+    def _read_json(self, fpath: Path) -> Any:
+        if self._cache is not None:
+            return self._cache.get_json(fpath)
+        with fpath.open() as jfile:
+            return json.load(jfile)
 
     def _resolve_value(
         self,
@@ -182,68 +467,157 @@ class _TabbyLoader:
     ):
         if not self._recursive:
             return v
-        if not isinstance(v, str):
-            return v
-
-        if v.startswith('@tabby-single-'):
-            loader = self._load_single
-            sheet = v[14:]
-        elif v.startswith('@tabby-optional-single-'):
-            loader = self._load_single
-            sheet = v[23:]
-        elif v.startswith('@tabby-many-'):
-            loader = self._load_many
-            sheet = v[12:]
-        elif v.startswith('@tabby-optional-many-'):
-            loader = self._load_many
-            sheet = v[21:]
-        else:
-            # strange, but not enough reason to fail
+        istmt = _parse_import_statement(v)
+        if istmt is None:
             return v
+        single, sheet, optional = istmt
 
         src = self._get_corresponding_sheet_fpath(src_fpath, sheet)
+        # check the trace even when the sheet was loaded before, a circular
+        # import would not have made it into the memo anyways, but we want
+        # a consistent error
         trace = _build_import_trace(src, trace)
 
+        memo_key = (src, single)
+        # a plain lookup is safe without the lock
+        memoized = self._imported.get(memo_key)
+        if memoized is not None:
+            return memoized
+
+        if self._lazy:
+            if optional and not self._exists(src) and not self._exists(
+                    self._get_corresponding_jsondata_fpath(src)):
+                # we know already that there is nothing to load
+                return {}
+            loaded = (LazyTabbyDict if single else LazyTabbyList)(
+                partial(self._load_import, src, single, optional, trace),
+                optional=optional,
+            )
+        else:
+            loaded = self._load_import(src, single, optional, trace)
+            if loaded == {} and optional:
+                # do not memoize, the sheet may have merely been missing
+                return loaded
+        with self._imported_lock:
+            # another thread may have loaded the same sheet meanwhile,
+            # every location must reference the same data structure
+            return self._imported.setdefault(memo_key, loaded)
+
+    def _load_import(
+        self,
+        src: Path,
+        single: bool,
+        optional: bool,
+        trace: List,
+    ) -> Dict | List:
+        loader = self._load_single if single else self._load_many
         try:
-            loaded = loader(src=src, trace=trace)
+            return loader(src=src, trace=trace)
         except FileNotFoundError:
-            if v.startswith('@tabby-optional-'):
+            if optional:
                 return {}
             else:
                 raise
-        return loaded
+
+    def _is_pending_import(self, v: Any, src_fpath: Path) -> bool:
+        istmt = _parse_import_statement(v)
+        if istmt is None:
+            return False
+        src = self._get_corresponding_sheet_fpath(src_fpath, istmt[1])
+        return (src, istmt[0]) not in self._imported
+
+    def _resolve_values(self, obj: Dict, src: Path, trace: List) -> Dict:
+        obj = {
+            key: val if isinstance(val, list) else [val]
+            for key, val in obj.items()
+        }
+        pending = [
+            (key, i)
+            for key, vals in obj.items()
+            for i, v in enumerate(vals)
+            if self._is_pending_import(v, src)
+        ] if self._pool is not None and self._recursive \
+            and not self._lazy else []
+        if len(pending) < 2:
+            # nothing to gain from going parallel
+            return {
+                key: [
+                    self._resolve_value(v, src, trace=trace)
+                    for v in vals
+                ]
+                for key, vals in obj.items()
+            }
+
+        # each import gets its own trace (see _build_import_trace), hence
+        # the imports are independent and can be loaded in any order.
+        # The same import statement in multiple values is loaded only once
+        stmts = list(dict.fromkeys(obj[key][i] for key, i in pending))
+        loaded = dict(zip(stmts, _map_helping(
+            self._pool,
+            partial(self._resolve_value, src_fpath=src, trace=trace),
+            stmts,
+        )))
+        pending = set(pending)
+        # assemble in the original order
+        return {
+            key: [
+                loaded[v] if (key, i) in pending
+                else self._resolve_value(v, src, trace=trace)
+                for i, v in enumerate(vals)
+            ]
+            for key, vals in obj.items()
+        }
 
     def _postproc_obj(
         self,
         obj: Dict,
-        src: Path,
+        plan: _SheetPlan,
         trace: List,
     ):
         # look for @tabby-... imports in values, and act on them
-        obj = {
-            key:
-            [
-                self._resolve_value(v, src, trace=trace)
-                for v in (val if isinstance(val, list) else [val])
-            ]
-            for key, val in obj.items()
-        }
+        obj = self._resolve_values(obj, plan.src, trace)
+        proj = plan.projection
         # apply any overrides
-        obj.update(self._build_overrides(src, obj, self._cpaths))
+        if plan.overrides:
+            obj.update(plan.overrides.build(
+                obj, keys=None if proj is None else proj.keys))
+        if proj is not None:
+            # drop anything that was only needed for the overrides
+            obj = {k: v for k, v in obj.items() if k in proj.keys}
 
         obj = _compact_obj(obj)
 
-        if not self._jsonld:
-            # early exit
-            return obj
-
-        # with jsonld==True, looks for a context
-        ctx = self._get_corresponding_context(src)
-        if ctx:
-            _assign_context(obj, ctx)
+        # with jsonld==True, the plan has any context
+        if plan.context:
+            # all objects of a sheet share the same context instance
+            _assign_context(obj, plan.context)
 
         return obj
 
+    def _get_sheet_plan(self, src: Path) -> _SheetPlan:
+        plan = self._plans.get(src)
+        if plan is not None:
+            return plan
+        ofpath = self._get_corresponding_override_fpath(src)
+        overrides = _OverrideSpec(self._read_json(ofpath)) \
+            if self._exists(ofpath) else None
+        name = _get_sheet_name(src)
+        columns = self._columns.get(name) if self._columns else None
+        where = self._where.get(name) if self._where else None
+        plan = _SheetPlan(
+            src=src,
+            jsondata_fpath=self._get_corresponding_jsondata_fpath(src),
+            override_fpath=ofpath,
+            overrides=overrides,
+            context=self._get_corresponding_context(src)
+            if self._jsonld else None,
+            projection=None if columns is None
+            else _Projection(columns, overrides),
+            row_selection=None if where is None else _RowSelection(where),
+        )
+        self._plans[src] = plan
+        return plan
+
     def _get_corresponding_jsondata_fpath(self, fpath: Path) -> Path:
         return self._cvnfb(fpath.parent / f'{fpath.stem}.json')
 
@@ -264,8 +638,8 @@ class _TabbyLoader:
         )
         ctx = {}
         for ctx_fpath in (rec_ctx_fpath, sheet_ctx_fpath):
-            if ctx_fpath.exists():
-                custom_ctx = json.load(ctx_fpath.open())
+            if self._exists(ctx_fpath):
+                custom_ctx = self._read_json(ctx_fpath)
                 # TODO report when redefinitions occur
                 ctx.update(custom_ctx)
 
@@ -274,51 +648,15 @@ class _TabbyLoader:
     def _get_corresponding_override_fpath(self, fpath: Path) -> Path:
         return self._cvnfb(fpath.parent / f'{fpath.stem}.override.json')
 
-    def _build_overrides(self, src: Path, obj: Dict, cpaths):
-        # sanitize key names in object
-        sanitized_obj = {
-            _sanitize_override_key(k): v
-            for k, v in obj.items()
-        }
-        overrides = {}
-        ofpath = self._cvnfb(self._get_corresponding_override_fpath(src))
-        if not ofpath.exists():
-            # we have no overrides
-            return overrides
-        orspec = json.load(ofpath.open())
-        for k in orspec:
-            spec = orspec[k]
-            ov = []
-            for s in (spec if isinstance(spec, list) else [spec]):
-                # interpolate str spec, anything else can pass
-                # through as-is
-                if not isinstance(s, str):
-                    ov.append(s)
-                    continue
-                try:
-                    o = s.format(**sanitized_obj)
-                except KeyError:
-                    # we do not have what this override spec need, skip it
-                    # TODO log this
-                    continue
-                ov.append(o)
-            overrides[k] = ov
-        return overrides
-
     # TODO rename `sheet` to `tsvsheet` to clarify
     def _get_corresponding_sheet_fpath(
         self, fpath: Path, sheet_name: str,
     ) -> Path:
-        prefix = _get_tabby_prefix_from_sheet_fpath(fpath)
-        if prefix:
-            ret = fpath.parent / f'{prefix}_{sheet_name}.tsv'
-        else:
-            ret = fpath.parent / f'{sheet_name}.tsv'
-        return self._cvnfb(ret)
+        return self._cvnfb(_get_sheet_fpath(fpath, sheet_name))
 
     def _cvnfb(self, fpath: Path) -> Path:
         """Get convention-based fallback file path, if needed"""
-        if fpath.exists():
+        if self._exists(fpath):
             # this file exists, no need to search for alternatives
             return fpath
 
@@ -332,13 +670,80 @@ class _TabbyLoader:
             # no class declared, return input
             return fpath
         sname, scls = sheet_comp
-        for cp in self._cpaths:
-            cand = cp / scls / \
-                f"{prefix}" \
-                f"{'_' if prefix else ''}" \
-                f"{sname}{fpath.name[len(sheet):]}"
-            if cand.exists():
-                # stop at the first existing alternative
-                return cand
-        # there was no alternative, go with original
-        return fpath
+        cand = f"{prefix}" \
+            f"{'_' if prefix else ''}" \
+            f"{sname}{fpath.name[len(sheet):]}"
+        # go with the original, if there is no alternative
+        return self._get_convention_index().get(scls, {}).get(cand, fpath)
+
+    def _exists(self, fpath: Path) -> bool:
+        return fpath.name in self._listdir(fpath.parent)
+
+    def _listdir(self, dpath: Path) -> frozenset:
+        listing = self._dir_listings.get(dpath)
+        if listing is None:
+            listing = _listdir(dpath)
+            self._dir_listings[dpath] = listing
+        return listing
+
+    def _get_convention_index(self) -> Dict[str, Dict[str, Path]]:
+        # built once per loader, on the first fallback lookup
+        if self._convention_index is None:
+            self._convention_index = _build_convention_index(self._cpaths)
+        return self._convention_index
+
+
+class _DependencyTrackingLoader(_TabbyLoader):
+    """Loader that records all files a loaded record depends on"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # files that were read, with their signature at the time of reading
+        self.read: Dict[Path, tuple | None] = {}
+        # files that were checked for, but did not exist
+        self.absent: Set[Path] = set()
+
+    def _iter_rows(self, fpath: Path) -> Iterator[List[str]]:
+        if fpath not in self.read:
+            self.read[fpath] = _get_file_signature(fpath)
+        return super()._iter_rows(fpath)
+
+    def _read_json(self, fpath: Path) -> Any:
+        if fpath not in self.read:
+            self.read[fpath] = _get_file_signature(fpath)
+        return super()._read_json(fpath)
+
+    def _exists(self, fpath: Path) -> bool:
+        exists = super()._exists(fpath)
+        if not exists:
+            self.absent.add(fpath)
+        return exists
+
+
+class _SheetPlan:
+    """Everything needed to post-process the objects of a sheet
+
+    Plans are determined once per sheet, and are then used for
+    all objects declared in it.
+    """
+    def __init__(
+        self,
+        *,
+        src: Path,
+        jsondata_fpath: Path,
+        override_fpath: Path,
+        overrides: _OverrideSpec | None,
+        context: Dict | None,
+        projection: _Projection | None = None,
+        row_selection: _RowSelection | None = None,
+    ):
+        self.src = src
+        self.jsondata_fpath = jsondata_fpath
+        self.override_fpath = override_fpath
+        # compiled override specification
+        self.overrides = overrides
+        # merged record and sheet context
+        self.context = context
+        # selection of object properties, if any
+        self.projection = projection
+        # conditions for the rows of a 'many' sheet, if any
+        self.row_selection = row_selection
@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import csv
+from functools import partial
+from itertools import chain
+import locale
+import mmap
+import os
 from pathlib import Path
+import re
+from string import Formatter
 from typing import (
     Dict,
+    Iterable,
+    Iterator,
     List,
+    Tuple,
 )
 
 
@@ -28,6 +39,154 @@ def _get_tabby_prefix_from_sheet_fpath(fpath: Path) -> str:
         return stem[:(-1) * stem[::-1].index('_') - 1]
 
 
+def _get_sheet_name(fpath: Path) -> str:
+    """Name of a sheet, without record prefix, class, and extensions"""
+    prefix = _get_tabby_prefix_from_sheet_fpath(fpath)
+    name = fpath.name[len(prefix) + 1:] if prefix else fpath.name
+    return name.split('.', maxsplit=1)[0].split('@', maxsplit=1)[0]
+
+
+def _get_sheet_fpath(fpath: Path, sheet_name: str) -> Path:
+    """Path of a sheet in the same record as the sheet at ``fpath``"""
+    prefix = _get_tabby_prefix_from_sheet_fpath(fpath)
+    if prefix:
+        return fpath.parent / f'{prefix}_{sheet_name}.tsv'
+    else:
+        return fpath.parent / f'{sheet_name}.tsv'
+
+
+# number of characters to read from a TSV file at once
+_tsv_read_size = 1024 * 1024
+# characters that str.splitlines() considers line boundaries, but
+# file iteration (and the csv module) does not
+_non_tsv_linebreaks = (
+    '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+_tsv_line_regex = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+# whether we can tell the OS how we are using a memory-mapped file
+_have_madvise = hasattr(mmap.mmap, 'madvise') \
+    and hasattr(mmap, 'MADV_SEQUENTIAL') and hasattr(mmap, 'MADV_DONTNEED')
+
+
+def _iter_tsv_rows(
+        fpath: Path, use_mmap: bool = False) -> Iterator[List[str]]:
+    """Yield the rows of a TSV file as lists of field values
+
+    The rows are identical to those reported by
+    ``csv.reader(f, delimiter='\\t')`` for a file opened with
+    ``newline=''``. However, the file is read in large blocks, and
+    lines are split directly on tab characters. Only lines that contain
+    a quote character are passed on to the csv module.
+
+    With ``use_mmap``, the file is memory-mapped, and blocks are decoded
+    from the mapped file, one at a time.
+    """
+    if use_mmap:
+        yield from _tokenize_tsv_blocks(_iter_mapped_blocks(fpath))
+        return
+    with fpath.open(newline='') as tsvfile:
+        yield from _tokenize_tsv_blocks(
+            iter(partial(tsvfile.read, _tsv_read_size), ''))
+
+
+def _iter_mapped_blocks(fpath: Path) -> Iterator[str]:
+    """Yield decoded blocks of text from a memory-mapped file
+
+    Blocks end at a line break, such that no multi-byte character can be
+    split across blocks. Pages of the mapped file are released after a
+    block was decoded (on platforms that support it), hence the resident
+    memory of the process does not grow with the size of the file.
+    """
+    # same as the default for open() in text mode
+    encoding = locale.getpreferredencoding(False)
+    with fpath.open('rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # empty files cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if _have_madvise:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            start = 0
+            while start < size:
+                end = mm.rfind(b'\n', start, start + _tsv_read_size) + 1
+                if end <= start:
+                    # a line longer than the block size, read all of it
+                    end = mm.find(b'\n', start + _tsv_read_size) + 1 or size
+                yield mm[start:end].decode(encoding)
+                if _have_madvise:
+                    # we are done with these pages, the madvise() range must
+                    # start at a page boundary
+                    pstart = start - start % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, pstart, end - pstart)
+                start = end
+
+
+def _tokenize_tsv_blocks(blocks: Iterator[str]) -> Iterator[List[str]]:
+    pending = ''
+    for block in blocks:
+        if pending:
+            block = pending + block
+        lines, pending = _split_tsv_lines(block)
+        if '"' in block:
+            # quoting, from here on we need to go line by line
+            yield from _tokenize_tsv_lines(
+                chain(lines, _iter_tsv_lines(blocks, pending)))
+            return
+        for line in lines:
+            # a line can only contain \r and \n as its terminator
+            line = line.rstrip('\r\n')
+            yield line.split('\t') if line else []
+    if pending:
+        # last line, possibly with a trailing \r
+        pending = pending.rstrip('\r')
+        yield pending.split('\t') if pending else []
+
+
+def _tokenize_tsv_lines(lines: Iterator[str]) -> Iterator[List[str]]:
+    for line in lines:
+        if '"' in line:
+            # quoting, leave it to the csv module. The reader will consume
+            # any further lines of a multi-line field from `lines`
+            yield next(csv.reader(chain((line,), lines), delimiter='\t'))
+            continue
+        # a line can only contain \r and \n as its terminator
+        line = line.rstrip('\r\n')
+        yield line.split('\t') if line else []
+
+
+def _iter_tsv_lines(
+        blocks: Iterator[str], pending: str = '') -> Iterator[str]:
+    """Yield lines, including their terminators, from blocks of text
+
+    ``pending`` is the (incomplete) line preceding the first block.
+    """
+    for block in blocks:
+        if pending:
+            block = pending + block
+        lines, pending = _split_tsv_lines(block)
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _split_tsv_lines(block: str) -> Tuple[List[str], str]:
+    """Split a block of text into lines, including their terminators
+
+    Lines are split exactly like file iteration with ``newline=''`` does,
+    i.e., at any of ``\\n``, ``\\r\\n``, and ``\\r``. Returns the
+    list of complete lines, and any incomplete last line.
+    """
+    if any(c in block for c in _non_tsv_linebreaks):
+        lines = _tsv_line_regex.findall(block)
+    else:
+        lines = block.splitlines(True)
+    # the last line may continue in the next block, even when it ends
+    # with \r, which could be the first half of a \r\n
+    if lines and lines[-1][-1] != '\n':
+        return lines, lines.pop()
+    return lines, ''
+
+
 def _get_index_after_last_nonempty(val: List) -> int:
     for i, v in enumerate(val[::-1]):
         if v:
@@ -35,15 +194,36 @@ def _get_index_after_last_nonempty(val: List) -> int:
     return 0
 
 
+def _parse_import_statement(v: str) -> Tuple[bool, str, bool] | None:
+    """Parse a ``@tabby-...`` import statement
+
+    Returns a tuple of a flag whether a single object is imported, the name
+    of the imported sheet, and a flag whether the import is optional. If
+    ``v`` is not an import statement, ``None`` is returned.
+    """
+    if not isinstance(v, str) or not v.startswith('@tabby-'):
+        return None
+    if v.startswith('@tabby-single-'):
+        return True, v[14:], False
+    elif v.startswith('@tabby-optional-single-'):
+        return True, v[23:], True
+    elif v.startswith('@tabby-many-'):
+        return False, v[12:], False
+    elif v.startswith('@tabby-optional-many-'):
+        return False, v[21:], True
+    # strange, but not enough reason to fail
+    return None
+
+
 def _build_import_trace(src: Path, trace: List) -> List:
     if src in trace:
         raise RecursionError(
             f'circular import: {src} is (indirectly) referencing itself')
 
-    # TODO if we ever want to go parallel, we should produce an independent
-    # list instance here
-    trace.append(src)
-    return trace
+    # each import branch gets its own trace. A shared trace would make
+    # any repeated (but non-circular) import of the same sheet, e.g. in
+    # multiple rows of a table, look like a circular import
+    return trace + [src]
 
 
 def _compact_obj(obj: Dict) -> Dict:
@@ -65,9 +245,11 @@ def _compact_obj(obj: Dict) -> Dict:
 def _manyrow2obj(
     vals: List,
     fieldnames: List,
+    columns: List[int] | None = None,
 ) -> Dict:
     # if we get here, this is a value row, representing an individual
-    # object
+    # object.
+    # `columns` are the indices of the fields to consider, all by default
     obj = {}
     if len(vals) > len(fieldnames):
         # we have extra values, merge then into the column
@@ -75,10 +257,12 @@ def _manyrow2obj(
         last_key_idx = len(fieldnames) - 1
         lc_vals = vals[last_key_idx:]
         lc_vals = lc_vals[:_get_index_after_last_nonempty(lc_vals)]
-        vals[last_key_idx] = lc_vals
+        # do not modify the row in-place, it may be cached
+        vals = vals[:last_key_idx] + [lc_vals]
 
     # merge values with keys, amending duplicate keys as necessary
-    for i, k in enumerate(fieldnames):
+    for i in range(len(fieldnames)) if columns is None else columns:
+        k = fieldnames[i]
         if i >= len(vals):
             # no more values defined in this row, skip this key
             continue
@@ -102,3 +286,159 @@ def _sanitize_override_key(key: str) -> str:
     """
     # here comes an adhoc set of cases we found necessary to handle
     return key.replace('[', '_').replace(']', '_')
+
+
+class _OverrideTemplate:
+    """Compiled ``str.format``-based override value specification"""
+    __slots__ = ('spec', 'fields')
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        try:
+            # (sanitized) names of all object fields referenced in the spec
+            self.fields = frozenset(_get_format_fields(spec))
+        except ValueError:
+            # malformed spec, we cannot know what it needs. Leave it to
+            # str.format() to report the issue on use
+            self.fields = None
+
+    def format(self, obj: Dict, keymap: Dict[str, str]) -> str | None:
+        """Interpolate the spec with values from ``obj``
+
+        ``keymap`` maps sanitized field names to the corresponding keys
+        in ``obj``. ``None`` is returned when the spec references a field
+        that is not available in ``obj``.
+        """
+        if self.fields is None:
+            kwargs = {sk: obj[k] for sk, k in keymap.items()}
+        else:
+            try:
+                kwargs = {f: obj[keymap[f]] for f in self.fields}
+            except KeyError:
+                return None
+        try:
+            return self.spec.format(**kwargs)
+        except KeyError:
+            return None
+
+
+class _OverrideSpec:
+    """Compiled override specification of a sheet
+
+    All ``str``-type override values are compiled into
+    :class:`_OverrideTemplate` instances once. Mappings of sanitized key
+    names to object keys are built once per distinct set of object keys,
+    rather than for each object.
+    """
+    # upper limit for the number of key mappings to keep around
+    _max_keymaps = 256
+
+    def __init__(self, orspec: Dict):
+        self.spec = [
+            (k, [
+                _OverrideTemplate(s) if isinstance(s, str) else s
+                for s in (v if isinstance(v, list) else [v])
+            ])
+            for k, v in orspec.items()
+        ]
+        self._keymaps: Dict[tuple, Dict[str, str]] = {}
+
+    def __bool__(self):
+        return bool(self.spec)
+
+    def build(
+        self,
+        obj: Dict,
+        keys: frozenset | None = None,
+    ) -> Dict[str, List]:
+        """Build override values for ``obj``
+
+        With ``keys``, only overrides for these keys are built.
+        """
+        keymap = self._get_keymap(tuple(obj))
+        overrides = {}
+        for k, items in self.spec:
+            if keys is not None and k not in keys:
+                continue
+            ov = []
+            for s in items:
+                # interpolate str spec, anything else can pass
+                # through as-is
+                if not isinstance(s, _OverrideTemplate):
+                    ov.append(s)
+                    continue
+                o = s.format(obj, keymap)
+                if o is None:
+                    # we do not have what this override spec need, skip it
+                    # TODO log this
+                    continue
+                ov.append(o)
+            overrides[k] = ov
+        return overrides
+
+    def _get_keymap(self, keys: tuple) -> Dict[str, str]:
+        keymap = self._keymaps.get(keys)
+        if keymap is None:
+            if len(self._keymaps) >= self._max_keymaps:
+                self._keymaps.clear()
+            # in case of sanitization collisions, the last key wins
+            keymap = {_sanitize_override_key(k): k for k in keys}
+            self._keymaps[keys] = keymap
+        return keymap
+
+
+class _Projection:
+    """Selection of the properties of the objects of a sheet
+
+    Besides the selected keys, an object needs all fields that are
+    referenced by the override templates of selected keys. These fields
+    are only kept until overrides are applied.
+    """
+    def __init__(self, keys: Iterable[str], overrides: _OverrideSpec | None):
+        self.keys = frozenset(keys)
+        fields = set()
+        self._needs_all = False
+        for k, items in overrides.spec if overrides else ():
+            if k not in self.keys:
+                continue
+            for s in items:
+                if not isinstance(s, _OverrideTemplate):
+                    continue
+                if s.fields is None:
+                    # malformed spec, it could reference any field
+                    self._needs_all = True
+                else:
+                    fields.update(s.fields)
+        # sanitized names of the fields needed for overrides
+        self._override_fields = frozenset(fields)
+        # decisions per key, the same keys come up again and again
+        self._needed: Dict[str, bool] = {}
+
+    def needs(self, key: str) -> bool:
+        """Whether a property is needed to build an object"""
+        needed = self._needed.get(key)
+        if needed is None:
+            needed = self._needs_all or key in self.keys \
+                or _sanitize_override_key(key) in self._override_fields
+            self._needed[key] = needed
+        return needed
+
+    def select(self, obj: Dict) -> Dict:
+        """Copy of ``obj`` with only the needed properties"""
+        return {k: v for k, v in obj.items() if self.needs(k)}
+
+
+def _get_format_fields(spec: str) -> Iterator[str]:
+    for _, fname, fspec, _ in Formatter().parse(spec):
+        if fname is None:
+            # literal text only
+            continue
+        # only the root name of a field is a key, strip any index or
+        # attribute access
+        root = fname.split('[', maxsplit=1)[0].split('.', maxsplit=1)[0]
+        if root and not root.isdigit():
+            # we let positional fields pass, str.format() will complain
+            yield root
+        if fspec:
+            # nested fields in a format specification
+            yield from _get_format_fields(fspec)
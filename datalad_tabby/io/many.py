@@ -0,0 +1,167 @@
+"""Utilities for loading many objects, or many records, at once"""
+
+from __future__ import annotations
+
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+)
+
+from .cache import SheetCache
+from .load import (
+    _TabbyLoader,
+    _get_bundle_loader,
+    _get_profiling_loader,
+    load_tabby,
+)
+from .record_cache import RecordCache
+from .rowfilter import RowFilter
+
+if TYPE_CHECKING:
+    # only for annotations, the profile module builds on the loader
+    from .profile import TabbyLoadProfile
+
+
+def iter_tabby_many(
+    src: Path,
+    *,
+    jsonld: bool = True,
+    recursive: bool = True,
+    cpaths: List | None = None,
+    cache: SheetCache | None = None,
+    jobs: int | None = None,
+    use_mmap: bool = False,
+    lazy: bool = False,
+    columns: List[str] | Dict[str, List[str]] | None = None,
+    where: str | RowFilter | Callable | List | Dict | None = None,
+    profile: TabbyLoadProfile | None = None,
+) -> Generator[Dict, None, None]:
+    """Iterate over the objects of a tabby 'many' sheet
+
+    This is the streaming counterpart of ``load_tabby(src, single=False)``.
+    Instead of assembling a list of all objects, one fully post-processed
+    object (with imports resolved, overrides applied, and context assigned)
+    is yielded for each item of a list-type JSON data sidecar, and then for
+    each TSV row. Only a single row is processed at any time, hence memory
+    demands do not grow with the number of rows in a sheet.
+
+    All other arguments have the same semantics as those of
+    :func:`~datalad_tabby.io.load.load_tabby`. Note that with a ``cache``,
+    all rows of the sheet are held in memory.
+    """
+    kwargs = dict(
+        jsonld=jsonld,
+        recursive=recursive,
+        cpaths=cpaths,
+        cache=cache,
+        jobs=jobs,
+        use_mmap=use_mmap,
+        lazy=lazy,
+        columns=columns,
+        where=where,
+    )
+    ldr = _get_bundle_loader(src, kwargs, profile)
+    if ldr is not None:
+        if lazy:
+            # proxies read from the bundle later on
+            yield from ldr.iter_many(src=ldr.root_sheet)
+            return
+        with ldr:
+            yield from ldr.iter_many(src=ldr.root_sheet)
+        return
+    ldr = _TabbyLoader(**kwargs) if profile is None \
+        else _get_profiling_loader(profile, kwargs)
+    yield from ldr.iter_many(src=src)
+
+
+class TabbyLoadResult(NamedTuple):
+    """Outcome of loading a record with :func:`load_tabby_many`"""
+    src: Path
+    """Path of the loaded record component"""
+    record: Dict | List | None
+    """Loaded record, or ``None`` on error"""
+    error: Exception | None
+    """Exception raised while loading the record, or ``None``"""
+    profile: TabbyLoadProfile | None = None
+    """Profile of loading the record, if requested"""
+
+
+def load_tabby_many(
+    srcs: Iterable[Path],
+    *,
+    jobs: int | None = None,
+    ordered: bool = True,
+    single: bool = True,
+    jsonld: bool = True,
+    recursive: bool = True,
+    cpaths: List | None = None,
+    record_cache: RecordCache | None = None,
+    profile: bool = False,
+) -> Generator[TabbyLoadResult, None, None]:
+    """Load any number of independent tabby records
+
+    Each path in ``srcs`` is loaded with
+    :func:`~datalad_tabby.io.load.load_tabby`, and a
+    :class:`TabbyLoadResult` is yielded for it. Errors are captured in the
+    result, and do not stop the processing of other records.
+
+    With ``jobs`` greater than one, records are loaded in parallel by a
+    pool of worker processes. Loading is CPU-bound, hence processes rather
+    than threads are used. With ``ordered``, results are yielded in the
+    order of ``srcs``, otherwise in the order of completion.
+
+    With ``profile``, each record is loaded with its own
+    :class:`~datalad_tabby.io.profile.TabbyLoadProfile`, which is reported
+    in the result.
+
+    All other arguments have the same semantics as those of
+    :func:`~datalad_tabby.io.load.load_tabby`, and apply to all records.
+    """
+    kwargs = dict(
+        single=single,
+        jsonld=jsonld,
+        recursive=recursive,
+        cpaths=cpaths,
+        record_cache=record_cache,
+        profile=profile,
+    )
+    if not jobs or jobs < 2:
+        for src in srcs:
+            yield _load_tabby_capture_error(src, kwargs)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(_load_tabby_capture_error, src, kwargs): src
+            for src in srcs
+        }
+        for fut in (futures if ordered else as_completed(futures)):
+            try:
+                yield fut.result()
+            except Exception as e:
+                # something went wrong outside the loader, e.g. a result
+                # that cannot be transferred from the worker process
+                yield TabbyLoadResult(futures[fut], None, e)
+
+
+def _load_tabby_capture_error(src: Path, kwargs: Dict) -> TabbyLoadResult:
+    profile = None
+    if kwargs['profile']:
+        # import here, the profile module builds on the loader
+        from .profile import TabbyLoadProfile
+        profile = TabbyLoadProfile()
+    kwargs = dict(kwargs, profile=profile)
+    try:
+        return TabbyLoadResult(src, load_tabby(src, **kwargs), None, profile)
+    except Exception as e:
+        return TabbyLoadResult(src, None, e, profile)
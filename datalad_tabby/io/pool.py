@@ -0,0 +1,52 @@
+"""Thread pool helpers for loading the imports of a record concurrently"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    List,
+)
+
+
+@contextmanager
+def _thread_pool(
+    jobs: int | None,
+) -> Generator[ThreadPoolExecutor | None, None, None]:
+    """Pool of ``jobs`` worker threads, or ``None`` for a serial load"""
+    if not jobs or jobs < 2:
+        yield None
+        return
+    with ThreadPoolExecutor(
+            max_workers=jobs,
+            thread_name_prefix='tabby-load') as pool:
+        yield pool
+
+
+def _map_helping(
+    pool: ThreadPoolExecutor,
+    fn: Callable[[Any], Any],
+    items: List,
+) -> List:
+    """Apply ``fn`` to all ``items`` in the ``pool``, and in this thread
+
+    Results are returned in the order of ``items``.
+    """
+    futures = [pool.submit(fn, item) for item in items]
+    results: List[Any] = [None] * len(items)
+    done = set()
+    # help out with any item that no worker has started yet.
+    # we are going in reverse order, because the workers take from the
+    # front. This also avoids dead-locks, because we never wait for an
+    # item that is not already being processed by another thread
+    for i in reversed(range(len(items))):
+        if futures[i].cancel():
+            results[i] = fn(items[i])
+            done.add(i)
+    for i, fut in enumerate(futures):
+        if i not in done:
+            results[i] = fut.result()
+    return results
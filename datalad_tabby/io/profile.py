@@ -0,0 +1,277 @@
+"""Performance profiling of loading `tabby` records
+
+A :class:`TabbyLoadProfile` given to
+:func:`~datalad_tabby.io.load.load_tabby` (or
+:func:`~datalad_tabby.io.many.iter_tabby_many`) collects counters for each
+sheet of a record:
+
+``rows``
+  Number of TSV rows parsed (including the header, and any comments)
+``parse``
+  Seconds spent reading and parsing the sheet's files
+``postproc``
+  Seconds spent post-processing objects (resolving imports, compacting)
+``override``
+  Seconds spent building the overrides of objects
+``context``
+  Seconds spent determining the sheet's JSON-LD context
+``stat``
+  Number of file existence checks
+``listdir``
+  Number of directory listings read. Existence checks are answered from
+  these listings, a directory is only listed once per load
+``open``
+  Number of files opened. Files obtained from a ``cache`` are not counted
+``bytes``
+  Number of bytes of the opened files
+
+Times are exclusive: the time spent loading an imported sheet is
+attributed to that sheet, and not to the sheet that declares the import.
+With concurrent imports (``jobs``), the time a sheet waits for imports
+loaded by other threads is attributed to its post-processing.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+import threading
+from time import perf_counter
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+)
+
+from .load import _TabbyLoader
+
+__all__ = ['TabbyLoadProfile']
+
+# counters, in the order in which they are reported
+_fields = (
+    'rows', 'parse', 'postproc', 'override', 'context',
+    'stat', 'listdir', 'open', 'bytes',
+)
+_time_fields = frozenset(('parse', 'postproc', 'override', 'context'))
+
+
+class TabbyLoadProfile:
+    """Counters of loading a record, for each sheet
+
+    Besides the counters of the sheets, the time spent on JSON-LD
+    processing of the loaded record can be added to :attr:`jsonld`.
+    Instances can be pickled, e.g., to be reported from a worker process.
+    """
+    def __init__(self):
+        self.sheets: Dict[Path, Dict[str, float]] = {}
+        """Counters by sheet path"""
+        self.jsonld = 0.0
+        """Seconds spent on JSON-LD processing (e.g., compaction)"""
+        self._lock = threading.Lock()
+        # per thread stack of active timers
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return dict(sheets=self.sheets, jsonld=self.jsonld)
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.sheets = state['sheets']
+        self.jsonld = state['jsonld']
+
+    def add(self, sheet: Path, field: str, value: float) -> None:
+        """Add to a counter of a sheet"""
+        with self._lock:
+            counters = self.sheets.get(sheet)
+            if counters is None:
+                counters = self.sheets[sheet] = dict.fromkeys(_fields, 0)
+            counters[field] += value
+
+    @contextmanager
+    def timed(self, sheet: Path, field: str) -> Generator[None, None, None]:
+        """Attribute the time spent in the context to a sheet
+
+        Timed contexts can be nested (in a thread), the time spent in a
+        nested context is not attributed to the enclosing one.
+        """
+        stack = self._get_stack()
+        now = perf_counter()
+        if stack:
+            self._charge(stack[-1], now)
+        stack.append([sheet, field, now])
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            self._charge(stack.pop(), now)
+            if stack:
+                stack[-1][2] = now
+
+    @property
+    def current_sheet(self) -> Path | None:
+        """Sheet of the innermost timed context (of this thread)"""
+        stack = self._get_stack()
+        return stack[-1][0] if stack else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serializable representation of the profile"""
+        return dict(
+            sheets={str(s): dict(c) for s, c in self.sheets.items()},
+            jsonld=self.jsonld,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> TabbyLoadProfile:
+        """Profile from the output of :meth:`as_dict`"""
+        profile = cls()
+        profile.sheets = {Path(s): dict(c) for s, c in data['sheets'].items()}
+        profile.jsonld = data['jsonld']
+        return profile
+
+    def format_table(self) -> str:
+        """Tabular report of all counters, times in milliseconds"""
+        header = ['sheet', *_fields]
+        rows = [
+            [_get_sheet_label(s), *(_format_counter(f, c[f]) for f in _fields)]
+            for s, c in self.sheets.items()
+        ]
+        rows.append(['total', *(
+            _format_counter(f, sum(c[f] for c in self.sheets.values()))
+            for f in _fields
+        )])
+        widths = [
+            max(len(r[i]) for r in [header] + rows)
+            for i in range(len(header))
+        ]
+        lines = [
+            '  '.join(
+                v.ljust(w) if i == 0 else v.rjust(w)
+                for i, (v, w) in enumerate(zip(r, widths))
+            )
+            for r in [header] + rows
+        ]
+        lines.append(f'jsonld {self.jsonld * 1000:.1f}')
+        return '\n'.join(lines)
+
+    def _get_stack(self) -> List:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _charge(self, timer: List, now: float) -> None:
+        self.add(timer[0], timer[1], now - timer[2])
+        timer[2] = now
+
+
+class _ProfilingLoader(_TabbyLoader):
+    """Loader that collects counters in a :class:`TabbyLoadProfile`"""
+    def __init__(self, profile: TabbyLoadProfile, **kwargs):
+        super().__init__(**kwargs)
+        self.profile = profile
+
+    def _load_single(self, *, src: Path, trace: List) -> Dict:
+        with self.profile.timed(src, 'parse'):
+            return super()._load_single(src=src, trace=trace)
+
+    def _iter_many(
+        self,
+        *,
+        src: Path,
+        trace: List,
+    ) -> Generator[Dict, None, None]:
+        objs = super()._iter_many(src=src, trace=trace)
+        while True:
+            # only time the loader, not the consumer of the objects
+            with self.profile.timed(src, 'parse'):
+                obj = next(objs, _end)
+            if obj is _end:
+                return
+            yield obj
+
+    def _iter_rows(self, fpath: Path) -> Iterator[List[str]]:
+        if self._cache is None:
+            self._count_open(fpath, fpath)
+        n = 0
+        try:
+            for row in super()._iter_rows(fpath):
+                n += 1
+                yield row
+        finally:
+            self.profile.add(fpath, 'rows', n)
+
+    def _read_json(self, fpath: Path) -> Any:
+        if self._cache is None:
+            self._count_open(self.profile.current_sheet or fpath, fpath)
+        return super()._read_json(fpath)
+
+    def _postproc_obj(self, obj: Dict, plan, trace: List):
+        with self.profile.timed(plan.src, 'postproc'):
+            return super()._postproc_obj(obj, plan=plan, trace=trace)
+
+    def _get_sheet_plan(self, src: Path):
+        plan = self._plans.get(src)
+        if plan is not None:
+            # overrides are already timed
+            return plan
+        plan = super()._get_sheet_plan(src)
+        if plan.overrides is not None:
+            plan.overrides = _TimedOverrideSpec(
+                plan.overrides, self.profile, src)
+        return plan
+
+    def _get_corresponding_context(self, src: Path):
+        with self.profile.timed(src, 'context'):
+            return super()._get_corresponding_context(src)
+
+    def _exists(self, fpath: Path) -> bool:
+        self.profile.add(self.profile.current_sheet or fpath, 'stat', 1)
+        return super()._exists(fpath)
+
+    def _listdir(self, dpath: Path) -> frozenset:
+        if dpath not in self._dir_listings:
+            self.profile.add(
+                self.profile.current_sheet or dpath, 'listdir', 1)
+        return super()._listdir(dpath)
+
+    def _count_open(self, sheet: Path, fpath: Path) -> None:
+        self.profile.add(sheet, 'open', 1)
+        try:
+            self.profile.add(sheet, 'bytes', os.stat(fpath).st_size)
+        except OSError:
+            # opening will fail too, and report it
+            pass
+
+
+class _TimedOverrideSpec:
+    """Override specification that times the building of overrides"""
+    def __init__(self, spec, profile: TabbyLoadProfile, src: Path):
+        self._spec = spec
+        self._profile = profile
+        self._src = src
+
+    def __bool__(self):
+        return bool(self._spec)
+
+    def build(self, obj: Dict, keys=None) -> Dict:
+        with self._profile.timed(self._src, 'override'):
+            return self._spec.build(obj, keys=keys)
+
+
+_end = object()
+
+
+def _get_sheet_label(sheet: Path) -> str:
+    try:
+        return str(sheet.relative_to(Path.cwd()))
+    except ValueError:
+        return str(sheet)
+
+
+def _format_counter(field: str, value: float) -> str:
+    if field in _time_fields:
+        return f'{value * 1000:.1f}'
+    return str(int(value))
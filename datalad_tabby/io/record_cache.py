@@ -0,0 +1,222 @@
+"""Persistent on-disk cache of loaded `tabby` records"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from tempfile import mkstemp
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+)
+
+__all__ = ['RecordCache']
+
+# bump whenever the layout of cache entries changes
+_entry_format = 1
+
+
+class RecordCache:
+    """Directory with fully loaded records, for reuse across processes
+
+    A cache entry holds the result of a :func:`~datalad_tabby.io.load_tabby`
+    call, and a manifest with the SHA256 hash of every file the record was
+    loaded from (sheets, JSON sidecars, overrides, contexts, and any files
+    from convention paths), and the paths of all files whose existence
+    would have changed the loaded record (e.g., a missing override, or the
+    sheet of an optional import). An entry is only used, when the hashes
+    of all these files match, and none of the absent files has appeared.
+    Hence modification times are irrelevant, and entries stay valid across
+    clones and checkouts of a record.
+
+    Entries are identified by the path of the loaded sheet, the load
+    parameters, and the version of this package. They are written
+    atomically (to a temporary file that is then renamed), such that any
+    number of processes can use the same cache directory concurrently.
+
+    ``max_bytes`` limits the total size of all entries. When exceeded after
+    storing an entry, least-recently used entries are removed.
+
+    Records obtained from a cache are equal to freshly loaded ones. However,
+    unlike with a fresh load, any sheet imported at multiple locations of
+    a record is represented by independent data structures.
+    """
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        """Cache directory, created on first use"""
+        self.max_bytes = max_bytes
+        """Size limit of all cache entries"""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, src: Path, params: Dict) -> Dict | List | None:
+        """Get a cached record, or ``None`` if there is no valid entry"""
+        fpath = self._get_entry_path(src, params)
+        try:
+            with fpath.open('rb') as f:
+                # the first line is the manifest, we need not parse the
+                # record, unless the manifest checks out
+                manifest = json.loads(f.readline())
+                if manifest.get('format') != _entry_format \
+                        or not _is_current(manifest):
+                    self.misses += 1
+                    return None
+                record = json.load(f)
+        except (OSError, ValueError):
+            # no entry, an entry removed by another process while reading,
+            # or a broken entry. A subsequent put() will replace it
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            # mark as used for the eviction order
+            os.utime(fpath)
+        except OSError:
+            pass
+        return record
+
+    def put(
+        self,
+        src: Path,
+        params: Dict,
+        record: Dict | List,
+        files: Dict[Path, Any],
+        absent: Iterable[Path],
+    ) -> bool:
+        """Store a record in the cache
+
+        ``files`` are the files the record was loaded from, mapped to
+        their :func:`_get_file_signature` at the time they were read.
+        ``absent`` are the paths of all files that did not exist. No entry
+        is stored if any file was modified in the meantime, and ``False``
+        is returned in this case.
+        """
+        manifest = dict(format=_entry_format, files={}, absent=[])
+        for fpath, signature in files.items():
+            if signature is None:
+                # was tried, but did not exist
+                manifest['absent'].append(str(fpath))
+                continue
+            digest = _hash_file(fpath)
+            if digest is None or _get_file_signature(fpath) != signature:
+                # changed while loading, whatever we have is not
+                # trustworthy
+                return False
+            manifest['files'][str(fpath)] = digest
+        manifest['absent'].extend(str(p) for p in absent)
+        manifest['absent'] = sorted(set(manifest['absent']))
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = mkstemp(dir=self.path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(json.dumps(manifest))
+                f.write('\n')
+                json.dump(record, f, separators=(',', ':'))
+            os.replace(tmp, self._get_entry_path(src, params))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._evict()
+        return True
+
+    def clear(self) -> int:
+        """Remove all entries from the cache, and report how many"""
+        n = 0
+        for fpath, _ in self._list_entries():
+            try:
+                fpath.unlink()
+                n += 1
+            except FileNotFoundError:
+                # another process was faster
+                pass
+        return n
+
+    def info(self) -> Dict[str, Any]:
+        """Report location, size, and performance counters of the cache"""
+        entries = self._list_entries()
+        return dict(
+            path=str(self.path),
+            entries=len(entries),
+            nbytes=sum(st.st_size for _, st in entries),
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def _get_entry_path(self, src: Path, params: Dict) -> Path:
+        from datalad_tabby import __version__
+        key = json.dumps(
+            [__version__, str(Path(src).absolute()), params],
+            sort_keys=True,
+            default=str,
+        )
+        return self.path / \
+            f'{hashlib.sha256(key.encode("utf-8")).hexdigest()}.json'
+
+    def _list_entries(self) -> List[tuple]:
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if not e.name.endswith('.json') \
+                            or e.name.startswith('.'):
+                        continue
+                    try:
+                        entries.append((Path(e.path), e.stat()))
+                    except FileNotFoundError:
+                        pass
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self):
+        entries = self._list_entries()
+        nbytes = sum(st.st_size for _, st in entries)
+        if nbytes <= self.max_bytes:
+            return
+        # oldest first
+        entries.sort(key=lambda e: e[1].st_mtime_ns)
+        for fpath, st in entries:
+            if nbytes <= self.max_bytes:
+                break
+            try:
+                fpath.unlink()
+            except FileNotFoundError:
+                pass
+            nbytes -= st.st_size
+
+
+def _get_file_signature(fpath: Path) -> tuple | None:
+    try:
+        st = os.stat(fpath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _hash_file(fpath: Path) -> str | None:
+    h = hashlib.sha256()
+    try:
+        with open(fpath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _is_current(manifest: Dict) -> bool:
+    if any(os.path.lexists(p) for p in manifest['absent']):
+        return False
+    return all(
+        _hash_file(Path(p)) == digest
+        for p, digest in manifest['files'].items()
+    )
@@ -0,0 +1,178 @@
+"""Selection of the rows of `tabby` 'many' sheets
+
+Rows are selected based on their raw cell values, before they are turned
+into objects. Rows that are not selected cost no more than tokenizing
+them: they are not merged with their column names, no overrides are
+built for them, and no imports declared in them are loaded.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+__all__ = ['RowFilter']
+
+# the first operator in an expression separates column name and value
+_filter_expr_regex = re.compile(
+    r'^(?P<column>.+?)(?P<op>\^=|~=|=)(?P<value>.*)$', re.DOTALL)
+
+
+class RowFilter:
+    """Condition on the raw cell value(s) of a column
+
+    Supported operators (``op``) are ``=`` (value equals), ``^=`` (value
+    starts with), and ``~=`` (regular expression search in value). A
+    condition holds for a row, when it holds for any cell of the column.
+    This includes the cells of identically named columns, and any trailing
+    values of the last column.
+
+    >>> RowFilter.parse('path[POSIX]^=sub-01/')
+    RowFilter('path[POSIX]', 'sub-01/', op='^=')
+    """
+    def __init__(self, column: str, value: str, op: str = '='):
+        if op == '=':
+            self._test = value.__eq__
+        elif op == '^=':
+            self._test = lambda v: v.startswith(value)
+        elif op == '~=':
+            self._test = re.compile(value).search
+        else:
+            raise ValueError(f'unsupported row filter operator {op!r}')
+        self.column = column
+        self.value = value
+        self.op = op
+
+    @classmethod
+    def parse(cls, expr: str) -> RowFilter:
+        """Create a filter from a ``COLUMN<op>VALUE`` expression"""
+        m = _filter_expr_regex.match(expr)
+        if m is None:
+            raise ValueError(
+                f'invalid row filter {expr!r}, expected COLUMN=VALUE, '
+                'COLUMN^=PREFIX, or COLUMN~=REGEX')
+        return cls(m['column'], m['value'], op=m['op'])
+
+    def __str__(self):
+        return f'{self.column}{self.op}{self.value}'
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(' \
+            f'{self.column!r}, {self.value!r}, op={self.op!r})'
+
+    def test(self, value: Any) -> bool:
+        """Whether a single (raw) value satisfies the condition"""
+        return isinstance(value, str) and bool(self._test(value))
+
+    def matches_obj(self, obj: Dict) -> bool:
+        """Whether the condition holds for the properties of an object"""
+        vals = obj.get(self.column)
+        return any(
+            self.test(v)
+            for v in (vals if isinstance(vals, list) else [vals])
+        )
+
+    def compile(
+        self,
+        fieldnames: List[str],
+        defaults: Dict,
+    ) -> Callable[[List], bool]:
+        """Build a predicate for the rows of a sheet with these columns
+
+        ``defaults`` are the properties that all objects of the sheet
+        share. They are considered when the column does not exist.
+        """
+        test = self.test
+        idx = [i for i, k in enumerate(fieldnames) if k == self.column]
+        if not idx:
+            # the outcome is the same for all rows
+            match = self.matches_obj(defaults)
+            return lambda row: match
+        if idx[-1] == len(fieldnames) - 1:
+            # include any trailing values
+            last = idx.pop()
+            if not idx:
+                return lambda row: any(test(v) for v in row[last:])
+            return lambda row: any(test(v) for v in row[last:]) or any(
+                test(row[i]) for i in idx if i < len(row))
+        if len(idx) == 1:
+            i = idx[0]
+            return lambda row: i < len(row) and test(row[i])
+        return lambda row: any(test(row[i]) for i in idx if i < len(row))
+
+
+class _RowSelection:
+    """All conditions a row must satisfy to be selected
+
+    Conditions are :class:`RowFilter` instances, filter expressions, or
+    callables. A callable is called with a dict of column names and raw
+    cell values (the first cell for identically named columns) for a TSV
+    row, and with the object itself for an item of a list-type JSON
+    sidecar. It must return whether the row is selected.
+    """
+    def __init__(self, where: Any):
+        self.conditions = [
+            RowFilter.parse(c) if isinstance(c, str) else c
+            for c in (where if isinstance(where, (list, tuple)) else [where])
+        ]
+        for c in self.conditions:
+            if not isinstance(c, RowFilter) and not callable(c):
+                raise TypeError(f'unsupported row filter {c!r}')
+
+    def compile(
+        self,
+        fieldnames: List[str],
+        defaults: Dict,
+    ) -> Callable[[List], bool]:
+        """Build a predicate for the rows of a sheet with these columns"""
+        preds = [
+            c.compile(fieldnames, defaults) if isinstance(c, RowFilter)
+            else _compile_callable(c, fieldnames, defaults)
+            for c in self.conditions
+        ]
+        if len(preds) == 1:
+            return preds[0]
+        return lambda row: all(p(row) for p in preds)
+
+    def matches_obj(self, obj: Dict) -> bool:
+        return all(
+            c.matches_obj(obj) if isinstance(c, RowFilter) else c(obj)
+            for c in self.conditions
+        )
+
+
+def _compile_callable(
+    fn: Callable,
+    fieldnames: List[str],
+    defaults: Dict,
+) -> Callable[[List], bool]:
+    idx = {}
+    for i, k in enumerate(fieldnames):
+        # first cell wins for identically named columns
+        idx.setdefault(k, i)
+    return lambda row: bool(fn({
+        **defaults,
+        **{k: row[i] if i < len(row) else '' for k, i in idx.items()},
+    }))
+
+
+def _get_row_selection_params(where: Any) -> Any:
+    """JSON-serializable representation of a row selection
+
+    Raises ``ValueError`` for callables, which have no such
+    representation.
+    """
+    if where is None:
+        return None
+    if isinstance(where, dict):
+        return {k: _get_row_selection_params(v) for k, v in where.items()}
+    if isinstance(where, (list, tuple)):
+        return [_get_row_selection_params(w) for w in where]
+    if isinstance(where, (str, RowFilter)):
+        return str(where)
+    raise ValueError(f'row filter {where!r} has no persistent representation')
@@ -0,0 +1,441 @@
+"""Random access to the rows of `tabby` many-sheets via an index sidecar"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from functools import partial
+import json
+import locale
+import mmap
+import os
+from pathlib import Path
+import re
+import struct
+import sys
+from tempfile import mkstemp
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+import zlib
+
+from .load import _TabbyLoader
+from .load_utils import (
+    _get_index_after_last_nonempty,
+    _manyrow2obj,
+    _tokenize_tsv_lines,
+    _tsv_read_size,
+)
+
+__all__ = ['TabbyRowIndex']
+
+_rowindex_magic = b'TBYRIDX\x00'
+_rowindex_format = 1
+# same line splitting as the TSV tokenizer, but for bytes
+_tsv_bline_regex = re.compile(rb'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+class TabbyRowIndex:
+    """Random access to the objects declared in a large many-sheet
+
+    The index is a sidecar file (by default ``<sheet>.rowidx``) with the
+    byte offset of each data row of the TSV sheet ``sheet``, and,
+    optionally, hash tables for looking up rows by the value of a column.
+    It is built on first use, and built again whenever the sheet was
+    modified (size or modification time changed). If the sidecar cannot
+    be written, the index is kept in memory only.
+
+    Rows are numbered from zero, in the order of the TSV file, counting
+    only rows that declare an object (no header, comment, or empty rows).
+    Objects declared in a list-type JSON data file are not included.
+
+    All methods return fully post-processed objects (imports resolved,
+    overrides applied, and context assigned), identical to those reported
+    by ``load_tabby(sheet, single=False)``. Only the requested rows are
+    read from the sheet. All other keyword arguments have the same
+    semantics as those of :func:`~datalad_tabby.io.load_tabby`.
+
+    The sidecar is mapped into memory while in use. :meth:`close` unmaps
+    it, also when the index is used as a context manager. It is mapped
+    again on next use.
+    """
+    def __init__(
+        self,
+        sheet: Path,
+        *,
+        index_path: Path | None = None,
+        jsonld: bool = True,
+        recursive: bool = True,
+        cpaths: List | None = None,
+    ):
+        self.sheet = Path(sheet)
+        self.index_path = Path(index_path) if index_path \
+            else self.sheet.with_name(f'{self.sheet.name}.rowidx')
+        self._ldr = _TabbyLoader(
+            jsonld=jsonld,
+            recursive=recursive,
+            cpaths=cpaths,
+        )
+        self._index: _RowIndexData | None = None
+        self._fieldnames: List[str] | None = None
+        self._obj_tmpl: Dict | None = None
+
+    def __len__(self) -> int:
+        return self._get_index().nrows
+
+    def __enter__(self) -> TabbyRowIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the index sidecar"""
+        self._set_index(None)
+
+    def get_row(self, n: int) -> Dict:
+        """Get the object declared in the ``n``-th row"""
+        index = self._get_index()
+        if n < 0:
+            n += index.nrows
+        if not 0 <= n < index.nrows:
+            raise IndexError(f'row {n} out of range')
+        return self._get_objs([n])[0]
+
+    def get_rows(self, rows: slice) -> List[Dict]:
+        """Get the objects declared in a slice of rows"""
+        return self._get_objs(range(*rows.indices(len(self))))
+
+    def lookup(self, column: str, value: str) -> List[Dict]:
+        """Get the objects of all rows with ``value`` in ``column``
+
+        The first lookup in a column adds a hash table for it to the index,
+        which requires reading the full sheet. Any subsequent lookup only
+        reads matching rows.
+
+        For a column name that is declared more than once, and for the last
+        column (that also receives the values of any trailing, unnamed
+        columns), any value in any of the respective columns matches.
+        """
+        index = self._get_index()
+        if column not in index.columns:
+            index = self._build_index(list(index.columns) + [column])
+        hashes, rownums = index.columns[column]
+        h = _hash_value(value)
+        candidates = []
+        i = bisect_left(hashes, h)
+        while i < len(hashes) and hashes[i] == h:
+            candidates.append(rownums[i])
+            i += 1
+        # hash collisions are possible, check the actual values
+        rows = self._read_rows(sorted(candidates))
+        fieldnames = self._get_fieldnames()
+        return [
+            self._make_obj(row)
+            for row in rows
+            if value in _get_column_values(row, fieldnames, column)
+        ]
+
+    def _get_objs(self, ns: Iterable[int]) -> List[Dict]:
+        return [self._make_obj(row) for row in self._read_rows(ns)]
+
+    def _make_obj(self, row: List[str]) -> Dict:
+        ldr = self._ldr
+        if self._obj_tmpl is None:
+            plan = ldr._get_sheet_plan(self.sheet)
+            jdata = ldr._read_json(plan.jsondata_fpath) \
+                if ldr._exists(plan.jsondata_fpath) else None
+            # same as in _TabbyLoader._iter_many()
+            self._obj_tmpl = jdata if isinstance(jdata, dict) else {}
+        obj = self._obj_tmpl.copy()
+        obj.update(_manyrow2obj(row, self._get_fieldnames()))
+        return ldr._postproc_obj(
+            obj,
+            plan=ldr._get_sheet_plan(self.sheet),
+            trace=[],
+        )
+
+    def _get_fieldnames(self) -> List[str]:
+        if self._fieldnames is None:
+            row = self._read_rows_at([self._get_index().header_offset])[0]
+            self._fieldnames = row[:_get_index_after_last_nonempty(row)]
+        return self._fieldnames
+
+    def _read_rows(self, ns: Iterable[int]) -> List[List[str]]:
+        offsets = self._get_index().offsets
+        return self._read_rows_at([offsets[n] for n in ns])
+
+    def _read_rows_at(self, offsets: Sequence[int]) -> List[List[str]]:
+        if not offsets:
+            return []
+        encoding = locale.getpreferredencoding(False)
+        with self.sheet.open('rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [
+                next(_tokenize_tsv_lines(
+                    m.group().decode(encoding)
+                    for m in _tsv_bline_regex.finditer(mm, offset)))
+                for offset in offsets
+            ]
+
+    def _get_index(self) -> _RowIndexData:
+        signature = _get_signature(self.sheet)
+        if self._index is not None and self._index.signature == signature:
+            return self._index
+        index = _RowIndexData.read(self.index_path)
+        if index is None or index.signature != signature:
+            columns = list(index.columns) if index is not None else []
+            if index is not None:
+                index.close()
+            return self._build_index(columns)
+        self._set_index(index)
+        return index
+
+    def _set_index(self, index: _RowIndexData | None) -> None:
+        if self._index is not None and self._index is not index:
+            # superseded
+            self._index.close()
+        self._index = index
+
+    def _build_index(self, columns: List[str]) -> _RowIndexData:
+        signature = _get_signature(self.sheet)
+        offsets = array('Q')
+        header_offset = None
+        fieldnames = None
+        # value hashes and row numbers, per column. Plain arrays, no
+        # tuples, to not keep the garbage collector busy
+        pairs = {c: (array('Q'), array('Q')) for c in columns}
+        getters = None
+        for offset, row in _iter_row_offsets(self.sheet):
+            # same as in _TabbyLoader._iter_many(), but TSV rows never
+            # contain `None` values
+            if not len(row) or row[0].startswith('#'):
+                continue
+            if fieldnames is None:
+                header_offset = offset
+                fieldnames = row[:_get_index_after_last_nonempty(row)]
+                getters = [
+                    (pairs[c], _get_column_getter(fieldnames, c))
+                    for c in columns
+                ]
+                continue
+            n = len(offsets)
+            offsets.append(offset)
+            for (hashes, rownums), getter in getters:
+                for v in set(getter(row)):
+                    if v:
+                        hashes.append(_hash_value(v))
+                        rownums.append(n)
+        index_columns = {}
+        for c, (hashes, rownums) in pairs.items():
+            order = sorted(range(len(hashes)), key=hashes.__getitem__)
+            index_columns[c] = (
+                array('Q', (hashes[i] for i in order)),
+                array('Q', (rownums[i] for i in order)),
+            )
+        index = _RowIndexData(
+            signature=signature,
+            header_offset=header_offset or 0,
+            offsets=offsets,
+            columns=index_columns,
+        )
+        try:
+            index.write(self.index_path)
+        except OSError:
+            # read-only location, we can still use it for this session
+            pass
+        self._set_index(index)
+        self._fieldnames = None
+        return index
+
+
+class _RowIndexData:
+    """Content of a row index sidecar
+
+    File layout: magic (8 bytes), length of the JSON header (uint64),
+    JSON header (padded to a multiple of 8 bytes), followed by uint64
+    arrays (native byte order): the row offsets, and for each key column
+    the sorted value hashes, and the corresponding row numbers.
+    """
+    def __init__(
+        self,
+        *,
+        signature: Tuple[int, int] | None,
+        header_offset: int,
+        offsets: Sequence[int],
+        columns: Dict[str, Tuple[Sequence[int], Sequence[int]]],
+        mapped: mmap.mmap | None = None,
+        views: List[memoryview] | None = None,
+    ):
+        self.signature = signature
+        self.header_offset = header_offset
+        self.offsets = offsets
+        self.nrows = len(offsets)
+        self.columns = columns
+        # the mapped sidecar the arrays are views of, if any
+        self._mapped = mapped
+        self._views = views or []
+
+    def close(self) -> None:
+        """Unmap the sidecar, the arrays cannot be used afterwards"""
+        # a mapping cannot be closed while there are views of it
+        for v in self._views:
+            v.release()
+        self._views = []
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    @classmethod
+    def read(cls, fpath: Path) -> _RowIndexData | None:
+        try:
+            with fpath.open('rb') as f:
+                if f.read(len(_rowindex_magic)) != _rowindex_magic:
+                    return None
+                hlen = struct.unpack('<Q', f.read(8))[0]
+                header = json.loads(f.read(hlen))
+                if header.get('format') != _rowindex_format \
+                        or header.get('byteorder') != sys.byteorder:
+                    return None
+                # the arrays are used from the mapped file, nothing else
+                # needs to be read
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        view = memoryview(mm)
+        views = [view]
+        pos = len(_rowindex_magic) + 8 + _pad8(hlen)
+
+        def _array(n):
+            nonlocal pos
+            sub = view[pos:pos + n * 8]
+            a = sub.cast('Q')
+            views.extend((a, sub))
+            pos += n * 8
+            return a
+
+        offsets = _array(header['nrows'])
+        columns = {}
+        for name, n in header['columns']:
+            columns[name] = (_array(n), _array(n))
+        return cls(
+            signature=tuple(header['signature']),
+            header_offset=header['header_offset'],
+            offsets=offsets,
+            columns=columns,
+            mapped=mm,
+            # released in reverse order of creation
+            views=views[::-1],
+        )
+
+    def write(self, fpath: Path):
+        header = json.dumps(dict(
+            format=_rowindex_format,
+            byteorder=sys.byteorder,
+            signature=self.signature,
+            header_offset=self.header_offset,
+            nrows=self.nrows,
+            columns=[[c, len(h)] for c, (h, _) in self.columns.items()],
+        )).encode('utf-8')
+        fd, tmp = mkstemp(dir=fpath.parent, prefix=f'.{fpath.name}.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_rowindex_magic)
+                f.write(struct.pack('<Q', len(header)))
+                f.write(header.ljust(_pad8(len(header)), b' '))
+                for a in _iter_arrays(self):
+                    f.write(array('Q', a).tobytes())
+            os.replace(tmp, fpath)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def _iter_arrays(index: _RowIndexData) -> Iterator[Sequence[int]]:
+    yield index.offsets
+    for hashes, rownums in index.columns.values():
+        yield hashes
+        yield rownums
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _iter_row_offsets(fpath: Path) -> Iterator[Tuple[int, List[str]]]:
+    """Yield the byte offset and the fields of each row of a TSV file"""
+    encoding = locale.getpreferredencoding(False)
+    pos = 0
+
+    def _iter_lines(f):
+        nonlocal pos
+        pending = b''
+        for block in iter(partial(f.read, _tsv_read_size), b''):
+            # bytes.splitlines() only splits at \n, \r\n, and \r,
+            # exactly like the TSV tokenizer
+            lines = (pending + block).splitlines(True)
+            # the last line may continue in the next block
+            pending = lines.pop() if lines[-1][-1:] != b'\n' else b''
+            for line in lines:
+                pos += len(line)
+                yield line.decode(encoding)
+        if pending:
+            pos += len(pending)
+            yield pending.decode(encoding)
+
+    with fpath.open('rb') as f:
+        rows = _tokenize_tsv_lines(_iter_lines(f))
+        while True:
+            # the tokenizer does not read ahead, the row starts where
+            # the last one ended
+            start = pos
+            row = next(rows, None)
+            if row is None:
+                return
+            yield start, row
+
+
+def _get_column_values(
+        row: List[str], fieldnames: List[str], column: str) -> List[str]:
+    return [v for v in _get_column_getter(fieldnames, column)(row) if v]
+
+
+def _get_column_getter(
+        fieldnames: List[str], column: str) -> Callable[[List], List[str]]:
+    """Build a function that reports all values of a column in a row"""
+    idx = [i for i, f in enumerate(fieldnames) if f == column]
+    last = None
+    if fieldnames and fieldnames[-1] == column:
+        # the last column receives any values of trailing unnamed columns,
+        # just like in _manyrow2obj()
+        last = idx.pop()
+    if not idx:
+        # the most common cases, a column name that is declared once
+        return (lambda row: []) if last is None else \
+            (lambda row: row[last:])
+    if len(idx) == 1 and last is None:
+        i = idx[0]
+        return lambda row: row[i:i + 1]
+    if last is None:
+        return lambda row: [row[i] for i in idx if i < len(row)]
+    return lambda row: [row[i] for i in idx if i < len(row)] + row[last:]
+
+
+def _hash_value(value: str) -> int:
+    # a fast hash is more important than a low probability of collisions,
+    # any candidate row is checked for the actual value anyways
+    return zlib.crc32(value.encode('utf-8'))
+
+
+def _get_signature(fpath: Path) -> Tuple[int, int]:
+    st = os.stat(fpath)
+    return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,165 @@
+"""JSON serialization of loaded records
+
+Records are serialized compactly (no whitespace), and by default
+exactly as ``json.dumps(obj, separators=(',', ':'))`` does. With
+``fast=True``, the optional ``orjson`` package is used for encoding, if it
+is installed. Non-ASCII characters are escaped in its output too, but
+some floating point numbers are formatted differently (e.g., ``1e+16``
+as ``1e16``), and non-finite numbers become ``null``. Values that
+``orjson`` cannot encode (e.g., integers beyond 64 bit) are encoded with
+the standard library then.
+
+:func:`iterencode_json` serializes a record in chunks, such that a large
+record can be written out without ever holding its entire serialization
+in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+)
+
+__all__ = ['encode_json', 'iterencode_json']
+
+# containers with more (nested) items than this are not encoded at once,
+# but item by item
+_max_piece_items = 1024
+
+
+def encode_json(obj: Any, *, fast: bool = False) -> str:
+    """Compact JSON serialization of ``obj``
+
+    With ``fast``, ``orjson`` is used for encoding, if it is installed.
+    """
+    return _get_encoder(fast)(obj)
+
+
+def iterencode_json(
+    obj: Any,
+    chunk_size: int = 1 << 20,
+    *,
+    fast: bool = False,
+) -> Iterator[str]:
+    """Compact JSON serialization of ``obj``, in chunks
+
+    Chunks have a length of about ``chunk_size`` characters (the last one
+    is shorter, any other one can be longer when it ends with a long
+    string value). Concatenated, they are the same JSON document as the
+    output of :func:`encode_json` (with the same ``fast`` flag). At least
+    one chunk is yielded.
+    """
+    buf = []
+    size = 0
+    empty = True
+    for piece in _iterencode(obj, _get_encoder(fast)):
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buf)
+            buf = []
+            size = 0
+            empty = False
+    if buf or empty:
+        yield ''.join(buf)
+
+
+def _iterencode(obj: Any, encode: Callable[[Any], str]) -> Iterator[str]:
+    if not isinstance(obj, (dict, list)) \
+            or _count_items(obj, _max_piece_items) <= _max_piece_items:
+        yield encode(obj)
+        return
+    is_dict = isinstance(obj, dict)
+    yield '{' if is_dict else '['
+    sep = ''
+    # consecutive small items are encoded together
+    run = []
+    run_items = 0
+    for item in (obj.items() if is_dict else obj):
+        v = item[1] if is_dict else item
+        n = _count_items(v, _max_piece_items) \
+            if isinstance(v, (dict, list)) else 0
+        if run and run_items + n + 1 > _max_piece_items:
+            yield sep
+            yield encode(dict(run) if is_dict else run)[1:-1]
+            sep = ','
+            run = []
+            run_items = 0
+        if n <= _max_piece_items:
+            run.append(item)
+            run_items += n + 1
+            continue
+        yield sep
+        if is_dict:
+            k = item[0]
+            # as the standard library, for non-string keys
+            yield encode(k if isinstance(k, str) else json.dumps(k))
+            yield ':'
+        yield from _iterencode(v, encode)
+        sep = ','
+    if run:
+        yield sep
+        yield encode(dict(run) if is_dict else run)[1:-1]
+    yield '}' if is_dict else ']'
+
+
+def _count_items(obj: dict | list, limit: int) -> int:
+    # number of items of a container, and of all containers in it.
+    # Counting stops once ``limit`` is exceeded
+    n = len(obj)
+    if n > limit:
+        return n
+    for v in (obj.values() if isinstance(obj, dict) else obj):
+        if isinstance(v, (dict, list)):
+            n += _count_items(v, limit - n)
+            if n > limit:
+                break
+    return n
+
+
+def _encode_stdlib(obj: Any) -> str:
+    return json.dumps(obj, separators=(',', ':'), indent=None)
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    # as the standard library, with surrogate pairs beyond the BMP
+    c = ord(match.group())
+    if c < 0x10000:
+        return f'\\u{c:04x}'
+    c -= 0x10000
+    return f'\\u{0xd800 | (c >> 10):04x}\\u{0xdc00 | (c & 0x3ff):04x}'
+
+
+# non-ASCII characters (and DEL) can only be part of strings in a JSON
+# document
+_non_ascii_regex = re.compile('[^\x00-\x7e]')
+
+
+def _get_encoder(fast: bool) -> Callable[[Any], str]:
+    global _fast_encoder
+    if not fast:
+        return _encode_stdlib
+    if _fast_encoder is None:
+        try:
+            import orjson
+        except ImportError:
+            _fast_encoder = _encode_stdlib
+        else:
+            def _encode_orjson(obj: Any) -> str:
+                try:
+                    enc = orjson.dumps(obj).decode('utf-8')
+                except TypeError:
+                    # not supported by orjson, but maybe by the stdlib
+                    return _encode_stdlib(obj)
+                # the stdlib also escapes DEL
+                return enc if enc.isascii() and '\x7f' not in enc \
+                    else _non_ascii_regex.sub(_escape_non_ascii, enc)
+            _fast_encoder = _encode_orjson
+    return _fast_encoder
+
+
+_fast_encoder: Callable[[Any], str] | None = None
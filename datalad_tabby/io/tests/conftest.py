@@ -0,0 +1,78 @@
+import json
+import pytest
+
+
+@pytest.fixture(autouse=False, scope="function")
+def tabby_record_w_imports(tmp_path):
+    """Record that imports sheets of all kinds, in a modifiable location"""
+    rdir = tmp_path / 'rec'
+    rdir.mkdir()
+    root = rdir / 'rec_dataset.tsv'
+    root.write_text(
+        'name\tdemo\n'
+        'title\tA demo\n'
+        '# comment\t@tabby-single-ignored\n'
+        'org\t@tabby-single-org\n'
+        'author\t@tabby-many-authors\n'
+        # this sheet does not exist
+        'extra\t@tabby-optional-single-extra\n'
+        'files\t@tabby-many-files@tby-ds1\n'
+    )
+    (rdir / 'rec_dataset.override.json').write_text(
+        '{"@id": "ds-{name[0]}"}')
+    (rdir / 'rec.ctx.jsonld').write_text('{}')
+    # JSON-only sheet
+    org = rdir / 'rec_org.tsv'
+    (rdir / 'rec_org.json').write_text(json.dumps(
+        {'name': 'uni', 'contact': '@tabby-single-contact'}))
+    contact = rdir / 'rec_contact.tsv'
+    contact.write_text('email\tinfo@example.com\n')
+    # imports in a column of a many-sheet
+    authors = rdir / 'rec_authors.tsv'
+    authors.write_text(
+        'name\taffiliation\n'
+        'a\t@tabby-single-affil\n'
+        'b\t\n'
+    )
+    affil = rdir / 'rec_affil.tsv'
+    affil.write_text('name\tuni\n')
+    files = rdir / 'rec_files@tby-ds1.tsv'
+    files.write_text(
+        'path[POSIX]\tsize[bytes]\tchecksum\tkeywords\n'
+        'a.txt\t1\tabc\tk1\tk2\n'
+        'b.txt\t2\tdef\n'
+    )
+    (rdir / 'rec_files@tby-ds1.json').write_text('{"kind": "file"}')
+    (rdir / 'rec_files@tby-ds1.override.json').write_text(
+        '{"@id": "file:{path_POSIX_[0]}"}')
+
+    org_t = {'name': 'uni', 'contact': {'email': 'info@example.com'}}
+    authors_t = [
+        {'name': 'a', 'affiliation': {'name': 'uni'}},
+        {'name': 'b'},
+    ]
+    files_t = [
+        {'kind': 'file', 'path[POSIX]': 'a.txt', 'size[bytes]': '1',
+         'checksum': 'abc', 'keywords': ['k1', 'k2'], '@id': 'file:a.txt'},
+        {'kind': 'file', 'path[POSIX]': 'b.txt', 'size[bytes]': '2',
+         'checksum': 'def', '@id': 'file:b.txt'},
+    ]
+    # as loaded with jsonld=False
+    root_t = {
+        'name': 'demo',
+        'title': 'A demo',
+        'org': org_t,
+        'author': authors_t,
+        'files': files_t,
+        '@id': 'ds-demo',
+    }
+    yield dict(
+        input=dict(
+            root=root, org=org, contact=contact, authors=authors,
+            affil=affil, files=files,
+            # optional import, the sheet is missing
+            extra=rdir / 'rec_extra.tsv',
+        ),
+        target=dict(
+            root=root_t, org=org_t, authors=authors_t, files=files_t),
+    )
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from .. import (
+    compile_tabby,
+    iter_tabby_many,
+    load_tabby,
+    materialize,
+)
+from ..bundle import _BundleLoader
+
+
+def test_compile_tabby(tabby_tsv_record, tmp_path):
+    root = tabby_tsv_record['root_sheet']
+    bundle = compile_tabby(root, tmp_path / 'demo.tabby')
+    assert bundle == tmp_path / 'demo.tabby'
+    # bundle and original record yield the same, in all modes
+    assert load_tabby(bundle) == load_tabby(root)
+    assert load_tabby(bundle, jsonld=False) == load_tabby(root, jsonld=False)
+    assert load_tabby(bundle, recursive=False, jsonld=False) \
+        == load_tabby(root, recursive=False, jsonld=False)
+    assert materialize(load_tabby(bundle, lazy=True)) == load_tabby(root)
+    # a bundle cannot provide what it was not compiled with
+    flat = compile_tabby(root, tmp_path / 'flat.tabby', jsonld=False)
+    with pytest.raises(ValueError):
+        load_tabby(flat)
+    assert load_tabby(flat, jsonld=False) == load_tabby(root, jsonld=False)
+
+
+def test_compile_tabby_many(tabby_tsv_record, tmp_path):
+    sheet = tabby_tsv_record['root_sheet'].parent / 'tabbydemo_authors.tsv'
+    bundle = compile_tabby(sheet, tmp_path / 'authors.tabby', single=False)
+    assert load_tabby(bundle, single=False) == load_tabby(sheet, single=False)
+    assert list(iter_tabby_many(bundle)) == load_tabby(sheet, single=False)
+    # a bundle is only loaded in the shape it was compiled with
+    with pytest.raises(ValueError):
+        load_tabby(bundle)
+    single = compile_tabby(sheet, tmp_path / 'author.tabby')
+    with pytest.raises(ValueError):
+        list(iter_tabby_many(single))
+    with pytest.raises(ValueError):
+        load_tabby(single, single=False)
+
+
+def test_bundle_loader_close(tabby_tsv_record, tmp_path, monkeypatch):
+    root = tabby_tsv_record['root_sheet']
+    bundle = compile_tabby(root, tmp_path / 'demo.tabby')
+    with _BundleLoader(bundle) as ldr:
+        assert ldr(ldr.root_sheet) == load_tabby(root)
+    assert ldr._map.closed
+    # loading from a bundle does not leave it mapped
+    closed = []
+    monkeypatch.setattr(
+        _BundleLoader, 'close', lambda self: closed.append(self._bundle))
+    load_tabby(bundle)
+    assert closed == [bundle]
+
+
+def test_compile_tabby_conventions(tmp_path):
+    rdir = tmp_path / 'rec'
+    rdir.mkdir()
+    ds = rdir / 'dataset@tby-sd1.tsv'
+    ds.write_text("name\tmyds\n")
+    (rdir / 'authors@tby-sd1.tsv').write_text('name\nJosiah Carberry\n')
+    # the convention declares an optional funding import, there is no
+    # such sheet
+    (rdir / 'dataset@tby-sd1.override.json').write_text(
+        '{"title": "{name[0]}"}')
+    bundle = compile_tabby(ds, tmp_path / 'ds.tabby')
+    loaded = load_tabby(ds)
+    # the bundle is self-contained
+    for f in rdir.iterdir():
+        f.unlink()
+    rdir.rmdir()
+    assert load_tabby(bundle) == loaded
+    assert loaded['title'] == 'myds'
+    assert '@context' in loaded['author'][0]
+
+
+def test_load_bundle_relpath(tabby_tsv_record, tmp_path, monkeypatch):
+    root = tabby_tsv_record['root_sheet']
+    compile_tabby(root, tmp_path / 'demo.tabby')
+    monkeypatch.chdir(tmp_path)
+    # no directory part
+    assert load_tabby(Path('demo.tabby')) == load_tabby(root)
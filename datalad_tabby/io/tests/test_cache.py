@@ -0,0 +1,70 @@
+import json
+import os
+
+from .. import (
+    SheetCache,
+    load_tabby,
+)
+
+
+def test_sheetcache_load(tabby_tsv_record):
+    cache = SheetCache()
+    rec = load_tabby(tabby_tsv_record['root_sheet'], cache=cache)
+    nmisses = cache.misses
+    assert nmisses
+    # one miss per file
+    assert cache.stats()['entries'] == nmisses
+    # same result as without a cache
+    assert rec == load_tabby(tabby_tsv_record['root_sheet'])
+    # second load is served from the cache entirely
+    nhits = cache.hits
+    assert load_tabby(tabby_tsv_record['root_sheet'], cache=cache) == rec
+    assert cache.misses == nmisses
+    assert cache.hits >= nhits + nmisses
+
+
+def test_sheetcache_invalidation(tmp_path):
+    cache = SheetCache()
+    src = tmp_path / 'rec_dataset.tsv'
+    src.write_text('name\tmine\n')
+    ovr = tmp_path / 'rec_dataset.override.json'
+    ovr.write_text(json.dumps({'@id': 'id-{name[0]}'}))
+    assert load_tabby(src, jsonld=False, cache=cache) == {
+        '@id': 'id-mine', 'name': 'mine'}
+    # modify both files, must be picked up
+    src.write_text('name\tyours\n')
+    ovr.write_text(json.dumps({'@id': 'ID-{name[0]}'}))
+    # make sure the mtime changes, even on coarse-grained filesystems
+    for f in (src, ovr):
+        st = os.stat(f)
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert load_tabby(src, jsonld=False, cache=cache) == {
+        '@id': 'ID-yours', 'name': 'yours'}
+    assert cache.hits == 0
+
+
+def test_sheetcache_eviction(tmp_path):
+    files = []
+    for i in range(3):
+        f = tmp_path / f'{i}.tsv'
+        f.write_text(f'key\t{i:09d}\n')
+        files.append(f)
+    fsize = files[0].stat().st_size
+    # room for two files
+    cache = SheetCache(max_bytes=2 * fsize)
+    for f in files:
+        cache.get_rows(f)
+    assert cache.evictions == 1
+    assert cache.stats()['entries'] == 2
+    assert cache.nbytes == 2 * fsize
+    # the least recently used file is gone
+    cache.get_rows(files[0])
+    assert (cache.hits, cache.misses) == (0, 4)
+    # but the most recent one is still around
+    assert cache.get_rows(files[2]) == [['key', '000000002']]
+    assert cache.hits == 1
+    # entries larger than the budget are not cached
+    cache = SheetCache(max_bytes=fsize - 1)
+    cache.get_rows(files[0])
+    assert cache.nbytes == 0
+    cache.clear()
@@ -26,3 +26,31 @@ def test_load_tabby_scids(tmp_path):
     # and @types
     assert all('@type' in a for a in loaded['author'])
     assert all('@type' in f for f in loaded['funding'])
+
+
+def test_load_tabby_custom_conventions(tmp_path):
+    # custom convention path, that overrides a bundled convention
+    cpath = tmp_path / 'cvn'
+    (cpath / 'tby-sd1').mkdir(parents=True)
+    (cpath / 'tby-sd1' / 'dataset.override.json').write_text(
+        '{"@id": "custom-{name[0]}"}')
+    # no imports, unlike the standard convention
+    (cpath / 'tby-sd1' / 'dataset.json').write_text('{"kind": "custom"}')
+    rdir = tmp_path / 'rec'
+    rdir.mkdir()
+    ds = rdir / 'dataset@tby-sd1.tsv'
+    ds.write_text("name\tmyds\n")
+    cpaths = [cpath]
+    loaded = load_tabby(ds, single=True, jsonld=True, cpaths=cpaths)
+    assert loaded['@id'] == 'custom-myds'
+    assert loaded['kind'] == 'custom'
+    # the standard convention is still used for anything not provided
+    # by the custom one
+    assert '@context' in loaded
+    # the given list of convention paths is not modified
+    assert cpaths == [cpath]
+    # a record-provided file takes precedence over any convention
+    (rdir / 'dataset@tby-sd1.override.json').write_text(
+        '{"@id": "local-{name[0]}"}')
+    loaded = load_tabby(ds, single=True, jsonld=True, cpaths=cpaths)
+    assert loaded['@id'] == 'local-myds'
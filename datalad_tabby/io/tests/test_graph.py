@@ -0,0 +1,89 @@
+import pytest
+
+from .. import (
+    build_import_graph,
+    load_tabby,
+)
+
+
+def test_build_import_graph(tabby_record_w_imports):
+    rin = tabby_record_w_imports['input']
+    root = rin['root']
+    rdir = root.parent
+
+    graph = build_import_graph(root)
+    assert graph.root == root
+    assert set(s.src.name for s in graph) == {
+        'rec_dataset.tsv', 'rec_org.tsv', 'rec_contact.tsv',
+        'rec_authors.tsv', 'rec_affil.tsv', 'rec_extra.tsv',
+        'rec_files@tby-ds1.tsv',
+    }
+    rsheet = graph[root]
+    assert [(i.key, i.src.name, i.single, i.optional)
+            for i in rsheet.imports] == [
+        ('org', 'rec_org.tsv', True, False),
+        ('author', 'rec_authors.tsv', False, False),
+        ('extra', 'rec_extra.tsv', True, True),
+        ('files', 'rec_files@tby-ds1.tsv', False, False),
+    ]
+    assert rsheet.files == {
+        'tsv': root,
+        'override': rdir / 'rec_dataset.override.json',
+        'record-context': rdir / 'rec.ctx.jsonld',
+    }
+    assert rdir / 'rec_dataset.json' in rsheet.missing
+    # JSON-only sheet
+    org = graph[rin['org']]
+    assert org.exists
+    assert 'tsv' not in org.files
+    assert [i.key for i in org.imports] == ['contact']
+    # imports in a many-sheet are reported for their column
+    authors = graph[rin['authors']]
+    assert [(i.key, i.src.name) for i in authors.imports] == [
+        ('affiliation', 'rec_affil.tsv')]
+    # missing optional sheet
+    assert not graph[rin['extra']].exists
+    # imports come before importers
+    order = graph.topological_order()
+    assert order[-1] == root
+    assert order.index(rin['affil']) < order.index(rin['authors'])
+    assert order.index(rin['contact']) < order.index(rin['org'])
+    assert graph.importers(rin['affil']) == {rin['authors'], root}
+    assert graph.find_cycle() is None
+    # all existing files are reported, and nothing else
+    assert graph.files == set(rdir.iterdir())
+    # the graph agrees with the loader
+    assert load_tabby(root, jsonld=False)['author'][0][
+        'affiliation'] == {'name': 'uni'}
+
+
+def test_build_import_graph_conventions(tmp_path):
+    ds = tmp_path / 'dataset@tby-sd1.tsv'
+    ds.write_text("name\tmyds\n")
+    (tmp_path / 'authors@tby-sd1.tsv').write_text('name\nJosiah Carberry\n')
+    graph = build_import_graph(ds)
+    sheet = graph[ds]
+    # data and context come from the convention
+    assert set(sheet.files) == {'tsv', 'json', 'context'}
+    assert sheet.files['json'].parent.name == 'tby-sd1'
+    # a record-local file would take precedence
+    assert tmp_path / 'dataset@tby-sd1.json' in sheet.missing
+    # the import is declared in the convention's JSON data
+    assert [i.key for i in sheet.imports] == ['author', 'funding']
+    authors = graph[tmp_path / 'authors@tby-sd1.tsv']
+    assert authors.exists
+    assert authors.files['override'].parent.name == 'tby-sd1'
+
+
+def test_build_import_graph_cycle(tmp_path):
+    (tmp_path / 'a.tsv').write_text('b\t@tabby-single-b\n')
+    (tmp_path / 'b.tsv').write_text('c\t@tabby-single-c\n')
+    (tmp_path / 'c.tsv').write_text('a\t@tabby-single-a\n')
+    graph = build_import_graph(tmp_path / 'a.tsv', jsonld=False)
+    assert graph.find_cycle() == [
+        tmp_path / f'{n}.tsv' for n in 'abca']
+    with pytest.raises(RecursionError):
+        graph.topological_order()
+    # same as the loader
+    with pytest.raises(RecursionError):
+        load_tabby(tmp_path / 'a.tsv', jsonld=False)
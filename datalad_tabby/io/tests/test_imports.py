@@ -56,3 +56,114 @@ def test_load_tabby_import_via_jsondata(tmp_path):
             jsonld=False,
         )
 
+
+def test_load_tabby_repeated_import(tmp_path, monkeypatch):
+    from ..load import _TabbyLoader
+
+    root = tmp_path / 'root.tsv'
+    root.write_text(
+        'ref\tauth\n'
+        'a\t@tabby-single-auth\n'
+        'b\t@tabby-single-auth\n'
+        'c\t@tabby-single-auth\n'
+    )
+    (tmp_path / 'auth.tsv').write_text('name\tme\n')
+
+    loaded_srcs = []
+    orig_load_single = _TabbyLoader._load_single
+
+    def _load_single(self, *, src, trace):
+        loaded_srcs.append(src)
+        return orig_load_single(self, src=src, trace=trace)
+
+    monkeypatch.setattr(_TabbyLoader, '_load_single', _load_single)
+
+    loaded = load_tabby(root, single=False, jsonld=False)
+    assert loaded == [
+        {'ref': r, 'auth': {'name': 'me'}} for r in 'abc'
+    ]
+    # the sheet was loaded only once, and all rows share the result
+    assert loaded_srcs == [tmp_path / 'auth.tsv']
+    assert loaded[0]['auth'] is loaded[2]['auth']
+
+
+def test_load_tabby_parallel(tabby_tsv_record, tmp_path, monkeypatch):
+    from ..load import _TabbyLoader
+
+    root = tabby_tsv_record['root_sheet']
+    serial = load_tabby(root)
+    parallel = load_tabby(root, jobs=4)
+    assert parallel == serial
+    # same order of keys too
+    assert list(parallel) == list(serial)
+    assert json.dumps(parallel) == json.dumps(serial)
+
+    # imports of an object are actually loaded by multiple threads
+    root = tmp_path / 'root.tsv'
+    root.write_text(''.join(
+        f'k{i}\t@tabby-single-s{i}\n' for i in range(8)))
+    for i in range(8):
+        (tmp_path / f's{i}.tsv').write_text(f'v\t{i}\n')
+    threads = set()
+    orig_load_single = _TabbyLoader._load_single
+
+    def _load_single(self, *, src, trace):
+        import threading
+        threads.add(threading.current_thread().name)
+        return orig_load_single(self, src=src, trace=trace)
+
+    monkeypatch.setattr(_TabbyLoader, '_load_single', _load_single)
+    loaded = load_tabby(root, jsonld=False, jobs=4)
+    assert loaded == {f'k{i}': {'v': str(i)} for i in range(8)}
+    assert any(t.startswith('tabby-load') for t in threads)
+
+    # errors are reported just the same
+    (tmp_path / 's3.tsv').unlink()
+    with pytest.raises(FileNotFoundError):
+        load_tabby(root, jsonld=False, jobs=4)
+    (tmp_path / 's3.tsv').write_text('v\t@tabby-single-root\n')
+    with pytest.raises(RecursionError):
+        load_tabby(root, jsonld=False, jobs=4)
+
+
+def test_load_tabby_parallel_shared(tmp_path, monkeypatch):
+    import threading
+    import time
+    from ..load import _TabbyLoader
+
+    # the same sheet is imported twice by the root object, and by two
+    # sheets that are loaded concurrently
+    root = tmp_path / 'root.tsv'
+    root.write_text(
+        'a\t@tabby-single-shared\n'
+        'b\t@tabby-single-shared\n'
+        'x\t@tabby-single-x\n'
+        'y\t@tabby-single-y\n'
+    )
+    (tmp_path / 'shared.tsv').write_text('v\tshared\n')
+    for name in ('x', 'y'):
+        (tmp_path / f'{name}.tsv').write_text(
+            f'name\t{name}\nshared\t@tabby-single-shared\n')
+    serial = load_tabby(root, jsonld=False)
+    loads = []
+    orig_load_single = _TabbyLoader._load_single
+
+    def _load_single(self, *, src, trace):
+        if src.name == 'shared.tsv':
+            loads.append(threading.current_thread().name)
+            # make concurrent loads of the same sheet likely
+            time.sleep(0.05)
+        return orig_load_single(self, src=src, trace=trace)
+
+    monkeypatch.setattr(_TabbyLoader, '_load_single', _load_single)
+    for _ in range(3):
+        loads.clear()
+        rec = load_tabby(root, jsonld=False, jobs=4)
+        assert rec == serial
+        # all locations reference the same data structure, as with a
+        # serial load
+        assert rec['a'] is rec['b'] is rec['x']['shared'] \
+            is rec['y']['shared']
+        # loaded once for the root object, and at most once more for
+        # each concurrently loaded sheet
+        assert 1 <= len(loads) <= 3
@@ -0,0 +1,118 @@
+import json
+import pytest
+
+from .. import (
+    JsonLdDocumentCache,
+    compact_record,
+    expand_record,
+    iter_tabby_many,
+    load_tabby,
+)
+from ..jsonld import (
+    _Unsupported,
+    _compact_doc,
+    _expand_doc,
+)
+
+ctx_url = 'https://example.org/tabby-test.jsonld'
+ctx_doc = {'@context': {'name': 'https://schema.org/name'}}
+
+
+def test_document_cache(tmp_path):
+    pyld = pytest.importorskip('pyld.jsonld')
+    fetched = []
+
+    def loader(url, options):
+        fetched.append(url)
+        return {'contextUrl': None, 'documentUrl': url, 'document': ctx_doc}
+
+    dc = JsonLdDocumentCache(tmp_path / 'docs', loader=loader)
+    doc = dc(ctx_url)
+    assert doc['document'] == ctx_doc
+    assert doc['tag'] == 'static'
+    # compaction of any number of records retrieves the context once
+    for i in range(3):
+        assert pyld.compact(
+            {'https://schema.org/name': 'x'}, ctx_url,
+            {'documentLoader': dc},
+        ) == {'@context': ctx_url, 'name': 'x'}
+    assert fetched == [ctx_url]
+
+    # documents persist across instances, and are available offline
+    dc = JsonLdDocumentCache(tmp_path / 'docs', offline=True)
+    assert dc(ctx_url)['document'] == ctx_doc
+    with pytest.raises(pyld.JsonLdError):
+        dc('https://example.org/other')
+    # unless a cache is seeded
+    dc.seed('https://example.org/other', {'@context': {}})
+    assert dc('https://example.org/other')['document'] == {'@context': {}}
+    assert fetched == [ctx_url]
+
+
+flat_ctx = {
+    'schema': 'https://schema.org/',
+    'xsd': 'http://www.w3.org/2001/XMLSchema#',
+    'name': 'schema:name',
+    'nm': 'https://schema.org/name',
+    'size': {'@id': 'schema:size', '@type': 'xsd:integer'},
+    'author': {'@id': 'schema:author', '@container': '@list'},
+    'type': '@type',
+}
+
+
+@pytest.mark.parametrize('doc,ctx', [
+    # typed and untyped terms for the same IRI, compact IRIs, unknown
+    # properties, relative identifiers
+    ({'@context': flat_ctx, '@id': 'rec/1', 'type': 'schema:Dataset',
+      'name': ['a', 'b'], 'size': [1, '2'], 'schema:size': 3,
+      'unknown': 'x', 'http://example.org/p': {'nm': 'n'}},
+     flat_ctx),
+    # ordered values, and nested contexts
+    ({'@context': flat_ctx, 'author': [
+        {'@context': {'email': 'schema:email'}, 'email': 'a@example.com'},
+        {'@id': '_:b0', 'name': 'B'}]},
+     {'schema': 'https://schema.org/'}),
+    # multiple nodes
+    ([{'@context': flat_ctx, 'name': 'a'}, {'@context': flat_ctx}],
+     {}),
+])
+def test_native_jsonld(doc, ctx):
+    pyld = pytest.importorskip('pyld.jsonld')
+    # output is identical to pyld's, including the order of properties
+    assert json.dumps(_expand_doc(doc)) == json.dumps(pyld.expand(doc))
+    assert json.dumps(_compact_doc(doc, ctx)) \
+        == json.dumps(pyld.compact(doc, ctx))
+
+
+def test_native_jsonld_demorecord(tabby_tsv_record):
+    pyld = pytest.importorskip('pyld.jsonld')
+    rec = load_tabby(tabby_tsv_record['root_sheet'])
+    assert _expand_doc(rec) == pyld.expand(rec)
+    for ctx in (rec['@context'], {'schema': 'https://schema.org/'}):
+        assert _compact_doc(rec, ctx) == pyld.compact(rec, ctx)
+
+
+def test_native_jsonld_fallback(tmp_path):
+    pyld = pytest.importorskip('pyld.jsonld')
+    # a scoped context is not supported natively
+    ds = tmp_path / 'dataset@tby-ds1.tsv'
+    ds.write_text('name\tdemo\nlicense\tCC0-1.0\n')
+    rec = load_tabby(ds)
+    with pytest.raises(_Unsupported):
+        _expand_doc(rec)
+    assert expand_record(rec) == pyld.expand(rec)
+    ctx = {'schema': 'https://schema.org/'}
+    assert compact_record(rec, ctx) == pyld.compact(rec, ctx)
+    # but the sheets of the same convention with flat contexts are
+    files = tmp_path / 'files@tby-ds1.tsv'
+    files.write_text('path[POSIX]\tsize[bytes]\na.txt\t5\n')
+    for obj in iter_tabby_many(files):
+        assert _expand_doc(obj) == pyld.expand(obj)
+        assert _compact_doc(obj, ctx) == pyld.compact(obj, ctx)
+    # an absolute IRI that looks like a compact IRI of a term
+    ctx = {'http': 'https://example.org/'}
+    rec = {'http://example.org/p': 'v'}
+    with pytest.raises(_Unsupported):
+        _compact_doc(rec, ctx)
+    with pytest.raises(pyld.JsonLdError):
+        compact_record(rec, ctx)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from .. import (
+    load_tabby,
+    materialize,
+)
+from ..lazy import (
+    LazyTabbyDict,
+    LazyTabbyList,
+)
+
+
+def test_load_tabby_lazy(tabby_tsv_record, monkeypatch):
+    from ..load import _TabbyLoader
+
+    root = tabby_tsv_record['root_sheet']
+    eager = load_tabby(root)
+
+    loaded_srcs = []
+    orig_load_import = _TabbyLoader._load_import
+
+    def _load_import(self, src, *args):
+        loaded_srcs.append(src.name)
+        return orig_load_import(self, src, *args)
+
+    monkeypatch.setattr(_TabbyLoader, '_load_import', _load_import)
+
+    rec = load_tabby(root, lazy=True)
+    # cheap reads do not load any imports
+    assert rec['title'] == eager['title']
+    assert isinstance(rec['author'], LazyTabbyList)
+    assert isinstance(rec['data-controller'], LazyTabbyList)
+    assert not rec['author'].loaded
+    assert loaded_srcs == []
+
+    # access loads a sheet, once
+    assert rec['author'][0] == eager['author'][0]
+    assert rec['author'].loaded
+    assert len(rec['author']) == len(eager['author'])
+    assert loaded_srcs == ['tabbydemo_authors.tsv']
+    assert rec['data-controller'][0] == eager['data-controller'][0]
+    assert loaded_srcs == ['tabbydemo_authors.tsv',
+                           'tabbydemo_data-controller.tsv']
+
+    # a proxy compares like the data it represents
+    assert rec == eager
+    # full materialization gives plain data, identical to an eager load
+    mat = materialize(rec)
+    assert type(mat['author']) is list
+    assert mat == eager
+    assert json.dumps(mat) == json.dumps(eager)
+
+    # proxies cannot be serialized directly
+    with pytest.raises(TypeError):
+        json.dumps(load_tabby(root, lazy=True))
+
+
+def test_load_tabby_lazy_optional(tmp_path):
+    root = tmp_path / 'root.tsv'
+    root.write_text(
+        'sopt\t@tabby-optional-single-sopt\n'
+        'mopt\t@tabby-optional-many-mopt\n'
+        'mreq\t@tabby-many-mreq\n'
+        'sreq\t@tabby-single-sreq\n'
+    )
+    (tmp_path / 'mopt.tsv').write_text('k\nv\n')
+    (tmp_path / 'sreq.tsv').write_text('k\tv\n')
+    rec = load_tabby(root, jsonld=False, lazy=True)
+    # missing optional imports are not even represented
+    assert 'sopt' not in rec
+    assert list(rec['mopt']) == [{'k': 'v'}]
+    assert isinstance(rec['sreq'], LazyTabbyDict)
+    assert dict(rec['sreq']) == {'k': 'v'}
+    # a missing required import is only detected on access
+    with pytest.raises(FileNotFoundError):
+        rec['mreq'][0]
+
+
+def test_materialize_empty_imports(tmp_path):
+    root = tmp_path / 'root.tsv'
+    root.write_text(
+        'name\tx\n'
+        'author\t@tabby-many-authors\n'
+        'fund\t@tabby-single-fund\n'
+        'opt\t@tabby-optional-single-opt\n'
+    )
+    # header-only, and comment-only sheets
+    (tmp_path / 'authors.tsv').write_text('name\temail\n')
+    (tmp_path / 'fund.tsv').write_text('# nothing here\n')
+    (tmp_path / 'opt.tsv').write_text('# nothing here\n')
+    eager = load_tabby(root, jsonld=False)
+    assert eager == {'name': 'x'}
+    # imports of empty sheets are removed, as with an eager load,
+    # whether optional or not
+    assert materialize(load_tabby(root, jsonld=False, lazy=True)) == eager
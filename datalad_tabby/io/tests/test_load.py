@@ -1,6 +1,11 @@
+import json
 import pytest
 
-from .. import load_tabby
+from .. import (
+    iter_tabby_many,
+    load_tabby,
+    load_tabby_many,
+)
 
 
 def test_load_tabby(tabby_record_basic_components):
@@ -14,6 +19,34 @@ def test_load_tabby(tabby_record_basic_components):
         assert loaded == trbc['target'][t]
 
 
+def test_iter_tabby_many(tabby_record_basic_components, tmp_path):
+    trbc = tabby_record_basic_components
+    it = iter_tabby_many(trbc['input']['many'], jsonld=False)
+    # we get a generator, not a list
+    assert not isinstance(it, list)
+    assert list(it) == trbc['target']['many']
+
+    # list-type JSON data are reported first, tabular data after it
+    src = tmp_path / 'many.tsv'
+    src.write_text('k1\nv1\n')
+    (tmp_path / 'many.json').write_text(json.dumps([{'k1': 'v0'}]))
+    assert list(iter_tabby_many(src, jsonld=False)) == [
+        {'k1': 'v0'}, {'k1': 'v1'},
+    ]
+    # same as a full load
+    assert list(iter_tabby_many(src, jsonld=False)) == load_tabby(
+        src, single=False, jsonld=False)
+
+
+def test_load_tabby_mmap(tabby_tsv_record, tabby_record_basic_components):
+    trbc = tabby_record_basic_components
+    assert list(iter_tabby_many(
+        trbc['input']['many'], jsonld=False, use_mmap=True,
+    )) == trbc['target']['many']
+    root = tabby_tsv_record['root_sheet']
+    assert load_tabby(root, use_mmap=True) == load_tabby(root)
+
+
 def test_load_tabby_nonrecursive(tabby_record_basic_components):
     trbc = tabby_record_basic_components
     loaded_no_r = load_tabby(
@@ -63,3 +96,37 @@ def test_load_singldir_format(tabby_tsv_record, tabby_tsv_singledir_record):
     rec = load_tabby(tabby_tsv_record['root_sheet'])
     srec = load_tabby(tabby_tsv_singledir_record['root_sheet'])
     assert rec == srec
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_load_tabby_many(tabby_tsv_record, tmp_path, jobs):
+    good = tabby_tsv_record['root_sheet']
+    broken = tmp_path / 'broken_dataset.tsv'
+    broken.write_text('title\t@tabby-single-missing\n')
+    other = tmp_path / 'other_dataset.tsv'
+    other.write_text('title\tother\n')
+    srcs = [good, broken, other, good]
+
+    res = list(load_tabby_many(srcs, jobs=jobs))
+    assert [r.src for r in res] == srcs
+    assert res[0].record == res[3].record == load_tabby(good)
+    assert res[0].error is None
+    # errors are captured, and do not stop the batch
+    assert res[1].record is None
+    assert isinstance(res[1].error, FileNotFoundError)
+    assert res[2].record == {'title': 'other'}
+
+    # with no order, we still get all results
+    res = list(load_tabby_many(srcs, jobs=jobs, ordered=False, jsonld=False))
+    assert sorted(str(r.src) for r in res) == sorted(str(s) for s in srcs)
+    assert sum(r.error is not None for r in res) == 1
+
+
+def test_load_dangling_symlinks(tmp_path):
+    # annexed files without content are symlinks without a target
+    root = tmp_path / 'root.tsv'
+    root.write_text('name\tx\nopt\t@tabby-optional-single-opt\n')
+    (tmp_path / 'root.override.json').symlink_to(tmp_path / 'missing1')
+    (tmp_path / 'opt.tsv').symlink_to(tmp_path / 'missing2')
+    # treated like missing files, as they cannot be read
+    assert load_tabby(root, jsonld=False) == {'name': 'x'}
@@ -1,4 +1,7 @@
+import pytest
+
 from .. import load_tabby
+from ..load_utils import _OverrideSpec
 
 
 def test_load_tabby(tabby_record_w_overrides):
@@ -10,3 +13,33 @@ def test_load_tabby(tabby_record_w_overrides):
     )
     assert loaded['single'] == trwo['target']['single']
     assert loaded['many'] == trwo['target']['many']
+
+
+def test_override_spec():
+    spec = _OverrideSpec({
+        'id': 'id-{path_POSIX_[0]}',
+        'both': ['{a[0]}', '{b[0]}', 'const', 3],
+        'nested': '{a[0]:>{width[0]}}',
+    })
+    assert spec.spec[0][1][0].fields == {'path_POSIX_'}
+    assert spec.spec[2][1][0].fields == {'a', 'width'}
+    # fields are mapped to their sanitized names, missing fields lead
+    # to skipped values
+    assert spec.build({'path[POSIX]': ['p'], 'a': ['x']}) == {
+        'id': ['id-p'],
+        'both': ['x', 'const', 3],
+        'nested': [],
+    }
+    assert spec.build({'a': ['x'], 'b': ['y'], 'width': ['3']}) == {
+        'id': [],
+        'both': ['x', 'y', 'const', 3],
+        'nested': ['  x'],
+    }
+    # key mappings are built once per set of keys
+    assert len(spec._keymaps) == 2
+    spec.build({'a': ['z'], 'b': ['y'], 'width': ['3']})
+    assert len(spec._keymaps) == 2
+
+    # positional fields are not supported
+    with pytest.raises(IndexError):
+        _OverrideSpec({'pos': '{0}'}).build({'a': ['x']})
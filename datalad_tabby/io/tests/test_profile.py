@@ -0,0 +1,93 @@
+import pickle
+import pytest
+
+from .. import (
+    RecordCache,
+    TabbyLoadProfile,
+    compile_tabby,
+    iter_tabby_many,
+    load_tabby,
+    load_tabby_many,
+)
+from .. import profile as mod
+
+
+def test_profile_timed(monkeypatch):
+    clock = iter(range(0, 100, 10))
+    monkeypatch.setattr(mod, 'perf_counter', lambda: next(clock))
+    p = TabbyLoadProfile()
+    with p.timed('a', 'parse'):
+        assert p.current_sheet == 'a'
+        with p.timed('b', 'postproc'):
+            assert p.current_sheet == 'b'
+            p.add('b', 'rows', 3)
+    assert p.current_sheet is None
+    # times are exclusive, the nested context is not charged to 'a'
+    assert p.sheets['a']['parse'] == 20
+    assert p.sheets['b']['postproc'] == 10
+    assert p.sheets['b']['rows'] == 3
+    assert p.sheets['a']['rows'] == 0
+
+
+@pytest.mark.parametrize('jobs', [None, 3])
+def test_load_profile(tabby_tsv_record, jobs):
+    root = tabby_tsv_record['root_sheet']
+    p = TabbyLoadProfile()
+    # profiling does not change the record
+    assert load_tabby(root, jobs=jobs, profile=p) == load_tabby(root)
+    assert set(p.sheets) == set(tabby_tsv_record['sheets'])
+    for sheet, c in p.sheets.items():
+        assert c['rows'] == len(sheet.read_text().splitlines())
+        # the sheet and its sidecar files
+        assert c['open'] >= 1
+        assert c['bytes'] >= sheet.stat().st_size
+        assert c['stat'] > 0
+        assert all(c[f] >= 0 for f in mod._time_fields)
+        assert (c['override'] > 0) == sheet.with_suffix(
+            '.override.json').exists()
+    # the directory of the record is only listed once
+    assert sum(c['listdir'] for c in p.sheets.values()) == 1
+
+    # transferable, and reported as plain data
+    p2 = pickle.loads(pickle.dumps(p))
+    assert p2.sheets == p.sheets
+    d = p.as_dict()
+    assert d['sheets'][str(root)] == p.sheets[root]
+    assert TabbyLoadProfile.from_dict(d).sheets == p.sheets
+    table = p.format_table().splitlines()
+    # header, one line per sheet, total, and JSON-LD processing time
+    assert len(table) == len(p.sheets) + 3
+    assert table[-2].split()[:2] == [
+        'total', str(sum(c['rows'] for c in p.sheets.values()))]
+
+
+def test_iter_many_profile(tabby_tsv_record):
+    sheet = tabby_tsv_record['root_sheet'].parent / 'tabbydemo_authors.tsv'
+    p = TabbyLoadProfile()
+    objs = iter_tabby_many(sheet, profile=p)
+    assert list(objs) == load_tabby(sheet, single=False)
+    assert list(p.sheets) == [sheet]
+    assert p.sheets[sheet]['rows'] == len(sheet.read_text().splitlines())
+    assert p.sheets[sheet]['parse'] > 0
+
+
+def test_profile_unsupported(tabby_tsv_record, tmp_path):
+    root = tabby_tsv_record['root_sheet']
+    with pytest.raises(ValueError):
+        load_tabby(root, profile=TabbyLoadProfile(),
+                   record_cache=RecordCache(tmp_path / 'cache'))
+    bundle = compile_tabby(root, tmp_path / 'demo.tabby')
+    with pytest.raises(ValueError):
+        load_tabby(bundle, profile=TabbyLoadProfile())
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_load_many_profile(tabby_tsv_record, jobs):
+    root = tabby_tsv_record['root_sheet']
+    res = list(load_tabby_many([root, root], jobs=jobs, profile=True))
+    assert all(r.record == load_tabby(root) for r in res)
+    # each record has its own profile
+    assert res[0].profile is not res[1].profile
+    assert all(set(r.profile.sheets) == set(tabby_tsv_record['sheets'])
+               for r in res)
+    assert all(r.profile is None for r in load_tabby_many([root]))
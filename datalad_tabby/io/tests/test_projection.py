@@ -0,0 +1,86 @@
+from .. import (
+    iter_tabby_many,
+    load_tabby,
+)
+from ..load_utils import (
+    _get_sheet_name,
+    _OverrideSpec,
+    _Projection,
+)
+
+
+def test_sheet_name(tmp_path):
+    assert _get_sheet_name(tmp_path / 'rec_files@tby-ds1.tsv') == 'files'
+    assert _get_sheet_name(tmp_path / 'a_b_files.override.json') == 'files'
+    assert _get_sheet_name(tmp_path / 'dataset.tsv') == 'dataset'
+
+
+def test_projection_needs():
+    proj = _Projection(
+        ['@id', 'size'],
+        _OverrideSpec({'@id': 'id-{path_POSIX_[0]}', 'other': '{a[0]}'}),
+    )
+    assert proj.needs('@id')
+    assert proj.needs('size')
+    # referenced by the override of a selected key
+    assert proj.needs('path[POSIX]')
+    # referenced by the override of an unselected key only
+    assert not proj.needs('a')
+    assert not proj.needs('checksum')
+    assert proj.select({'size': 1, 'a': 2, 'path[POSIX]': 3}) == {
+        'size': 1, 'path[POSIX]': 3}
+    # with a malformed spec, anything could be referenced
+    proj = _Projection(['@id'], _OverrideSpec({'@id': '{a'}))
+    assert proj.needs('anything')
+
+
+def test_load_columns(tabby_record_w_imports):
+    files = tabby_record_w_imports['input']['files']
+    full = load_tabby(files, single=False, jsonld=False)
+
+    # override built from a column that is not selected
+    loaded = load_tabby(
+        files, single=False, jsonld=False, columns=['@id', 'size[bytes]'])
+    assert loaded == [
+        {k: o[k] for k in ('@id', 'size[bytes]')} for o in full
+    ]
+    # trailing values of the last column are kept
+    assert load_tabby(
+        files, single=False, jsonld=False, columns=['keywords'],
+    ) == [{'keywords': ['k1', 'k2']}, {}]
+    # properties from a JSON sidecar are subject to selection too
+    assert load_tabby(
+        files, single=False, jsonld=False, columns=['kind', 'checksum'],
+    ) == [{k: o[k] for k in ('kind', 'checksum')} for o in full]
+    assert list(iter_tabby_many(
+        files, jsonld=False, columns=['@id', 'size[bytes]'])) == loaded
+    # a context is still assigned
+    (files.parent / 'rec_files@tby-ds1.ctx.jsonld').write_text(
+        '{"a": "b:"}')
+    assert load_tabby(files, single=False, columns=['checksum']) == [
+        {'checksum': c, '@context': {'a': 'b:'}} for c in ('abc', 'def')
+    ]
+
+
+def test_load_columns_imports(tabby_record_w_imports):
+    rin = tabby_record_w_imports['input']
+    root = rin['root']
+    # imports in unselected properties are never attempted, not even
+    # of a sheet that is missing
+    rin['authors'].unlink()
+    loaded = load_tabby(root, jsonld=False, columns={
+        'dataset': ['@id', 'title', 'files'],
+        'files': ['path[POSIX]'],
+    })
+    assert loaded == {
+        '@id': 'ds-demo',
+        'title': 'A demo',
+        'files': [
+            {'path[POSIX]': 'a.txt'},
+            {'path[POSIX]': 'b.txt'},
+        ],
+    }
+    # a list of keys only applies to the root sheet
+    loaded = load_tabby(root, jsonld=False, columns=['name', 'files'])
+    assert loaded['name'] == 'demo'
+    assert loaded['files'][0]['checksum'] == 'abc'
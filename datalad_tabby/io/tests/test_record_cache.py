@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from .. import (
+    RecordCache,
+    load_tabby,
+)
+
+
+def test_record_cache(tabby_record_w_imports, tmp_path):
+    rin = tabby_record_w_imports['input']
+    root = rin['root']
+    rc = RecordCache(tmp_path / 'cache')
+    rec = load_tabby(root, jsonld=False, record_cache=rc)
+    assert rc.misses == 1
+    assert rc.info()['entries'] == 1
+    assert load_tabby(root, jsonld=False, record_cache=rc) == rec
+    assert rc.hits == 1
+    # other load parameters have their own entry
+    load_tabby(root, jsonld=True, record_cache=rc)
+    assert rc.info()['entries'] == 2
+    assert rc.misses == 2
+
+    # modification of an imported sheet is detected, regardless of
+    # modification time
+    rin['authors'].write_text('name\nc\n')
+    rec = load_tabby(root, jsonld=False, record_cache=rc)
+    assert rec['author'] == [{'name': 'c'}]
+    assert rc.misses == 3
+    assert load_tabby(root, jsonld=False, record_cache=rc) == rec
+    assert rc.hits == 2
+
+    # so is the appearance of a file that was missing
+    rin['extra'].write_text('note\tsome\n')
+    rec = load_tabby(root, jsonld=False, record_cache=rc)
+    assert rec['extra'] == {'note': 'some'}
+    assert rc.misses == 4
+    (root.parent / 'rec_authors.override.json').write_text(
+        '{"id": "{name[0]}"}')
+    assert load_tabby(
+        root, jsonld=False, record_cache=rc)['author'][0]['id'] == 'c'
+
+    assert rc.clear() == 2
+    assert rc.info()['entries'] == 0
+
+    with pytest.raises(ValueError):
+        load_tabby(root, record_cache=rc, lazy=True)
+
+
+def test_record_cache_conventions(tmp_path):
+    ds = tmp_path / 'dataset@tby-sd1.tsv'
+    ds.write_text("name\tmyds\n")
+    (tmp_path / 'authors@tby-sd1.tsv').write_text('name\nJosiah Carberry\n')
+    rc = RecordCache(tmp_path / 'cache')
+    rec = load_tabby(ds, record_cache=rc)
+    entry = next((tmp_path / 'cache').glob('*.json'))
+    manifest = json.loads(entry.read_text().split('\n', 1)[0])
+    # files from the convention path are part of the manifest
+    assert any('tby-sd1' in Path(p).parent.name
+               for p in manifest['files'])
+    assert load_tabby(ds, record_cache=rc) == rec
+    assert rc.hits == 1
+
+
+def test_record_cache_eviction(tabby_record_w_imports, tmp_path):
+    rc = RecordCache(tmp_path / 'cache', max_bytes=0)
+    root = tabby_record_w_imports['input']['root']
+    load_tabby(root, jsonld=False, record_cache=rc)
+    # nothing is kept with no budget
+    assert rc.info()['entries'] == 0
+
+    rc.max_bytes = 10 * 1024
+    for i in range(3):
+        load_tabby(root, jsonld=False, cpaths=[str(i)], record_cache=rc)
+    one = rc.info()['nbytes'] // 3
+    rc.max_bytes = 2 * one
+    load_tabby(root, jsonld=False, record_cache=rc)
+    assert rc.info()['entries'] == 2
+    # the latest entry was kept
+    assert load_tabby(root, jsonld=False, record_cache=rc)
+    assert rc.hits == 1
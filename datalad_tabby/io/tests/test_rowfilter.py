@@ -0,0 +1,121 @@
+import pytest
+
+from .. import (
+    RowFilter,
+    iter_tabby_many,
+    load_tabby,
+)
+from ..record_cache import RecordCache
+
+
+def _make_sheet(tmp_path):
+    sheet = tmp_path / 'files.tsv'
+    sheet.write_text(
+        'path[POSIX]\tsize\ttag\n'
+        'sub-01/a.nii.gz\t1\tx\n'
+        'sub-01/b.tsv\t2\ty\tz\n'
+        'sub-02/a.nii.gz\t3\tz\n'
+        # an import that must only be loaded, when this row is selected
+        'sub-03/c.tsv\t4\t@tabby-single-missing\n'
+    )
+    (tmp_path / 'files.json').write_text('{"kind": "file"}')
+    (tmp_path / 'files.override.json').write_text(
+        '{"name": "file-{size[0]}"}')
+    return sheet
+
+
+def test_rowfilter_parse():
+    f = RowFilter.parse('path[POSIX]^=sub-01/')
+    assert (f.column, f.op, f.value) == ('path[POSIX]', '^=', 'sub-01/')
+    assert str(f) == 'path[POSIX]^=sub-01/'
+    assert repr(f) == "RowFilter('path[POSIX]', 'sub-01/', op='^=')"
+    # the first operator separates column and value
+    f = RowFilter.parse('a=b=c')
+    assert (f.column, f.op, f.value) == ('a', '=', 'b=c')
+    f = RowFilter.parse('a~=^x=')
+    assert (f.column, f.op, f.value) == ('a', '~=', '^x=')
+    assert RowFilter.parse('a=').test('')
+    for expr in ('nop', '=value'):
+        with pytest.raises(ValueError):
+            RowFilter.parse(expr)
+    with pytest.raises(ValueError):
+        RowFilter('a', 'b', op='!=')
+
+
+def test_rowfilter_compile():
+    fieldnames = ['a', 'b', 'a', 'c']
+    assert RowFilter('b', 'x').compile(fieldnames, {})(['', 'x'])
+    assert not RowFilter('b', 'x').compile(fieldnames, {})([''])
+    # identically named columns
+    match = RowFilter('a', 'x').compile(fieldnames, {})
+    assert match(['', '', 'x'])
+    assert not match(['', 'x'])
+    # trailing values of the last column
+    match = RowFilter('c', 'x').compile(fieldnames, {})
+    assert match(['', '', '', 'y', 'x'])
+    assert not match(['x', 'x', 'x'])
+    # columns that are not in the table are looked up in the defaults
+    assert RowFilter('d', 'x').compile(fieldnames, {'d': 'x'})([])
+    assert not RowFilter('d', 'x').compile(fieldnames, {})([])
+
+
+def test_load_where(tmp_path):
+    sheet = _make_sheet(tmp_path)
+    full = load_tabby(sheet, single=False, jsonld=False, recursive=False)
+
+    for where, target in (
+            ('path[POSIX]^=sub-01/', full[:2]),
+            (RowFilter('size', '3'), full[2:3]),
+            ('path[POSIX]~=\\.nii\\.gz$', [full[0], full[2]]),
+            # trailing values
+            ('tag=z', full[1:3]),
+            # all conditions must hold
+            (['tag=z', 'path[POSIX]^=sub-01/'], full[1:2]),
+            (lambda row: int(row['size']) % 2, [full[0], full[2]]),
+            # defaults from the JSON sidecar
+            ('kind=file', full),
+            ('kind=dir', []),
+    ):
+        assert load_tabby(sheet, single=False, jsonld=False,
+                          recursive=False, where=where) == target
+        assert list(iter_tabby_many(sheet, jsonld=False, recursive=False,
+                                    where=where)) == target
+
+    # selection is independent of the projection
+    assert load_tabby(
+        sheet, single=False, jsonld=False, where='tag=x', columns=['name'],
+    ) == [{'name': 'file-1'}]
+    # a record cache keeps records loaded with different filters apart
+    rc = RecordCache(tmp_path / 'cache')
+    for where in ('tag=x', 'tag=y', 'tag=x'):
+        assert load_tabby(
+            sheet, single=False, jsonld=False, where=where, record_cache=rc,
+        ) == load_tabby(sheet, single=False, jsonld=False, where=where)
+    assert rc.hits == 1
+    with pytest.raises(ValueError):
+        load_tabby(sheet, single=False, where=lambda r: True,
+                   record_cache=rc)
+
+
+def test_load_where_import(tmp_path):
+    _make_sheet(tmp_path)
+    root = tmp_path / 'dataset.tsv'
+    root.write_text('name\tdemo\nfiles\t@tabby-many-files\n')
+    loaded = load_tabby(
+        root, jsonld=False, where={'files': 'path[POSIX]^=sub-01/'})
+    assert [f['path[POSIX]'] for f in loaded['files']] == [
+        'sub-01/a.nii.gz', 'sub-01/b.tsv']
+    # the sheet with the import is only selected here
+    with pytest.raises(FileNotFoundError):
+        load_tabby(root, jsonld=False, where={'files': 'size=4'})
+    # rows of a sheet with a single object cannot be selected
+    with pytest.raises(ValueError):
+        load_tabby(root, jsonld=False, where='name=demo')
+
+
+def test_load_where_jsonlist(tmp_path):
+    sheet = tmp_path / 'items.tsv'
+    (tmp_path / 'items.json').write_text(
+        '[{"id": "a", "tag": ["x", "y"]}, {"id": "b", "tag": "z"}]')
+    assert load_tabby(sheet, single=False, jsonld=False, where='tag=y') \
+        == [{'id': 'a', 'tag': ['x', 'y']}]
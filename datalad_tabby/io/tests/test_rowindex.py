@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from .. import (
+    TabbyRowIndex,
+    load_tabby,
+)
+
+
+def _make_sheet(tmp_path):
+    sheet = tmp_path / 'files.tsv'
+    sheet.write_text(
+        '# some comment\n'
+        'path[POSIX]\tsize\ttag\n'
+        '\n'
+        'a.txt\t1\tx\n'
+        '# another comment\n'
+        '"multi\nline.txt"\t2\ty\n'
+        'b.txt\t3\tx\tz\n'
+        'c.txt\t\r\n'
+    )
+    (tmp_path / 'files.json').write_text('{"kind": "file"}')
+    (tmp_path / 'files.override.json').write_text(
+        '{"name": "file-{size[0]}"}')
+    return sheet
+
+
+def test_rowindex(tmp_path):
+    sheet = _make_sheet(tmp_path)
+    target = load_tabby(sheet, single=False, jsonld=False)
+    idx = TabbyRowIndex(sheet, jsonld=False)
+    assert len(idx) == len(target) == 4
+    assert idx.index_path.exists()
+    for i, obj in enumerate(target):
+        assert idx.get_row(i) == obj
+    assert idx.get_row(-1) == target[-1]
+    with pytest.raises(IndexError):
+        idx.get_row(4)
+    assert idx.get_rows(slice(1, None, 2)) == target[1::2]
+    assert idx.get_rows(slice(None)) == target
+
+    assert idx.lookup('path[POSIX]', 'b.txt') == [target[2]]
+    assert idx.lookup('path[POSIX]', 'multi\nline.txt') == [target[1]]
+    assert idx.lookup('path[POSIX]', 'nothere') == []
+    # trailing values belong to the last column
+    assert idx.lookup('tag', 'x') == [target[0], target[2]]
+    assert idx.lookup('tag', 'z') == [target[2]]
+
+    # a fresh instance uses the existing index, including the key columns
+    idx = TabbyRowIndex(sheet, jsonld=False)
+    assert set(idx._get_index().columns) == {'path[POSIX]', 'tag'}
+    assert idx.lookup('tag', 'y') == [target[1]]
+
+    # the index is rebuilt, when the sheet changes
+    with sheet.open('a') as f:
+        f.write('d.txt\t4\ty\n')
+    st = sheet.stat()
+    os.utime(sheet, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    target = load_tabby(sheet, single=False, jsonld=False)
+    assert len(idx) == 5
+    assert idx.lookup('tag', 'y') == [target[1], target[4]]
+
+
+def test_rowindex_close(tmp_path):
+    sheet = _make_sheet(tmp_path)
+    target = load_tabby(sheet, single=False, jsonld=False)
+    TabbyRowIndex(sheet, jsonld=False).lookup('tag', 'x')
+    with TabbyRowIndex(sheet, jsonld=False) as idx:
+        assert idx.lookup('tag', 'y') == [target[1]]
+        index = idx._index
+        assert index._mapped is not None
+        # a new key column supersedes the mapped index
+        assert idx.lookup('size', '3') == [target[2]]
+        assert index._mapped is None
+    assert idx._index is None
+    # usable again after closing
+    assert idx.get_row(0) == target[0]
+    idx.close()
+
+
+def test_rowindex_readonly(tmp_path):
+    sheet = _make_sheet(tmp_path)
+    idx = TabbyRowIndex(
+        sheet, jsonld=False, index_path=tmp_path / 'nodir' / 'idx')
+    # works without a sidecar
+    assert idx.get_row(0)['name'] == 'file-1'
+    assert not (tmp_path / 'nodir').exists()
+
+
+def test_rowindex_jsonld(tabby_tsv_record, tmp_path):
+    sheet = tabby_tsv_record['root_sheet'].parent / 'tabbydemo_authors.tsv'
+    target = load_tabby(sheet, single=False)
+    idx = TabbyRowIndex(sheet, index_path=tmp_path / 'authors.rowidx')
+    assert idx.get_rows(slice(None)) == target
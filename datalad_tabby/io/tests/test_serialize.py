@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from .. import (
+    encode_json,
+    iterencode_json,
+)
+from .. import serialize
+
+
+def _make_record():
+    return {
+        'name': 'dsü',
+        'files': [
+            {'path': f'sub-{i:04d}/a.nii.gz', 'size': i, 'tags': ['x', 'y']}
+            for i in range(3000)
+        ],
+        'meta': {str(i): [i] * 3 for i in range(500)},
+        'big': 2 ** 70,
+        1: None,
+    }
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def test_iterencode_json(monkeypatch):
+    rec = _make_record()
+    # the size of the pieces that are encoded at once
+    monkeypatch.setattr(serialize, '_max_piece_items', 16)
+    for fast, encoder in ((False, None), (True, None),
+                          (True, serialize._encode_stdlib)):
+        # with the optional backend (if installed), and without
+        monkeypatch.setattr(serialize, '_fast_encoder', encoder)
+        enc = encode_json(rec, fast=fast)
+        assert enc == _dumps(rec)
+        chunks = list(iterencode_json(rec, chunk_size=1000, fast=fast))
+        assert len(chunks) > 1
+        assert ''.join(chunks) == enc
+        # no chunk is much larger than requested
+        assert max(len(c) for c in chunks) < 2000
+        # small records come in one chunk, empty ones too
+        assert list(iterencode_json({'a': [1]}, fast=fast)) \
+            == [encode_json({'a': [1]}, fast=fast)]
+        assert list(iterencode_json([], chunk_size=1, fast=fast)) == ['[]']
+
+
+def test_encode_json_output(monkeypatch):
+    rec = {'näme': ['dsü', 'tab\tdel\x7f', '\U0001f427', 0.5, 2 ** 70]}
+    # pinned, ASCII-only output, identical to the standard library
+    target = '{"n\\u00e4me":["ds\\u00fc","tab\\tdel\\u007f",' \
+        '"\\ud83d\\udc27",0.5,1180591620717411303424]}'
+    assert _dumps(rec) == target
+    assert encode_json(rec) == target
+    assert ''.join(iterencode_json(rec)) == target
+    pytest.importorskip('orjson')
+    monkeypatch.setattr(serialize, '_fast_encoder', None)
+    assert encode_json(rec, fast=True) == target
+    # orjson has its own float format, but is only used on request
+    assert encode_json([1e16]) == '[1e+16]'
+    assert encode_json([1e16], fast=True) == '[1e16]'
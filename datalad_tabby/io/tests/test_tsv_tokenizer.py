@@ -0,0 +1,55 @@
+import csv
+import random
+
+import pytest
+
+from .. import load_utils
+from ..load_utils import _iter_tsv_rows
+
+
+def _csv_rows(fpath):
+    with fpath.open(newline='') as f:
+        return list(csv.reader(f, delimiter='\t'))
+
+
+@pytest.mark.parametrize('content', [
+    '',
+    '\n',
+    'a\tb\n',
+    'a\tb',
+    '\t\t\n\n\t\n',
+    'a\tb\r\nc\td\r\n',
+    'a\rb\rc\n',
+    'a\r\n\r\n\rb',
+    # characters that str.splitlines() would split on
+    'a\x0bb\tc\x0c\x1c\x1d\x1e\x85  d\n',
+    # quoting
+    '"a\tb"\tc\n',
+    'a"b\t"c""d"\n',
+    # multi-line fields
+    'x\t"multi\nline\r\nfield"\ty\nnext\trow\n',
+    '"unterminated\nquote\n',
+    'last\t"\n',
+])
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_tsv_tokenizer_cases(tmp_path, content, use_mmap):
+    fpath = tmp_path / 'some.tsv'
+    fpath.write_bytes(content.encode('utf-8'))
+    assert list(_iter_tsv_rows(fpath, use_mmap=use_mmap)) \
+        == _csv_rows(fpath)
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_tsv_tokenizer_random(tmp_path, monkeypatch, use_mmap):
+    # tiny read size to exercise lines that span multiple blocks
+    monkeypatch.setattr(load_utils, '_tsv_read_size', 7)
+    rng = random.Random(42)
+    alphabet = ['a', 'b', ' ', '\t', '\t', '\n', '\n', '\r', '"', '#',
+                '\x0c', 'ü']
+    fpath = tmp_path / 'random.tsv'
+    for i in range(300):
+        content = ''.join(
+            rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        fpath.write_bytes(content.encode('utf-8'))
+        assert list(_iter_tsv_rows(fpath, use_mmap=use_mmap)) \
+            == _csv_rows(fpath), repr(content)
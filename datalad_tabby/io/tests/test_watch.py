@@ -0,0 +1,81 @@
+import os
+
+from .. import TabbyRecordWatcher
+
+
+def _write(fpath, content):
+    # make sure a modification is detectable, even with a coarse
+    # mtime resolution
+    fpath.write_text(content)
+    st = fpath.stat()
+    os.utime(fpath, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_refresh(tabby_record_w_imports, monkeypatch):
+    rin = tabby_record_w_imports['input']
+    root = rin['root']
+    rdir = root.parent
+    w = TabbyRecordWatcher(root, jsonld=False)
+    rec = w.record
+    assert rec == tabby_record_w_imports['target']['root']
+    assert not w.refresh()
+    assert w.record is rec
+
+    loaded = []
+    load_many = w._ldr._load_many
+    load_single = w._ldr._load_single
+
+    def _many(src, **kwargs):
+        loaded.append(src.name)
+        return load_many(src=src, **kwargs)
+
+    def _single(src, **kwargs):
+        loaded.append(src.name)
+        return load_single(src=src, **kwargs)
+
+    monkeypatch.setattr(w._ldr, '_load_many', _many)
+    monkeypatch.setattr(w._ldr, '_load_single', _single)
+
+    # a leaf changes, only it and its importers are loaded again
+    _write(rin['contact'], 'email\tnew@example.com\n')
+    assert w.refresh()
+    # (the missing optional sheet is merely tried again)
+    assert sorted(loaded) == [
+        'rec_contact.tsv', 'rec_dataset.tsv', 'rec_extra.tsv',
+        'rec_org.tsv']
+    assert w.record['org']['contact'] == {'email': 'new@example.com'}
+    # unaffected imports are reused
+    assert w.record['author'] is rec['author']
+
+    # a sheet for an optional import appears
+    loaded.clear()
+    rin['extra'].write_text('note\tsome\n')
+    assert w.refresh()
+    assert w.record['extra'] == {'note': 'some'}
+    assert 'rec_authors.tsv' not in loaded
+    assert rin['extra'] in w.graph.files
+
+    # an override appears
+    loaded.clear()
+    (rdir / 'rec_authors.override.json').write_text('{"id": "{name[0]}"}')
+    assert w.refresh()
+    assert [(a['name'], a['id']) for a in w.record['author']] == [
+        ('a', 'a'), ('b', 'b')]
+    # the unmodified import of the sheet is reused
+    assert sorted(loaded) == ['rec_authors.tsv', 'rec_dataset.tsv']
+
+    # an import is removed, the sheet is no longer part of the record
+    _write(root, 'name\trec\norg\t@tabby-single-org\n')
+    assert w.refresh()
+    # (the override still applies)
+    assert set(w.record) == {'@id', 'name', 'org'}
+    assert rin['authors'] not in w.graph.files
+
+
+def test_watcher_watch_poll(tabby_record_w_imports):
+    rin = tabby_record_w_imports['input']
+    w = TabbyRecordWatcher(rin['root'], jsonld=False)
+    updates = w.watch(interval=0.01, poll=True)
+    _write(rin['authors'], 'name\nc\n')
+    assert next(updates)['author'] == [{'name': 'c'}]
+    updates.close()
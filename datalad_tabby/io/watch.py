@@ -0,0 +1,211 @@
+"""Keep a loaded `tabby` record up-to-date with its files on disk"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+from typing import (
+    Dict,
+    Generator,
+    List,
+    Set,
+    Tuple,
+)
+
+from .cache import SheetCache
+from .graph import (
+    TabbyImportGraph,
+    _build_import_graph,
+)
+from .load import _TabbyLoader
+
+__all__ = ['TabbyRecordWatcher']
+
+
+class TabbyRecordWatcher:
+    """A loaded record that can be refreshed incrementally
+
+    The record at ``src`` is loaded on construction, and is available as
+    :attr:`record`. Along with it, the :class:`~datalad_tabby.io.graph.
+    TabbyImportGraph` of the record, and the loaded data of all imported
+    sheets are kept.
+
+    :meth:`refresh` checks all files of the record for modification, and
+    for the creation of files that would become part of the record (e.g.,
+    an override file, or a sheet of an optional import). Only modified
+    sheets, and the sheets that (indirectly) import them, are then loaded
+    again. Data structures of unaffected imports are reused as-is in the
+    refreshed record. :meth:`watch` refreshes the record whenever files
+    change.
+
+    All keyword arguments have the same semantics as those of
+    :func:`~datalad_tabby.io.load_tabby`. If no ``cache`` is given, a
+    :class:`~datalad_tabby.io.SheetCache` with default limits is used,
+    such that unmodified sheets that need to be processed again are not
+    read again.
+    """
+    def __init__(
+        self,
+        src: Path,
+        *,
+        single: bool = True,
+        jsonld: bool = True,
+        cpaths: List | None = None,
+        cache: SheetCache | None = None,
+        jobs: int | None = None,
+    ):
+        self._src = src
+        self._single = single
+        self._ldr = _TabbyLoader(
+            jsonld=jsonld,
+            cpaths=cpaths,
+            cache=SheetCache() if cache is None else cache,
+            jobs=jobs,
+        )
+        self._graph: TabbyImportGraph | None = None
+        # stat results of all watched files, at the time of the last load
+        self._stats: Dict[Path, Tuple | None] = {}
+        self._record = None
+        self.refresh()
+
+    @property
+    def record(self):
+        """The loaded record, as of the last :meth:`refresh`"""
+        return self._record
+
+    @property
+    def graph(self) -> TabbyImportGraph:
+        """Import graph of the record, as of the last :meth:`refresh`"""
+        return self._graph
+
+    def refresh(self) -> bool:
+        """Load the record again, if any of its files changed
+
+        Returns whether the record was loaded again. Any error raised
+        while loading is passed on, and the next call will try again.
+        """
+        if self._graph is None:
+            # initial load
+            known = {}
+        else:
+            dirty = self._get_modified_sheets()
+            if not dirty:
+                return False
+            for s in list(dirty):
+                dirty.update(self._graph.importers(s))
+            known = {
+                k: v for k, v in self._graph.sheets.items() if k not in dirty
+            }
+            self._invalidate(dirty)
+
+        graph = _build_import_graph(
+            self._ldr, self._src, self._single, known)
+        stats = {p: _stat(p) for p in _get_watched_paths(graph)}
+        self._graph = graph
+        # mark everything as modified, until the record has been loaded
+        self._stats = {}
+        self._record = self._ldr(src=self._src, single=self._single)
+        self._stats = stats
+        return True
+
+    def watch(
+        self,
+        interval: float = 1.0,
+        *,
+        poll: bool = False,
+    ) -> Generator[Dict | List, None, None]:
+        """Yield the record again, whenever any of its files changed
+
+        If the optional ``inotify_simple`` package is installed (Linux
+        only), the directories of all record files are monitored for
+        changes, and a refresh is performed as soon as any of them changes,
+        but at least every ``interval`` seconds. Otherwise, or with
+        ``poll``, the record is refreshed every ``interval`` seconds.
+
+        This generator never ends, stop iterating over it to stop
+        watching.
+        """
+        inotify = None if poll else _get_inotify()
+        if inotify is None:
+            while True:
+                time.sleep(interval)
+                if self.refresh():
+                    yield self._record
+            return
+
+        from inotify_simple import flags
+        mask = flags.CREATE | flags.DELETE | flags.MODIFY | flags.ATTRIB \
+            | flags.CLOSE_WRITE | flags.MOVED_FROM | flags.MOVED_TO
+        wds: Dict[Path, int] = {}
+        with inotify:
+            while True:
+                dirs = _get_watched_dirs(self._graph)
+                for d in set(wds).difference(dirs):
+                    try:
+                        inotify.rm_watch(wds.pop(d))
+                    except OSError:
+                        # the watch is gone already, e.g. with the directory
+                        pass
+                for d in dirs.difference(wds):
+                    try:
+                        wds[d] = inotify.add_watch(d, mask)
+                    except OSError:
+                        # no such directory (yet), polling takes care of it
+                        pass
+                # wait for events, collecting any that follow right away
+                # to have a single refresh for a multi-file save
+                inotify.read(timeout=int(interval * 1000), read_delay=50)
+                if self.refresh():
+                    yield self._record
+
+    def _get_modified_sheets(self) -> Set[Path]:
+        stats = {}
+        modified = set()
+        for sheet in self._graph:
+            for p in _get_sheet_paths(sheet):
+                if p not in stats:
+                    stats[p] = _stat(p)
+                if stats[p] != self._stats.get(p):
+                    modified.add(sheet.src)
+        return modified
+
+    def _invalidate(self, sheets: Set[Path]):
+        ldr = self._ldr
+        for key in [k for k in ldr._imported if k[0] in sheets]:
+            del ldr._imported[key]
+        for src in sheets:
+            ldr._plans.pop(src, None)
+        # files may have come or gone, which can change any convention-based
+        # fallback
+        ldr._dir_listings.clear()
+        ldr._convention_index = None
+
+
+def _stat(fpath: Path) -> Tuple | None:
+    try:
+        st = os.stat(fpath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _get_sheet_paths(sheet) -> List[Path]:
+    return list(sheet.files.values()) + sheet.missing
+
+
+def _get_watched_paths(graph: TabbyImportGraph) -> Set[Path]:
+    return set(p for s in graph for p in _get_sheet_paths(s))
+
+
+def _get_watched_dirs(graph: TabbyImportGraph) -> Set[Path]:
+    return set(p.parent for p in _get_watched_paths(graph))
+
+
+def _get_inotify():
+    try:
+        from inotify_simple import INotify
+        return INotify()
+    except (ImportError, OSError):
+        # not installed, not on Linux, or out of inotify instances
+        return None
@@ -4,54 +4,124 @@ from __future__ import annotations
 
 __docformat__ = 'restructuredtext'
 
+from functools import lru_cache
 import json
 import logging
 from pathlib import Path
-from typing import Dict
+import sys
+from time import perf_counter
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+)
 
 import datalad_next.commands as dc
 from datalad_next.constraints import (
     AnyOf,
     EnsureChoice,
+    EnsureInt,
     EnsureJSON,
+    EnsureListOf,
     EnsurePath,
+    EnsureRange,
+    EnsureStr,
+    EnsureURL,
     EnsureValue,
 )
 from datalad_next.constraints.basic import (
     EnsureDType,
 )
 from datalad_next.constraints.exceptions import ParameterConstraintContext
+from datalad_next.exceptions import CapturedException
 
 from datalad_next.uis import ui_switcher as ui
 
-from datalad_tabby.io import load_tabby
+from datalad_tabby.cache import (
+    get_default_jsonld_document_cache,
+    get_default_record_cache_dir,
+)
+from datalad_tabby.io import (
+    JsonLdDocumentCache,
+    RecordCache,
+    TabbyLoadProfile,
+    compact_record,
+    expand_record,
+    iter_tabby_many,
+    iterencode_json,
+    load_tabby,
+    load_tabby_many,
+)
+from datalad_tabby.io.load import _resolve_sheet_fpath
 
 lgr = logging.getLogger('datalad.tabby.load')
 
 
 load_modes = ('jsonld', 'json', 'single')
+# JSON-LD processing of a record loaded in 'jsonld' mode
+jsonld_modes = ('jsonld-expanded',)
+output_formats = ('json', 'jsonl')
+# number of characters of a serialized record to output at once
+_render_chunk_size = 1 << 20
 
 
 class _ParamValidator(dc.EnsureCommandParameterization):
     def __init__(self):
         super().__init__(
             param_constraints=dict(
-                path=EnsurePath(lexists=True),
-                mode=EnsureChoice(*load_modes),
+                # nonexistent paths are reported in results, such that
+                # a single one does not prevent processing of all others
+                path=AnyOf(EnsurePath(), EnsureListOf(EnsurePath())),
+                paths_from=AnyOf(EnsureValue('-'), EnsurePath(lexists=True)),
+                mode=EnsureChoice(*load_modes, *jsonld_modes),
                 compact=AnyOf(
                     EnsureValue('@context'),
                     EnsureJSON(),
+                    # a remote context
+                    EnsureURL(required=['scheme', 'netloc']),
                     EnsurePath(),
                     EnsureDType(dict),
                 ),
+                jobs=EnsureInt() & EnsureRange(min=1),
+                output_format=EnsureChoice(*output_formats),
+                sheet=EnsureStr(min_len=1),
             ),
             joint_constraints={
+                ParameterConstraintContext(
+                    ('path', 'paths_from', 'sheet'), 'record paths'):
+                        self._check_paths,
                 ParameterConstraintContext(
                     ('mode', 'compact'), 'mode requirement'):
                         self._check_compaction_jsonld_mode,
+                ParameterConstraintContext(
+                    ('cache', 'profile'), 'profiling'):
+                        self._check_profile_cache,
             },
         )
 
+    def _check_paths(self, path, paths_from, sheet):
+        if path is None:
+            path = []
+        elif isinstance(path, Path):
+            path = [path]
+        if not path and paths_from is None:
+            self.raise_for(
+                dict(path=path, paths_from=paths_from, sheet=sheet),
+                "no record path given"
+            )
+        if len(path) == 1 and paths_from is None:
+            # there is no batch to continue with
+            fpath = path[0] if sheet is None \
+                else _resolve_sheet_fpath(path[0], sheet)
+            if not fpath.exists():
+                self.raise_for(
+                    dict(path=path, paths_from=paths_from, sheet=sheet),
+                    "{path} does not exist",
+                    path=fpath,
+                )
+        return dict(path=path, paths_from=paths_from, sheet=sheet)
+
     def _check_compaction_jsonld_mode(self, mode, compact):
         if compact and mode != 'jsonld':
             self.raise_for(
@@ -59,6 +129,13 @@ class _ParamValidator(dc.EnsureCommandParameterization):
                 "JSON-LD compaction requires mode 'jsonld'"
             )
 
+    def _check_profile_cache(self, cache, profile):
+        if cache and profile:
+            self.raise_for(
+                dict(cache=cache, profile=profile),
+                "a record cannot be profiled when it is taken from the cache"
+            )
+
 
 @dc.build_doc
 class Load(dc.ValidatedInterface):
@@ -70,47 +147,199 @@ class Load(dc.ValidatedInterface):
     _params_ = dict(
         path=dc.Parameter(
             args=("path",),
-            doc="""Path of the root tabby record component"""),
+            nargs='*',
+            doc="""Path of the root tabby record component. Any number of
+            paths can be given, each one is loaded as an independent
+            record, and yields its own result."""),
+        paths_from=dc.Parameter(
+            args=('--paths-from',),
+            metavar='FILE',
+            doc="""Read additional record paths from this file, one per
+            line. '-' reads paths from standard input.""",
+        ),
         mode=dc.Parameter(
             args=("--mode",),
-            doc="""The mode with which to load a tabby record.""",
-            choices=load_modes,
+            doc="""The mode with which to load a tabby record.
+            'jsonld-expanded' loads a record like 'jsonld', and puts out
+            its JSON-LD expanded form (an array of node objects). With
+            --many, the nodes of all objects are put out together.""",
+            choices=load_modes + jsonld_modes,
         ),
         compact=dc.Parameter(
             args=('--compact',),
             metavar='CONTEXT',
             doc="""A context for JSON-LD compaction of the loaded record
-            (requires mode 'jsonld').""",
+            (requires mode 'jsonld'). This can be a JSON document, the path
+            of a file with a JSON document, the URL of a remote context, or
+            '@context' for the context of the record itself. Remote
+            documents are kept in a cache, and are only retrieved once.
+            With the configuration ``datalad.tabby.jsonld-offline``, they
+            are never retrieved, and must be in the cache already.""",
+        ),
+        many=dc.Parameter(
+            args=('--many',),
+            action='store_true',
+            doc="""Interpret the record component at PATH as a sheet
+            declaring many objects (one per row), rather than a single
+            object. The loaded record will be a JSON array. Rows are
+            processed one at a time, and compaction is performed for each
+            object individually.""",
+        ),
+        jobs=dc.Parameter(
+            args=('-J', '--jobs'),
+            metavar='NJOBS',
+            doc="""Number of parallel threads for loading the sheets imported
+            by a record component. This can speed up loading records
+            with many sheets, in particular on high-latency storage.
+            When more than one record is loaded, this is the number of
+            worker processes loading records in parallel instead.""",
+        ),
+        keep_order=dc.Parameter(
+            args=('--keep-order',),
+            action='store_true',
+            doc="""When loading more than one record in parallel, report
+            results in the order of the given paths, rather than in the
+            order in which loading finishes.""",
+        ),
+        cache=dc.Parameter(
+            args=('--cache',),
+            action='store_true',
+            doc="""Use a persistent cache of loaded records. A record is
+            taken from the cache, if none of the files it was loaded from
+            have changed since it was cached. Otherwise, the loaded record
+            is deposited in the cache. See the ``tabby-cache`` command for
+            its location and maintenance. Has no effect with --many.""",
+        ),
+        output_format=dc.Parameter(
+            args=('--output-format',),
+            doc="""Format of the loaded record. 'json' outputs the record
+            as a single JSON document. 'jsonl' outputs one JSON object per
+            line, and with --many, each object is put out as soon as it is
+            loaded, without waiting for the entire sheet to be processed.
+            With the configuration ``datalad.tabby.fastjson``, records are
+            serialized with the optional ``orjson`` package, if it is
+            installed. This is faster, but some floating point numbers are
+            formatted differently.""",
+            choices=output_formats,
+        ),
+        sheet=dc.Parameter(
+            args=('--sheet',),
+            metavar='NAME',
+            doc="""Load the sheet with this name from the record that PATH
+            is a component of, rather than PATH itself. The name is given
+            as in an import statement, e.g., 'authors', or
+            'files@tby-ds1'.""",
+        ),
+        profile=dc.Parameter(
+            args=('--profile',),
+            action='store_true',
+            doc="""Collect timings and I/O counts for each loaded sheet:
+            rows parsed, time spent on parsing, post-processing, building
+            overrides, and determining the JSON-LD context, the number of
+            file existence checks, directory listings, and files opened, and
+            the number of bytes read. The time spent on JSON-LD compaction
+            or expansion of the record is collected too. The profile is
+            reported in the result (with --many and 'jsonl' output, in the
+            result of the last object), and is logged as a table (at log
+            level INFO). Cannot be used with --cache, or a bundle.""",
         ),
     )
 
     @staticmethod
     @dc.eval_results
     def __call__(
-        path,
+        path=None,
+        paths_from: str | Path | None = None,
         mode: str = 'jsonld',
-        compact: None | Path | Dict = None,
+        compact: None | str | Path | Dict = None,
+        many: bool = False,
+        jobs: int | None = None,
+        keep_order: bool = False,
+        cache: bool = False,
+        output_format: str = 'json',
+        sheet: str | None = None,
+        profile: bool = False,
     ):
-        rec = load_tabby(
-            path,
-            single=True,
-            jsonld=mode == 'jsonld',
-            recursive=mode != 'single'
-        )
+        if isinstance(compact, Path):
+            compact = json.load(compact.open())
 
-        if compact:
-            from pyld import jsonld
-            if compact == '@context':
-                compact = rec.get('@context', {})
-            elif isinstance(compact, Path):
-                compact = json.load(compact.open())
-            rec = jsonld.compact(rec, compact)
+        paths = list(path or [])
+        if paths_from is not None:
+            paths.extend(_read_paths(paths_from))
+        if sheet is not None:
+            paths = [_resolve_sheet_fpath(p, sheet) for p in paths]
+
+        if len(paths) > 1 or paths_from is not None:
+            # paths from a file are always a batch, with any number of
+            # records (even none), each reported on its own
+            yield from _load_batch(
+                paths,
+                mode=mode,
+                compact=compact,
+                many=many,
+                jobs=jobs,
+                keep_order=keep_order,
+                cache=cache,
+                output_format=output_format,
+                profile=profile,
+            )
+            return
+
+        path = paths[0]
+        prof = TabbyLoadProfile() if profile else None
+        if many:
+            recs = _process_recs(
+                iter_tabby_many(
+                    path,
+                    jsonld=mode in ('jsonld', *jsonld_modes),
+                    recursive=mode != 'single',
+                    jobs=jobs,
+                    profile=prof,
+                ),
+                mode,
+                compact,
+                prof,
+            )
+            if output_format == 'jsonl':
+                # one result per object, each is rendered right away.
+                # The profile is only complete with the last object, with
+                # profiling, each object is held back until the next one
+                # is loaded
+                flagged = _flag_last(recs) if prof \
+                    else ((r, False) for r in recs)
+                for rec, last in flagged:
+                    yield dc.get_status_dict(
+                        action='tabby_load',
+                        path=path,
+                        status='ok',
+                        tabby=rec,
+                        **(dict(profile=prof.as_dict()) if last else {}),
+                    )
+                return
+            rec = list(recs)
+        else:
+            rec = _process_rec(
+                load_tabby(
+                    path,
+                    single=True,
+                    jsonld=mode in ('jsonld', *jsonld_modes),
+                    recursive=mode != 'single',
+                    jobs=jobs,
+                    record_cache=RecordCache(get_default_record_cache_dir())
+                    if cache else None,
+                    profile=prof,
+                ),
+                mode,
+                compact,
+                prof,
+            )
 
         yield dc.get_status_dict(
             action='tabby_load',
             path=path,
             status='ok',
             tabby=rec,
+            **(dict(profile=prof.as_dict()) if prof else {}),
         )
 
     @staticmethod
@@ -119,12 +348,151 @@ class Load(dc.ValidatedInterface):
         in a compact JSON-line format -- only if status==ok"""
         # the command implementation does not call other commands inside,
         # hence we need not anticipate foreign results to pass through
-        #if res['status'] != 'ok':
-        #    generic_result_renderer(res)
-        #    return
+        if res['status'] != 'ok':
+            # a record that failed to load in batch mode
+            dc.generic_result_renderer(res)
+            return
 
-        ui.message(json.dumps(
+        if 'profile' in res:
+            # logged, to keep the report out of the record output
+            lgr.info(
+                'Load profile of %s (times in ms):\n%s',
+                res['path'],
+                TabbyLoadProfile.from_dict(res['profile']).format_table(),
+            )
+        # write the record as it is serialized, rather than building
+        # the complete serialization of a (large) record first
+        chunks = iterencode_json(
             res['tabby'],
-            separators=(',', ':'),
-            indent=None,
-        ))
+            chunk_size=_render_chunk_size,
+            fast=_use_fast_json(),
+        )
+        chunk = next(chunks)
+        for next_chunk in chunks:
+            ui.message(chunk, cr='')
+            chunk = next_chunk
+        ui.message(chunk)
+
+
+def _use_fast_json() -> bool:
+    from datalad import cfg
+    return cfg.getbool('datalad.tabby', 'fastjson', default=False)
+
+
+def _read_paths(src: str | Path) -> Iterator[Path]:
+    with (open(sys.stdin.fileno(), closefd=False) if src == '-'
+          else Path(src).open()) as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line:
+                yield Path(line)
+
+
+def _load_batch(
+    paths: List[Path],
+    *,
+    mode: str,
+    compact: str | Dict | None,
+    many: bool,
+    jobs: int | None,
+    keep_order: bool,
+    cache: bool,
+    output_format: str,
+    profile: bool,
+):
+    for res in load_tabby_many(
+        paths,
+        jobs=jobs,
+        ordered=keep_order,
+        single=not many,
+        jsonld=mode in ('jsonld', *jsonld_modes),
+        recursive=mode != 'single',
+        record_cache=RecordCache(get_default_record_cache_dir())
+        if cache and not many else None,
+        profile=profile,
+    ):
+        if res.error is not None:
+            yield dc.get_status_dict(
+                action='tabby_load',
+                path=res.src,
+                status='error',
+                exception=CapturedException(res.error),
+            )
+            continue
+        rec = list(_process_recs(res.record, mode, compact, res.profile)) \
+            if many else _process_rec(res.record, mode, compact, res.profile)
+        recs = rec if many and output_format == 'jsonl' else [rec]
+        for i, r in enumerate(recs):
+            yield dc.get_status_dict(
+                action='tabby_load',
+                path=res.src,
+                status='ok',
+                tabby=r,
+                **(dict(profile=res.profile.as_dict())
+                   if res.profile and i == len(recs) - 1 else {}),
+            )
+
+
+def _process_rec(
+    rec: Dict,
+    mode: str,
+    compact: str | Dict | None,
+    profile: TabbyLoadProfile | None = None,
+) -> Dict | List:
+    start = perf_counter()
+    if compact:
+        rec = _compact_rec(rec, compact)
+    elif mode == 'jsonld-expanded':
+        rec = expand_record(
+            rec, document_loader=_get_default_document_loader())
+    if profile is not None:
+        profile.jsonld += perf_counter() - start
+    return rec
+
+
+def _process_recs(
+    recs: Iterable[Dict],
+    mode: str,
+    compact: str | Dict | None,
+    profile: TabbyLoadProfile | None = None,
+) -> Iterator[Dict]:
+    for rec in recs:
+        if mode == 'jsonld-expanded':
+            # an object expands to any number of nodes
+            yield from _process_rec(rec, mode, compact, profile)
+        else:
+            yield _process_rec(rec, mode, compact, profile)
+
+
+def _flag_last(items: Iterable) -> Iterator[tuple]:
+    # pairs of item and whether it is the last one
+    it = iter(items)
+    prev = next(it, _none)
+    if prev is _none:
+        return
+    for item in it:
+        yield prev, False
+        prev = item
+    yield prev, True
+
+
+_none = object()
+
+
+def _compact_rec(rec: Dict, compact: str | Dict) -> Dict:
+    if compact == '@context':
+        compact = rec.get('@context', {})
+    return compact_record(
+        rec, compact, document_loader=_get_default_document_loader())
+
+
+def _get_default_document_loader() -> JsonLdDocumentCache:
+    loader = get_default_jsonld_document_cache()
+    return _get_document_loader(loader.path, loader.offline)
+
+
+@lru_cache(maxsize=None)
+def _get_document_loader(path: Path, offline: bool) -> JsonLdDocumentCache:
+    # reuse instances, such that documents are read from disk only once
+    # per process
+    return JsonLdDocumentCache(path, offline=offline)
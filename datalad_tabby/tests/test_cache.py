@@ -0,0 +1,25 @@
+from datalad.api import tabby_cache
+
+from datalad_tabby.io import (
+    RecordCache,
+    load_tabby,
+)
+
+
+def test_cache(tabby_tsv_record, tmp_path, datalad_noninteractive_ui):
+    cdir = tmp_path / 'cache'
+    res = tabby_cache(cache_dir=cdir)
+    assert len(res) == 1
+    assert res[0]['status'] == 'ok'
+    assert res[0]['entries'] == 0
+
+    load_tabby(tabby_tsv_record['root_sheet'], record_cache=RecordCache(cdir))
+    res = tabby_cache('info', cache_dir=cdir)
+    assert res[0]['entries'] == 1
+    assert res[0]['nbytes'] > 0
+    uil = datalad_noninteractive_ui.log
+    assert '1 record(s)' in uil[-1][1][0]
+
+    res = tabby_cache('clear', cache_dir=cdir)
+    assert res[0]['status'] == 'ok'
+    assert tabby_cache(cache_dir=cdir)[0]['entries'] == 0
@@ -13,6 +13,15 @@ from ..extractor import (
 )
 
 
+@pytest.fixture(autouse=True)
+def tabby_record_cache_dir(tmp_path, monkeypatch):
+    # never touch the cache of the user running the tests
+    import datalad_tabby.extractor as mod
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(mod, 'get_default_record_cache_dir', lambda: cache_dir)
+    return cache_dir
+
+
 def test_extractor_version():
     ex = TabbyExtractor('someds', 'refcommit')
     assert str(ex.get_id()) == '325fb444-ae7b-54b3-9fdd-621ab1e5005c'
@@ -105,3 +114,73 @@ def test_extractor_collection_only(existing_dataset):
     assert recs[0][isVersionOf]['@id']
     # collection records are relayed as-is
     assert recs[1] == {'title': 'colds1'}
+
+
+def test_extractor_cache(tmp_path, monkeypatch):
+    import datalad_tabby.extractor as mod
+    loaded = []
+    load = mod.load_dataset_self_description
+    load_many = mod.load_tabby_many
+
+    def _load(ds):
+        loaded.append('self')
+        return load(ds)
+
+    def _load_many(*args, **kwargs):
+        loaded.append('dscollection')
+        return load_many(*args, **kwargs)
+
+    monkeypatch.setattr(mod, 'load_dataset_self_description', _load)
+    monkeypatch.setattr(mod, 'load_tabby_many', _load_many)
+
+    # a plain git repo is enough to exercise the caching
+    repo = LegacyGitRepo(tmp_path / 'repo')
+    repo.call_git(['init'])
+    tabby_dir = repo.pathobj / '.datalad' / 'tabby'
+    mfpath = tabby_dir / 'self' / 'dataset.tsv'
+    mfpath.parent.mkdir(parents=True)
+    mfpath.write_text('title\tmy dataset\n')
+    colpath = tabby_dir / 'dscollection' / 'colds_dataset.tsv'
+    colpath.parent.mkdir(parents=True)
+    colpath.write_text('title\tcolds1\n')
+    repo.call_git(['add', '.'])
+    repo.call_git(['commit', '-m', 'minimal metadata'])
+    ds = Dataset(repo.pathobj)
+
+    def _get_tabby():
+        commit = repo.call_git_oneline(['rev-parse', 'HEAD'])
+        return TabbyExtractor(ds, commit)._get_tabby()
+
+    # no caching by default
+    tabby = _get_tabby()
+    assert tabby['self']['title'] == 'my dataset'
+    assert tabby['dscollection'] == [{'title': 'colds1'}]
+    assert _get_tabby() == tabby
+    assert loaded == 2 * ['self', 'dscollection']
+    assert not (tmp_path / 'cache').exists()
+
+    ds.config.set('datalad.tabby.extractor-cache', 'true', scope='local')
+    loaded.clear()
+    assert _get_tabby() == tabby
+    assert loaded == ['self', 'dscollection']
+    # an unrelated commit has the same .datalad/tabby tree, a cache hit
+    # does not load anything
+    (repo.pathobj / 'other').write_text('some')
+    repo.call_git(['add', '.'])
+    repo.call_git(['commit', '-m', 'unrelated'])
+    assert _get_tabby() == tabby
+    assert loaded == ['self', 'dscollection']
+
+    # uncommitted modifications are never served from the cache
+    loaded.clear()
+    mfpath.write_text('title\tnew title\n')
+    assert _get_tabby()['self']['title'] == 'new title'
+    colpath.write_text('title\tcolds2\n')
+    assert _get_tabby()['dscollection'] == [{'title': 'colds2'}]
+    assert loaded == 2 * ['self', 'dscollection']
+    repo.call_git(['commit', '-am', 'new titles'])
+    loaded.clear()
+    tabby = _get_tabby()
+    assert tabby['self']['title'] == 'new title'
+    assert _get_tabby() == tabby
+    assert loaded == ['self', 'dscollection']
@@ -36,6 +36,14 @@ def test_load(tabby_tsv_record, datalad_noninteractive_ui):
         ''.join(rec)) == load_tabby(tabby_tsv_record['root_sheet'])
 
 
+def test_load_parallel(tabby_tsv_record):
+    res = tabby_load(tabby_tsv_record['root_sheet'], jobs=3)
+    assert res[0]['tabby'] == load_tabby(tabby_tsv_record['root_sheet'])
+
+    with pytest.raises(CommandParametrizationError):
+        tabby_load(tabby_tsv_record['root_sheet'], jobs=0)
+
+
 def test_load_nonrecursive(tabby_tsv_record, datalad_noninteractive_ui):
     res = tabby_load(
         tabby_tsv_record['root_sheet'],
@@ -51,6 +59,20 @@ def test_load_nonrecursive(tabby_tsv_record, datalad_noninteractive_ui):
         jsonld=False)
 
 
+def test_load_many(tabby_tsv_record, datalad_noninteractive_ui):
+    sheet = tabby_tsv_record['root_sheet'].parent / 'tabbydemo_authors.tsv'
+    res = tabby_load(sheet, many=True)
+    assert len(res) == 1
+    rec = res[0]['tabby']
+    assert isinstance(rec, list)
+    assert rec == load_tabby(sheet, single=False)
+
+    # compaction is done for each object individually
+    rec = tabby_load(sheet, many=True, compact='@context')[0]['tabby']
+    assert len(rec) == len(load_tabby(sheet, single=False))
+    assert all('@context' in r for r in rec)
+
+
 def test_load_compaction(tabby_tsv_record, tmp_path):
     rec = tabby_load(tabby_tsv_record['root_sheet'], mode='jsonld')[0]['tabby']
     # we have a redundant context spec in each funding record
@@ -83,3 +105,191 @@ def test_load_compaction(tabby_tsv_record, tmp_path):
     )[0]['tabby']
     # this time "funding" has a compact, standalone definition
     assert not any('@context' in r for r in rec['funding'])
+
+
+def test_load_cache(tabby_tsv_record, tmp_path, monkeypatch):
+    import datalad_tabby.load as mod
+    monkeypatch.setattr(
+        mod, 'get_default_record_cache_dir', lambda: tmp_path / 'cache')
+    for i in range(2):
+        res = tabby_load(tabby_tsv_record['root_sheet'], cache=True)
+        assert res[0]['tabby'] == load_tabby(tabby_tsv_record['root_sheet'])
+    assert len(list((tmp_path / 'cache').glob('*.json'))) == 1
+
+
+def test_load_bundle(tabby_tsv_record, tmp_path):
+    from datalad.api import tabby_compile
+    res = tabby_compile(
+        tabby_tsv_record['root_sheet'],
+        output=tmp_path / 'demo.tabby',
+    )
+    assert res[0]['status'] == 'ok'
+    rec = tabby_load(tmp_path / 'demo.tabby')[0]['tabby']
+    assert rec == load_tabby(tabby_tsv_record['root_sheet'])
+
+
+def test_load_jsonl(tabby_tsv_record, datalad_noninteractive_ui):
+    root = tabby_tsv_record['root_sheet']
+    target = load_tabby(root.parent / 'tabbydemo_authors.tsv', single=False)
+    # select the sheet by name, put out one object per line
+    res = tabby_load(root, sheet='authors', many=True, output_format='jsonl')
+    assert [r['tabby'] for r in res] == target
+    uil = datalad_noninteractive_ui.log
+    assert len(uil) == len(target)
+    assert [json.loads(''.join(m[1])) for m in uil] == target
+
+    # without --many, there is only a single object
+    res = tabby_load(root, output_format='jsonl')
+    assert len(res) == 1
+    assert res[0]['tabby'] == load_tabby(root)
+
+    with pytest.raises(CommandParametrizationError):
+        tabby_load(root, output_format='yaml')
+    # a sheet that does not exist is refused like any other missing path
+    with pytest.raises(CommandParametrizationError):
+        tabby_load(root, sheet='nosuch')
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_load_batch(tabby_tsv_record, tmp_path, jobs):
+    root = tabby_tsv_record['root_sheet']
+    authors = root.parent / 'tabbydemo_authors.tsv'
+    missing = tmp_path / 'missing_dataset.tsv'
+    pathlist = tmp_path / 'paths.txt'
+    pathlist.write_text(f'{authors}\n\n{root}\n')
+    res = tabby_load(
+        [root, missing],
+        paths_from=pathlist,
+        jobs=jobs,
+        keep_order=True,
+        on_failure='ignore',
+    )
+    assert [(r['path'], r['status']) for r in res] == [
+        (root, 'ok'), (missing, 'error'), (authors, 'ok'), (root, 'ok')]
+    assert res[0]['tabby'] == res[3]['tabby'] == load_tabby(root)
+    assert res[2]['tabby'] == load_tabby(authors)
+
+    # one result per object, for any number of sheets
+    res = tabby_load(
+        [authors, authors],
+        many=True,
+        output_format='jsonl',
+        jobs=jobs,
+    )
+    assert [r['tabby'] for r in res] == 2 * load_tabby(authors, single=False)
+
+
+def test_load_compaction_offline(tabby_tsv_record, tmp_path, monkeypatch):
+    import datalad_tabby.load as mod
+    from datalad_tabby.io import JsonLdDocumentCache
+    url = 'https://example.org/tabby-compaction.jsonld'
+    dc = JsonLdDocumentCache(tmp_path / 'docs', offline=True)
+    monkeypatch.setattr(
+        mod, 'get_default_jsonld_document_cache', lambda: dc)
+    # not retrieved, and not in the cache
+    with pytest.raises(Exception):
+        tabby_load(tabby_tsv_record['root_sheet'], compact=url)
+    dc.seed(url, {'@context': {'schema': 'https://schema.org/'}})
+    rec = tabby_load(tabby_tsv_record['root_sheet'], compact=url)[0]['tabby']
+    assert rec['@context'] == url
+    assert 'schema:funding' in rec
+
+
+def test_load_expanded(tabby_tsv_record):
+    pyld = pytest.importorskip('pyld.jsonld')
+    root = tabby_tsv_record['root_sheet']
+    rec = tabby_load(root, mode='jsonld-expanded')[0]['tabby']
+    assert rec == pyld.expand(load_tabby(root))
+
+    # the nodes of all objects, or one per line
+    authors = root.parent / 'tabbydemo_authors.tsv'
+    target = [
+        n for obj in load_tabby(authors, single=False)
+        for n in pyld.expand(obj)
+    ]
+    rec = tabby_load(authors, mode='jsonld-expanded', many=True)[0]['tabby']
+    assert rec == target
+    res = tabby_load(authors, mode='jsonld-expanded', many=True,
+                     output_format='jsonl')
+    assert [r['tabby'] for r in res] == target
+
+    with pytest.raises(CommandParametrizationError):
+        tabby_load(root, mode='jsonld-expanded', compact='@context')
+
+
+def test_load_render_chunks(tabby_tsv_record, datalad_noninteractive_ui,
+                            monkeypatch):
+    import datalad_tabby.load as mod
+    import datalad_tabby.io.serialize as ser
+    monkeypatch.setattr(mod, '_render_chunk_size', 100)
+    monkeypatch.setattr(ser, '_max_piece_items', 8)
+    root = tabby_tsv_record['root_sheet']
+    tabby_load(root)
+    uil = datalad_noninteractive_ui.log
+    # the record is output in chunks, and a newline only after the last
+    assert len(uil) > 1
+    assert all(m[1][1] == '' for m in uil[:-1])
+    assert json.loads(''.join(''.join(m[1]) for m in uil)) == load_tabby(root)
+
+
+def test_load_profile(tabby_tsv_record, datalad_noninteractive_ui, caplog):
+    root = tabby_tsv_record['root_sheet']
+    res = tabby_load(root, profile=True, compact='@context')
+    assert len(res) == 1
+    prof = res[0]['profile']
+    assert set(prof['sheets']) == {str(s) for s in tabby_tsv_record['sheets']}
+    assert prof['jsonld'] > 0
+    # the record goes to the UI, the report to the log
+    uil = datalad_noninteractive_ui.log
+    assert len(uil) == 1
+    assert json.loads(''.join(uil[0][1])) == res[0]['tabby']
+    assert any(
+        r.name == 'datalad.tabby.load' and 'total' in r.getMessage()
+        for r in caplog.records)
+
+    # one result per object, the last one has the profile
+    authors = root.parent / 'tabbydemo_authors.tsv'
+    res = tabby_load(authors, many=True, output_format='jsonl', profile=True)
+    assert [r['tabby'] for r in res] == load_tabby(authors, single=False)
+    assert ['profile' in r for r in res] == [False] * (len(res) - 1) + [True]
+    res = tabby_load([root, authors], profile=True, jobs=2)
+    assert all('profile' in r for r in res)
+
+    with pytest.raises(CommandParametrizationError):
+        tabby_load(root, profile=True, cache=True)
+
+
+def test_load_paths_from(tabby_tsv_record, tmp_path):
+    root = tabby_tsv_record['root_sheet']
+    pathlist = tmp_path / 'paths.txt'
+    # no paths, no results
+    pathlist.write_text('\n')
+    assert tabby_load(paths_from=pathlist) == []
+    # a single path is still a batch, failures are reported in results
+    missing = tmp_path / 'missing_dataset.tsv'
+    pathlist.write_text(f'{missing}\n')
+    res = tabby_load(paths_from=pathlist, on_failure='ignore')
+    assert [(r['path'], r['status']) for r in res] == [(missing, 'error')]
+    pathlist.write_text(f'{root}\n')
+    res = tabby_load(paths_from=pathlist)
+    assert [r['tabby'] for r in res] == [load_tabby(root)]
+
+
+def test_load_sheet_convention(tmp_path, monkeypatch):
+    import datalad_tabby.io.listing as lsmod
+    # a convention that provides a sheet
+    cvn = tmp_path / 'cvn' / 'tby-sd1'
+    cvn.mkdir(parents=True)
+    (cvn / 'extra.tsv').write_text('kind\tstandard\n')
+    monkeypatch.setattr(
+        lsmod, '_index_std_conventions',
+        lambda: {'tby-sd1': {'extra.tsv': cvn / 'extra.tsv'}})
+    rdir = tmp_path / 'rec'
+    rdir.mkdir()
+    ds = rdir / 'dataset@tby-sd1.tsv'
+    ds.write_text('name\tmyds\nextra\t@tabby-single-extra@tby-sd1\n')
+    # the sheet is found like it is for an import
+    rec = load_tabby(ds, jsonld=False)
+    assert rec['extra'] == {'kind': 'standard'}
+    res = tabby_load(ds, sheet='extra@tby-sd1', mode='json')
+    assert res[0]['tabby'] == rec['extra']
@@ -3,3 +3,5 @@
 def test_register():
     import datalad.api as da
     assert hasattr(da, 'tabby_load')
+    assert hasattr(da, 'tabby_cache')
+    assert hasattr(da, 'tabby_compile')
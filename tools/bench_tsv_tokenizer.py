@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the TSV tokenizer of the tabby loader against the csv module.
+
+Two synthetic sheets are generated in a temporary directory:
+
+    - a "tall" sheet, resembling a tby-ds1 file listing with many rows
+      and few columns
+    - a "wide" sheet with few rows and many columns
+
+Each sheet is read with ``csv.reader(delimiter='\\t')`` (the previous
+implementation) and with the tabby tokenizer. The rows produced by
+both readers are verified to be identical, and the best time out of a
+number of repetitions is reported for each reader. Like in the tabby
+loader, rows are consumed one at a time, and are not kept in memory.
+"""
+import argparse
+from collections import deque
+import csv
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+
+from datalad_tabby.io.load_utils import _iter_tsv_rows
+
+
+def make_tall_sheet(fpath: Path, nrows: int):
+    with fpath.open('w', newline='') as f:
+        f.write('path[POSIX]\tsize[bytes]\tchecksum[md5]\turl\n')
+        for i in range(nrows):
+            f.write(
+                f'sub-{i % 50:02d}/func/file{i}.nii.gz\t{i * 1024}\t'
+                f'{i:032x}\thttps://example.com/data/{i}\n')
+
+
+def make_wide_sheet(fpath: Path, nrows: int, ncols: int):
+    with fpath.open('w', newline='') as f:
+        f.write('\t'.join(f'column{c}' for c in range(ncols)) + '\n')
+        for i in range(nrows):
+            f.write('\t'.join(f'value{i}-{c}' for c in range(ncols)) + '\n')
+
+
+def iter_csv(fpath: Path):
+    with fpath.open(newline='') as f:
+        yield from csv.reader(f, delimiter='\t')
+
+
+def read_csv(fpath: Path):
+    deque(iter_csv(fpath), maxlen=0)
+
+
+def read_tabby(fpath: Path):
+    deque(_iter_tsv_rows(fpath), maxlen=0)
+
+
+def best_time(func, fpath: Path, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(fpath)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(nrows: int, ncols: int, repeat: int):
+    with TemporaryDirectory() as tmpdir:
+        tall = Path(tmpdir) / 'tall.tsv'
+        wide = Path(tmpdir) / 'wide.tsv'
+        make_tall_sheet(tall, nrows)
+        make_wide_sheet(wide, max(nrows // 100, 1), ncols)
+        for label, fpath in (('tall', tall), ('wide', wide)):
+            if list(iter_csv(fpath)) != list(_iter_tsv_rows(fpath)):
+                raise RuntimeError(f'readers disagree on {label} sheet')
+            t_csv = best_time(read_csv, fpath, repeat)
+            t_tabby = best_time(read_tabby, fpath, repeat)
+            print(
+                f'{label}: {fpath.stat().st_size / 1024 ** 2:.1f} MB  '
+                f'csv {t_csv:.3f}s  tabby {t_tabby:.3f}s  '
+                f'speedup {t_csv / t_tabby:.2f}x')
+
+
+if __name__ == '__main__':
+    p = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    p.add_argument(
+        '--rows', type=int, default=500000,
+        help="Number of rows of the tall sheet. The wide sheet has 1/100 "
+        "of this number of rows. Default = 500000"
+    )
+    p.add_argument(
+        '--columns', type=int, default=500,
+        help="Number of columns of the wide sheet. Default = 500"
+    )
+    p.add_argument(
+        '--repeat', type=int, default=3,
+        help="Number of repetitions per reader and sheet, the best time is "
+        "reported. Default = 3"
+    )
+    args = p.parse_args()
+    benchmark(nrows=args.rows, ncols=args.columns, repeat=args.repeat)